@@ -0,0 +1,50 @@
+"""
+Create every DynamoDB table of a service, from its own PynamoDB models.
+
+Run from the service directory, with the environment the service itself
+would get (table names, ``DYNAMODB_ENDPOINT_URL``)::
+
+    cd backend/services/products && python ../../benchmarks/create_tables.py
+
+Tables are created on demand (PAY_PER_REQUEST) with all their indexes;
+existing tables are left alone.
+"""
+
+import importlib
+import inspect
+import pkgutil
+import sys
+from pathlib import Path
+
+from pynamodb.models import Model
+
+DB_PACKAGE = "src.infrastructure.adapters.db"
+
+
+def service_models():
+    """
+    One PynamoDB model per table of the service's db adapters: where several
+    models share a table (tombstones, leases), the one declaring its indexes.
+    """
+    sys.path.insert(0, str(Path.cwd()))
+    package_dir = Path.cwd() / DB_PACKAGE.replace(".", "/")
+    models = {}
+    for module_info in pkgutil.iter_modules([str(package_dir)]):
+        module = importlib.import_module(f"{DB_PACKAGE}.{module_info.name}")
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if not issubclass(obj, Model) or obj is Model or obj.__module__ != module.__name__:
+                continue
+            known = models.get(obj.Meta.table_name)
+            if known is None or len(obj._indexes) > len(known._indexes):
+                models[obj.Meta.table_name] = obj
+    return models
+
+
+def main() -> None:
+    for table, model in sorted(service_models().items()):
+        model.create_table(wait=True, billing_mode="PAY_PER_REQUEST", ignore_update_ttl_errors=True)
+        print(f"{table}: ready ({model.__name__})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Where a service's cold start goes: the time to import its app, by module
+and by top-level package, from ``python -X importtime``::
+
+    python backend/benchmarks/importtime.py
+    python backend/benchmarks/importtime.py --service products --top 30 --out /tmp/imports.json
+
+Imports ``main`` (which builds the FastAPI app and its middlewares) in a
+fresh interpreter per run, from the service's directory and with dummy
+settings, and keeps the fastest of ``--runs``. Reported:
+
+- per package (``botocore``, ``pynamodb``, ``jwt``...): the time spent
+  importing its own modules, so the rows add up to the total
+- the modules with the highest cumulative time, i.e. including what
+  they import first
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SERVICES_DIR = BENCHMARKS_DIR.parent / "services"
+SERVICES = ("products", "sellers", "sales")
+# the services' settings only need to parse; nothing connects anywhere
+SERVICE_ENV = {
+    "AWS_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "importtime",
+    "AWS_SECRET_ACCESS_KEY": "importtime",
+    "COGNITO_USERPOOL_ID": "us-east-1_importtime",
+    "COGNITO_APP_CLIENT_ID": "importtime",
+    "PRODUCTS_TABLE_NAME": "Products",
+    "PRODUCT_IMAGES_BUCKET": "product-images",
+    "SELLERS_TABLE_NAME": "Sellers",
+    "SALES_TABLE_NAME": "Sales",
+    "LOG_LEVEL": "WARNING",
+}
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def parse(stderr: str) -> List[Dict[str, Any]]:
+    """``-X importtime`` lines as dicts: module, self_us, cumulative_us, depth."""
+    modules = []
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append({
+                "module": module,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(indent) - 1) // 2,
+            })
+    return modules
+
+
+def package_of(module: str) -> str:
+    top = module.split(".")[0]
+    return "service" if top in ("src", "main", "config") else top
+
+
+def profile(service: str, python: str) -> List[Dict[str, Any]]:
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", "import main"],
+        cwd=SERVICES_DIR / service,
+        env={**os.environ, **SERVICE_ENV},
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {service}'s app failed:\n{completed.stderr[-2000:]}")
+    return parse(completed.stderr)
+
+
+def report(modules: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    by_package: Dict[str, int] = defaultdict(int)
+    for m in modules:
+        by_package[package_of(m["module"])] += m["self_us"]
+    total = sum(by_package.values())
+    return {
+        "total_ms": round(total / 1000, 1),
+        "modules": len(modules),
+        "packages": {
+            name: round(us / 1000, 1) for name, us in sorted(by_package.items(), key=lambda kv: -kv[1])
+        },
+        "top_cumulative": [
+            {"module": m["module"], "cumulative_ms": round(m["cumulative_us"] / 1000, 1)}
+            for m in sorted(modules, key=lambda m: -m["cumulative_us"])[:top]
+        ],
+    }
+
+
+def print_report(service: str, result: Dict[str, Any], top: int) -> None:
+    print(f"\n{service}: {result['total_ms']:.0f} ms importing {result['modules']} modules")
+    print(f"  {'package':<28} {'ms':>8} {'share':>6}")
+    for name, ms in list(result["packages"].items())[:top]:
+        print(f"  {name:<28} {ms:>8.1f} {ms / result['total_ms']:>6.1%}")
+    print(f"  {'module (cumulative)':<52} {'ms':>8}")
+    for m in result["top_cumulative"]:
+        print(f"  {m['module']:<52} {m['cumulative_ms']:>8.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--service", nargs="+", choices=SERVICES, default=list(SERVICES))
+    parser.add_argument("--runs", type=int, default=5, help="imports per service; the fastest is kept")
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    parser.add_argument("--python", help="interpreter the services run with")
+    parser.add_argument("--out", help="JSON file to write")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for service in args.service:
+        venv = SERVICES_DIR / service / ".venv" / "bin" / "python"
+        python = args.python or (str(venv) if venv.exists() else sys.executable)
+        runs = [report(profile(service, python), args.top) for _ in range(max(1, args.runs))]
+        results[service] = min(runs, key=lambda r: r["total_ms"])
+        print_report(service, results[service], args.top)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nReport written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,578 @@
+"""
+Load test of the products, sellers and sales services against local
+stand-ins, with results kept as JSON baselines.
+
+For each service, ``run``:
+
+1. creates its tables (``create_tables.py``, from the service's own
+   models) in DynamoDB Local or in an in-process moto server
+2. starts it with uvicorn, or with ``--server gunicorn`` the production
+   profile (``gunicorn.conf.py``), trusting a local JWKS
+   (``local_auth.py``) and, for products, an S3 bucket in moto
+3. seeds ``--items`` items through the API with a seeded data generator
+4. drives each route (list, get, batch-get, create, update, delete) for
+   ``--duration`` seconds at ``--concurrency`` concurrent clients
+5. records throughput, latency percentiles and errors per route
+
+::
+
+    # DynamoDB Local from the services' docker-compose files, on :8001
+    python backend/benchmarks/loadtest.py run --items 1000 --concurrency 32 \\
+        --out backend/benchmarks/baselines/main.json
+
+    # same, in moto, with a service setting changed
+    python backend/benchmarks/loadtest.py run --backend moto --service products \\
+        --env KEY_FILTER_ENABLED=true --out /tmp/key-filter.json
+
+    python backend/benchmarks/loadtest.py compare backend/benchmarks/baselines/main.json /tmp/key-filter.json
+
+    # single uvicorn process against the gunicorn profile, with its workers
+    # from the CPU quota (or --workers N)
+    python backend/benchmarks/loadtest.py run --backend moto --out /tmp/uvicorn.json
+    python backend/benchmarks/loadtest.py run --backend moto --server gunicorn --out /tmp/gunicorn.json
+    python backend/benchmarks/loadtest.py compare /tmp/uvicorn.json /tmp/gunicorn.json
+
+``compare`` exits with status 1 when a route got slower (p50/p95/p99) or
+slower to serve (throughput) by more than ``--threshold``, or its error
+rate went up, so it can gate CI.
+
+Needs httpx, pyjwt, cryptography, boto3 and pynamodb next to the harness,
+plus ``moto[server]`` for ``--backend moto`` or when products runs
+without ``--s3-endpoint``. Each service runs with its own virtualenv
+(``<service>/.venv``) when it exists, else with this interpreter.
+Neither stand-in throttles, so capacity limits are not part of the
+picture: numbers compare code paths, not production throughput.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Deque, Dict, Iterator, List, Optional
+
+import httpx
+
+from local_auth import LocalIssuer
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SERVICES_DIR = BENCHMARKS_DIR.parent / "services"
+REGION = "us-east-1"
+USER_POOL_ID = f"{REGION}_loadtest"
+APP_CLIENT_ID = "loadtest"
+IMAGES_BUCKET = "loadtest-product-images"
+OPERATIONS = ("list", "get", "batch_get", "create", "update", "delete")
+# a 1x1 transparent PNG, for the multipart product writes
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000b49444154789c6360000200000500017a5eab3f0000000049454e44ae42"
+    "6082"
+)
+
+Operation = Callable[[httpx.AsyncClient], Awaitable[Optional[httpx.Response]]]
+
+
+# --- workloads ---------------------------------------------------------------
+
+
+class Workload:
+    """
+    Requests for one service. ``codes`` are the ids of the items known to
+    exist; ``operations()`` maps route names to one request each (None
+    when there is nothing left to act on).
+    """
+
+    service: str
+    table_env: str
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.codes: List[str] = []
+        self._doomed: Deque[str] = deque()
+        self._counter = 0
+
+    def next_id(self) -> int:
+        self._counter += 1
+        return self._counter
+
+    async def create(self, client: httpx.AsyncClient) -> httpx.Response:
+        raise NotImplementedError
+
+    def created(self, response: httpx.Response) -> None:
+        if response.status_code == 201:
+            self.codes.append(response.json()[self.id_field])
+            self._doomed.append(self.codes[-1])
+
+    id_field = "code"
+
+    def operations(self) -> Dict[str, Operation]:
+        async def list_all(client):
+            return await client.get("/api/v1/")
+
+        async def get(client):
+            return await client.get(f"/api/v1/{self.rng.choice(self.codes)}")
+
+        async def create(client):
+            response = await self.create(client)
+            self.created(response)
+            return response
+
+        async def delete(client):
+            if not self._doomed:
+                return None
+            code = self._doomed.popleft()
+            self.codes.remove(code)
+            return await client.delete(f"/api/v1/{code}")
+
+        return {"list": list_all, "get": get, "create": create, "delete": delete}
+
+
+class ProductsWorkload(Workload):
+    service = "products"
+    table_env = "PRODUCTS_TABLE_NAME"
+
+    def _payload(self) -> Dict[str, str]:
+        n = self.next_id()
+        product = {
+            "name": f"Product {n} {uuid.uuid4().hex[:8]}",
+            "description": " ".join(self.rng.choices(["fast", "red", "steel", "wireless", "compact"], k=8)),
+            "price": f"{self.rng.uniform(1, 500):.2f}",
+        }
+        return {"product": json.dumps(product)}
+
+    async def create(self, client):
+        return await client.post("/api/v1/", data=self._payload(), files={"image": ("bench.png", PNG, "image/png")})
+
+    def operations(self):
+        ops = super().operations()
+
+        async def batch_get(client):
+            codes = self.rng.sample(self.codes, min(25, len(self.codes)))
+            return await client.post("/api/v1/batch-get", json={"codes": codes})
+
+        async def update(client):
+            code = self.rng.choice(self.codes)
+            return await client.put(
+                f"/api/v1/{code}", data=self._payload(), files={"image": ("bench.png", PNG, "image/png")}
+            )
+
+        return {**ops, "batch_get": batch_get, "update": update}
+
+
+class SellersWorkload(Workload):
+    service = "sellers"
+    table_env = "SELLERS_TABLE_NAME"
+    id_field = "id"
+
+    def _payload(self) -> Dict[str, str]:
+        n = self.next_id()
+        return {"name": f"Seller {n}", "email": f"seller.{n}.{uuid.uuid4().hex[:8]}@example.com"}
+
+    async def create(self, client):
+        return await client.post("/api/v1/", json=self._payload())
+
+    def operations(self):
+        ops = super().operations()
+
+        async def batch_get(client):
+            codes = self.rng.sample(self.codes, min(25, len(self.codes)))
+            return await client.post("/api/v1/batch-get", json={"codes": codes})
+
+        async def update(client):
+            return await client.put(f"/api/v1/{self.rng.choice(self.codes)}", json=self._payload())
+
+        return {**ops, "batch_get": batch_get, "update": update}
+
+
+class SalesWorkload(Workload):
+    """Sales can't be updated and have no batch lookup: list, get, create, delete."""
+
+    service = "sales"
+    table_env = "SALES_TABLE_NAME"
+    id_field = "id"
+
+    def __init__(self, rng: random.Random):
+        super().__init__(rng)
+        # random codes: _service_env blanks the sibling services' URLs, so
+        # sales does not look its references up
+        self._sellers = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(50)]
+        self._products = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(200)]
+
+    async def create(self, client):
+        n = self.next_id()
+        return await client.post("/api/v1/", json={
+            "invoice_number": f"INV-{n:08d}-{uuid.uuid4().hex[:8]}",
+            "sale_date": (date.today() - timedelta(days=self.rng.randrange(365))).isoformat(),
+            "seller_code": self.rng.choice(self._sellers),
+            "product_code": self.rng.choice(self._products),
+        })
+
+
+WORKLOADS = {w.service: w for w in (ProductsWorkload, SellersWorkload, SalesWorkload)}
+
+
+# --- measurement -------------------------------------------------------------
+
+
+@dataclass
+class Samples:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> Dict[str, float]:
+        n = len(self.latencies)
+        ok = n - self.errors
+        out: Dict[str, float] = {
+            "requests": n,
+            "errors": self.errors,
+            "error_rate": round(self.errors / n, 4) if n else 0.0,
+            "throughput_rps": round(ok / self.elapsed, 2) if self.elapsed else 0.0,
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+        if n:
+            ms = sorted(x * 1000 for x in self.latencies)
+            cuts = statistics.quantiles(ms, n=100, method="inclusive") if n > 1 else [ms[0]] * 99
+            out.update(
+                mean_ms=round(statistics.fmean(ms), 3),
+                p50_ms=round(cuts[49], 3),
+                p95_ms=round(cuts[94], 3),
+                p99_ms=round(cuts[98], 3),
+                max_ms=round(ms[-1], 3),
+            )
+        return out
+
+
+async def drive(
+    client: httpx.AsyncClient, operation: Operation, concurrency: int, duration: float, max_requests: int
+) -> Samples:
+    """Run ``operation`` from ``concurrency`` workers until the time or request budget is spent."""
+    samples = Samples()
+    deadline = time.perf_counter() + duration
+    budget = max_requests or sys.maxsize
+
+    async def worker():
+        nonlocal budget
+        while time.perf_counter() < deadline and budget > 0:
+            budget -= 1
+            start = time.perf_counter()
+            try:
+                response = await operation(client)
+            except httpx.HTTPError as e:
+                samples.statuses[type(e).__name__] += 1
+                samples.errors += 1
+                samples.latencies.append(time.perf_counter() - start)
+                continue
+            if response is None:
+                return  # nothing left to act on
+            samples.latencies.append(time.perf_counter() - start)
+            samples.statuses[str(response.status_code)] += 1
+            if response.status_code >= 400:
+                samples.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    samples.elapsed = time.perf_counter() - started
+    return samples
+
+
+async def seed(client: httpx.AsyncClient, workload: Workload, items: int, concurrency: int) -> Samples:
+    async def create(client):
+        response = await workload.create(client)
+        workload.created(response)
+        return response
+
+    samples = await drive(client, create, concurrency, duration=float("inf"), max_requests=items)
+    if len(workload.codes) < items:
+        raise RuntimeError(f"Seeding {workload.service} failed: {samples.summary()['statuses']}")
+    return samples
+
+
+async def benchmark(base_url: str, token: str, workload: Workload, args) -> Dict[str, Dict[str, float]]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60.0) as client:
+        results = {"seed": (await seed(client, workload, args.items, args.concurrency)).summary()}
+        operations = workload.operations()
+        for name in args.ops:
+            if name not in operations:
+                continue
+            for _ in range(args.warmup_requests):
+                await operations[name](client)
+            samples = await drive(client, operations[name], args.concurrency, args.duration, args.max_requests)
+            results[name] = samples.summary()
+            _print_row(workload.service, name, results[name])
+        return results
+
+
+# --- local environment -------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def moto_server() -> Iterator[str]:
+    from moto.server import ThreadedMotoServer
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # one line per AWS call otherwise
+    port = _free_port()
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.stop()
+
+
+def _service_python(service_dir: Path, override: Optional[str]) -> str:
+    if override:
+        return override
+    venv = service_dir / ".venv" / "bin" / "python"
+    return str(venv) if venv.exists() else sys.executable
+
+
+def _service_env(workload: Workload, dynamodb: str, s3: Optional[str], jwks_url: str, extra: Dict[str, str]):
+    env = {
+        **os.environ,
+        "AWS_REGION": REGION,
+        "AWS_DEFAULT_REGION": REGION,
+        "AWS_ACCESS_KEY_ID": os.environ.get("AWS_ACCESS_KEY_ID", "loadtest"),
+        "AWS_SECRET_ACCESS_KEY": os.environ.get("AWS_SECRET_ACCESS_KEY", "loadtest"),
+        "DYNAMODB_ENDPOINT_URL": dynamodb,
+        "COGNITO_USERPOOL_ID": USER_POOL_ID,
+        "COGNITO_APP_CLIENT_ID": APP_CLIENT_ID,
+        "COGNITO_JWKS_URL": jwks_url,
+        "LOG_LEVEL": "WARNING",
+        workload.table_env: f"LoadTest{workload.service.capitalize()}",
+    }
+    if workload.service == "products":
+        env.update(PRODUCT_IMAGES_BUCKET=IMAGES_BUCKET, S3_ENDPOINT_URL=s3 or "")
+    elif workload.service == "sales":
+        # sales/.env points these at localhost; only sales runs here
+        env.update(SELLERS_SERVICE_URL="", PRODUCTS_SERVICE_URL="")
+    env.update(extra)
+    return env
+
+
+def _server_command(server: str, python: str, port: int) -> List[str]:
+    if server == "gunicorn":
+        return [
+            python, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app",
+            "--bind", f"127.0.0.1:{port}", "--log-level", "warning",
+        ]
+    return [python, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+
+
+@contextmanager
+def running_service(
+    service_dir: Path, python: str, env: Dict[str, str], port: int, server: str = "uvicorn"
+) -> Iterator[str]:
+    subprocess.run(
+        [python, str(BENCHMARKS_DIR / "create_tables.py")], cwd=service_dir, env=env, check=True
+    )
+    process = subprocess.Popen(_server_command(server, python, port), cwd=service_dir, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(base_url, process)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _wait_ready(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Service exited with status {process.returncode} before becoming ready")
+        try:
+            if httpx.get(f"{base_url}/health/ready", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"{base_url} not ready after {timeout:.0f}s")
+
+
+def _create_bucket(endpoint: str) -> None:
+    import boto3
+
+    s3 = boto3.client(
+        "s3", region_name=REGION, endpoint_url=endpoint,
+        aws_access_key_id="loadtest", aws_secret_access_key="loadtest",
+    )
+    s3.create_bucket(Bucket=IMAGES_BUCKET)
+
+
+# --- commands ----------------------------------------------------------------
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARKS_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_row(service: str, operation: str, stats: Dict[str, float]) -> None:
+    if not stats.get("requests"):
+        print(f"{service:<9} {operation:<10} no requests")
+        return
+    print(
+        f"{service:<9} {operation:<10} {stats['throughput_rps']:>9.1f} req/s  "
+        f"p50 {stats['p50_ms']:>8.2f}  p95 {stats['p95_ms']:>8.2f}  p99 {stats['p99_ms']:>8.2f} ms  "
+        f"errors {stats['errors']}"
+    )
+
+
+def run(args) -> int:
+    extra = dict(item.split("=", 1) for item in args.env)
+    baseline = {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "commit": _git_commit(),
+            "label": args.label,
+            "backend": args.backend,
+            "server": args.server,
+            "workers": args.workers,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "items": args.items,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "env": extra,
+        },
+        "services": {},
+    }
+    with ExitStack() as stack:
+        dynamodb = args.dynamodb_endpoint
+        s3 = args.s3_endpoint
+        if args.backend == "moto":
+            dynamodb = stack.enter_context(moto_server())
+            s3 = s3 or dynamodb
+        elif "products" in args.service and not s3:
+            s3 = stack.enter_context(moto_server())
+        if "products" in args.service:
+            _create_bucket(s3)
+
+        issuer = stack.enter_context(
+            LocalIssuer(f"https://cognito-idp.{REGION}.amazonaws.com/{USER_POOL_ID}", APP_CLIENT_ID)
+        )
+        token = issuer.token()
+        for i, service in enumerate(args.service):
+            workload = WORKLOADS[service](random.Random(args.seed + i))
+            service_dir = SERVICES_DIR / service
+            env = _service_env(workload, dynamodb, s3, issuer.jwks_url, extra)
+            if args.workers:
+                env["WEB_CONCURRENCY"] = str(args.workers)
+            python = _service_python(service_dir, args.python)
+            with running_service(service_dir, python, env, _free_port(), args.server) as base_url:
+                baseline["services"][service] = asyncio.run(benchmark(base_url, token, workload, args))
+
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {args.out}")
+    return 0
+
+
+def compare(args) -> int:
+    """Print old vs new per route; exit 1 if any route regressed beyond the threshold."""
+    old = json.loads(Path(args.baseline).read_text())
+    new = json.loads(Path(args.candidate).read_text())
+    regressions: List[str] = []
+    print(f"{'route':<22} {'metric':<15} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for service, operations in new["services"].items():
+        for operation, stats in operations.items():
+            if operation == "seed":
+                continue  # depends on --items more than on the code
+            before = old.get("services", {}).get(service, {}).get(operation)
+            if not before or not before.get("requests") or not stats.get("requests"):
+                continue
+            route = f"{service}.{operation}"
+            for metric, higher_is_worse in (
+                ("p50_ms", True), ("p95_ms", True), ("p99_ms", True), ("throughput_rps", False)
+            ):
+                a, b = before[metric], stats[metric]
+                change = (b - a) / a if a else 0.0
+                worse = change > args.threshold if higher_is_worse else change < -args.threshold
+                flag = "  REGRESSION" if worse else ""
+                print(f"{route:<22} {metric:<15} {a:>10.2f} {b:>10.2f} {change:>+8.1%}{flag}")
+                if worse:
+                    regressions.append(f"{route} {metric} {change:+.1%}")
+            if stats["error_rate"] > before["error_rate"] + args.error_threshold:
+                regressions.append(f"{route} error_rate {before['error_rate']:.2%} -> {stats['error_rate']:.2%}")
+                print(f"{route:<22} {'error_rate':<15} {before['error_rate']:>10.2%} {stats['error_rate']:>10.2%}  REGRESSION")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0], formatter_class=argparse.RawTextHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="benchmark the services and write a baseline")
+    run_parser.add_argument("--service", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    run_parser.add_argument("--ops", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    run_parser.add_argument("--backend", choices=("dynamodb-local", "moto"), default="dynamodb-local")
+    run_parser.add_argument("--dynamodb-endpoint", default="http://localhost:8001")
+    run_parser.add_argument(
+        "--server", choices=("uvicorn", "gunicorn"), default="uvicorn",
+        help="one uvicorn process, or the production profile of gunicorn.conf.py",
+    )
+    run_parser.add_argument("--workers", type=int, default=0, help="gunicorn workers; 0 = from the CPU quota (sales always runs 1)")
+    run_parser.add_argument("--s3-endpoint", default="", help="S3 for product images; moto when omitted")
+    run_parser.add_argument("--items", type=int, default=500, help="items seeded before the routes are driven")
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--duration", type=float, default=15.0, help="seconds per route")
+    run_parser.add_argument("--max-requests", type=int, default=0, help="cap per route; 0 = time only")
+    run_parser.add_argument("--warmup-requests", type=int, default=5, help="unmeasured requests before each route")
+    run_parser.add_argument("--seed", type=int, default=42, help="data generator seed")
+    run_parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="service setting")
+    run_parser.add_argument("--python", help="interpreter the services run with")
+    run_parser.add_argument("--label", default="", help="free text kept in the baseline")
+    run_parser.add_argument("--out", help="baseline file to write")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two baselines")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="relative change tolerated")
+    compare_parser.add_argument("--error-threshold", type=float, default=0.01, help="absolute error rate increase")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Local stand-in for the Cognito user pool, for load tests.
+
+Generates an RSA key pair, serves its public half as a JWKS on
+``http://127.0.0.1:<port>/.well-known/jwks.json`` and mints ID tokens the
+services accept once ``COGNITO_JWKS_URL`` points at it: same issuer
+format, audience (``COGNITO_APP_CLIENT_ID``) and RS256 signature as the
+real pool.
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+
+class LocalIssuer:
+    """
+    Signs tokens for ``issuer``/``audience`` and serves the JWKS needed
+    to verify them. Use as a context manager, or call start()/stop().
+    """
+
+    def __init__(self, issuer: str, audience: str, port: int = 0):
+        self.issuer = issuer
+        self.audience = audience
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._kid = uuid.uuid4().hex
+        public = json.loads(RSAAlgorithm.to_jwk(self._key.public_key()))
+        jwks = json.dumps({"keys": [{**public, "kid": self._kid, "alg": "RS256", "use": "sig"}]}).encode()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/.well-known/jwks.json":
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(jwks)))
+                self.end_headers()
+                self.wfile.write(jwks)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def jwks_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/.well-known/jwks.json"
+
+    def token(self, subject: str = "loadtest", groups: Optional[List[str]] = None, ttl: int = 3600) -> str:
+        now = int(time.time())
+        claims = {
+            "sub": subject,
+            "iss": self.issuer,
+            "aud": self.audience,
+            "token_use": "id",
+            "iat": now,
+            "exp": now + ttl,
+            "email": f"{subject}@example.com",
+        }
+        if groups:
+            claims["cognito:groups"] = groups
+        return jwt.encode(claims, self._key, algorithm="RS256", headers={"kid": self._kid})
+
+    def start(self) -> "LocalIssuer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-jwks", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LocalIssuer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,194 @@
+"""
+Mappers measured by ``microbench.py``, by service and stage.
+
+Each list response goes through four stages, each fed the output of the
+previous one:
+
+- ``from_raw``: DynamoDB item (attribute-value JSON) to PynamoDB model,
+  as done by ``scan``/``query``
+- ``to_domain``: PynamoDB model to domain entity (the repository's
+  ``_to_domain``)
+- ``from_domain``: entity to response schema (``*Out.from_domain``)
+- ``response``: schemas to JSON bytes, the way FastAPI serves the list
+  route's ``response_model``
+
+``current`` is the code the services run. To compare a faster mapper,
+register it under another name; it gets the same inputs and shows up
+next to ``current``::
+
+    @mapper("products", "to_domain", "no_decimal")
+    def _(ctx: Context) -> Batch:
+        to_domain = ...
+        return lambda items: [to_domain(item) for item in items]
+
+Factories run inside the service's process, with its ``src`` package
+importable, and get a Context giving access to its modules.
+"""
+
+import asyncio
+import importlib
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+Batch = Callable[[List[Any]], List[Any]]
+STAGES = ("from_raw", "to_domain", "from_domain", "response")
+BASELINE = "current"
+
+# service -> stage -> mapper name -> factory
+MAPPERS: Dict[str, Dict[str, Dict[str, Callable[["Context"], Batch]]]] = {}
+
+
+def mapper(service: str, stage: str, name: str):
+    """Register a mapper factory for ``service``/``stage`` under ``name``."""
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage {stage!r}")
+
+    def register(factory: Callable[["Context"], Batch]) -> Callable[["Context"], Batch]:
+        MAPPERS.setdefault(service, {}).setdefault(stage, {})[name] = factory
+        return factory
+
+    return register
+
+
+@dataclass
+class Entity:
+    """Where a service keeps the pieces of its list path."""
+    model: str
+    out: str
+    make_item: Callable[[random.Random, int], Dict[str, Any]]
+
+
+class Context:
+    def __init__(self, service: str):
+        self.service = service
+        self.entity = ENTITIES[service]
+        self.repository = importlib.import_module("src.infrastructure.adapters.db.dynamodb_repository")
+        self.schemas = importlib.import_module("src.infrastructure.adapters.http.schemas")
+        self.routers = importlib.import_module("src.infrastructure.adapters.http.routers")
+        self.model = getattr(self.repository, self.entity.model)
+        self.out = getattr(self.schemas, self.entity.out)
+
+    def raw_items(self, n: int, seed: int = 42) -> List[Dict[str, Any]]:
+        """``n`` items as DynamoDB returns them."""
+        rng = random.Random(seed)
+        return [self.model(**self.entity.make_item(rng, i)).serialize() for i in range(n)]
+
+    def list_route(self):
+        return next(
+            route for route in self.routers.router.routes
+            if route.path == "/api/v1/" and "GET" in route.methods
+        )
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _moment(rng: random.Random) -> datetime:
+    return datetime(2024, 1, 1, tzinfo=UTC) + timedelta(seconds=rng.randrange(60 * 86400), microseconds=rng.randrange(10**6))
+
+
+def _product(rng: random.Random, i: int) -> Dict[str, Any]:
+    created = _moment(rng)
+    return {
+        "code": _uuid(rng),
+        "name": f"Product {i}",
+        "description": "Teclado mecánico con switches rojos y retroiluminación",
+        "price": round(rng.uniform(1, 500), 2),
+        "created_at": created.isoformat(),
+        "updated_at": (created + timedelta(hours=rng.randrange(1, 500))).isoformat(),
+        "image_url": f"https://product-images.s3.us-east-1.amazonaws.com/{i}.png",
+        "feed_shard": str(i % 4),
+    }
+
+
+def _seller(rng: random.Random, i: int) -> Dict[str, Any]:
+    code = _uuid(rng)
+    created = _moment(rng)
+    return {
+        "code": code,
+        "id": code,
+        "name": f"Seller {i}",
+        "email": f"seller.{i}@example.com",
+        "created_at": created,
+        "updated_at": created + timedelta(hours=rng.randrange(1, 500)),
+        "feed_shard": str(i % 4),
+    }
+
+
+def _sale(rng: random.Random, i: int) -> Dict[str, Any]:
+    created = _moment(rng)
+    return {
+        "id": _uuid(rng),
+        "invoice_number": f"INV-{i:08d}",
+        "sale_date": created.date().isoformat(),
+        "seller_code": _uuid(rng),
+        "product_code": _uuid(rng),
+        "created_at": created.isoformat(),
+        "product_name": f"Product {rng.randrange(1000)}",
+        "unit_price": f"{rng.uniform(1, 500):.2f}",
+        "seller_name": f"Seller {rng.randrange(100)}",
+    }
+
+
+ENTITIES = {
+    "products": Entity("ProductModel", "ProductOut", _product),
+    "sellers": Entity("SellerModel", "SellerOut", _seller),
+    "sales": Entity("SaleModel", "SaleOut", _sale),
+}
+
+
+# --- what the services run ---------------------------------------------------
+
+
+for _service in ENTITIES:
+
+    @mapper(_service, "from_raw", BASELINE)
+    def _from_raw(ctx: Context) -> Batch:
+        return lambda items: [ctx.model.from_raw_data(item) for item in items]
+
+    @mapper(_service, "to_domain", BASELINE)
+    def _to_domain(ctx: Context) -> Batch:
+        to_domain = ctx.repository._to_domain
+        return lambda items: [to_domain(item) for item in items]
+
+    @mapper(_service, "from_domain", BASELINE)
+    def _from_domain(ctx: Context) -> Batch:
+        from_domain = ctx.out.from_domain
+        return lambda entities: [from_domain(e) for e in entities]
+
+    @mapper(_service, "response", BASELINE)
+    def _response(ctx: Context) -> Batch:
+        from fastapi.responses import JSONResponse
+        from fastapi.routing import serialize_response
+
+        route = ctx.list_route()
+        loop = asyncio.new_event_loop()
+
+        def render(outs: List[Any]) -> List[bytes]:
+            content = loop.run_until_complete(serialize_response(
+                field=route.response_field,
+                response_content=outs,
+                exclude_unset=route.response_model_exclude_unset,
+            ))
+            return [JSONResponse(content).body]
+
+        return render
+
+
+# --- candidates --------------------------------------------------------------
+
+
+for _service in ENTITIES:
+
+    @mapper(_service, "response", "dump_json")
+    def _dump_json(ctx: Context) -> Batch:
+        """The schemas are built by from_domain already: serialize them without validating again."""
+        from pydantic import TypeAdapter
+
+        adapter = TypeAdapter(List[ctx.out])
+        exclude_unset = ctx.list_route().response_model_exclude_unset
+        return lambda outs: [adapter.dump_json(outs, by_alias=True, exclude_unset=exclude_unset)]
@@ -0,0 +1,168 @@
+"""
+Microbenchmarks of the list path's mapping and serialization, per item.
+
+For every service and every stage of ``mappers.py`` (DynamoDB item to
+model, model to entity, entity to schema, schemas to JSON), times each
+registered mapper over batches of 1, 1000 and 100000 items and counts
+what it allocates::
+
+    python backend/benchmarks/microbench.py
+    python backend/benchmarks/microbench.py --service products --sizes 1000 --out /tmp/mapping.json
+
+Reported per item: the best and median time over the repeats, the peak
+memory traced while mapping the batch, and the memory blocks the output
+keeps alive (tracemalloc, in a separate untimed run). Each service runs
+in its own process from its directory, since all three name their
+package ``src``; the services' dependencies must be importable there
+(``<service>/.venv`` is used when it exists).
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SERVICES_DIR = BENCHMARKS_DIR.parent / "services"
+SERVICES = ("products", "sellers", "sales")
+DEFAULT_SIZES = (1, 1000, 100_000)
+# the services' settings only need to parse; nothing connects anywhere
+SERVICE_ENV = {
+    "AWS_REGION": "us-east-1",
+    "COGNITO_USERPOOL_ID": "us-east-1_microbench",
+    "COGNITO_APP_CLIENT_ID": "microbench",
+    "PRODUCTS_TABLE_NAME": "Products",
+    "PRODUCT_IMAGES_BUCKET": "product-images",
+    "SELLERS_TABLE_NAME": "Sellers",
+    "SALES_TABLE_NAME": "Sales",
+    "LOG_LEVEL": "WARNING",
+}
+
+
+def _repeats(size: int, budget: int) -> int:
+    """Enough repeats for ``budget`` items in total, between 3 and 1000."""
+    return max(3, min(1000, budget // size))
+
+
+def measure(fn, inputs: List[Any], repeats: int) -> Dict[str, float]:
+    n = len(inputs)
+    times: List[float] = []
+    gc.collect()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(inputs)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    output = fn(inputs)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del output
+
+    return {
+        "repeats": repeats,
+        "best_us_per_item": round(min(times) / n * 1e6, 3),
+        "median_us_per_item": round(statistics.median(times) / n * 1e6, 3),
+        "peak_bytes_per_item": round(peak / n, 1),
+        "retained_blocks_per_item": round(retained / n, 2),
+    }
+
+
+def worker(service: str, sizes: List[int], budget: int, only: Optional[List[str]]) -> Dict[str, Any]:
+    """Runs inside the service's directory and process."""
+    sys.path.insert(0, str(Path.cwd()))
+    sys.path.insert(0, str(BENCHMARKS_DIR))
+    from mappers import BASELINE, MAPPERS, STAGES, Context
+
+    ctx = Context(service)
+    results: Dict[str, Any] = {}
+    for size in sizes:
+        repeats = _repeats(size, budget)
+        inputs = ctx.raw_items(size)
+        by_stage: Dict[str, Any] = {}
+        for stage in STAGES:
+            factories = MAPPERS[service][stage]
+            by_mapper = {}
+            for name, factory in factories.items():
+                if only and name != BASELINE and name not in only:
+                    continue
+                by_mapper[name] = measure(factory(ctx), inputs, repeats)
+            by_stage[stage] = by_mapper
+            # the next stage starts from what the services produce today
+            inputs = factories[BASELINE](ctx)(inputs)
+        results[str(size)] = by_stage
+    return results
+
+
+def run_service(service: str, args) -> Dict[str, Any]:
+    service_dir = SERVICES_DIR / service
+    venv = service_dir / ".venv" / "bin" / "python"
+    python = args.python or (str(venv) if venv.exists() else sys.executable)
+    command = [
+        python, str(Path(__file__).resolve()), "--worker", service,
+        "--sizes", *map(str, args.sizes), "--budget", str(args.budget),
+    ]
+    if args.mappers:
+        command += ["--mappers", *args.mappers]
+    completed = subprocess.run(
+        command, cwd=service_dir, env={**os.environ, **SERVICE_ENV}, check=True, capture_output=True, text=True
+    )
+    return json.loads(completed.stdout)
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"{'service':<9} {'items':>7} {'stage':<12} {'mapper':<14} {'best µs':>9} {'median µs':>10} "
+          f"{'peak B':>9} {'blocks':>7} {'vs current':>10}")
+    for service, sizes in results.items():
+        for size, stages in sizes.items():
+            for stage, mappers in stages.items():
+                baseline = mappers.get("current", {}).get("median_us_per_item")
+                for name, m in mappers.items():
+                    ratio = f"{baseline / m['median_us_per_item']:.2f}x" if baseline and name != "current" else ""
+                    print(
+                        f"{service:<9} {size:>7} {stage:<12} {name:<14} {m['best_us_per_item']:>9.2f} "
+                        f"{m['median_us_per_item']:>10.2f} {m['peak_bytes_per_item']:>9.0f} "
+                        f"{m['retained_blocks_per_item']:>7.1f} {ratio:>10}"
+                    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--service", nargs="+", choices=SERVICES, default=list(SERVICES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--budget", type=int, default=300_000, help="items mapped per measurement, over repeats")
+    parser.add_argument("--mappers", nargs="+", help="alternatives to run next to 'current' (default: all)")
+    parser.add_argument("--python", help="interpreter the services run with")
+    parser.add_argument("--out", help="JSON file to write")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        json.dump(worker(args.worker, args.sizes, args.budget, args.mappers), sys.stdout)
+        return 0
+
+    results = {service: run_service(service, args) for service in args.service}
+    print_table(results)
+    if args.out:
+        Path(args.out).write_text(json.dumps({
+            "meta": {"python": platform.python_version(), "platform": platform.platform(), "sizes": args.sizes},
+            "services": results,
+        }, indent=2) + "\n")
+        print(f"Results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
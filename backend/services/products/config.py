@@ -11,7 +11,82 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     COGNITO_USERPOOL_ID: str
     COGNITO_APP_CLIENT_ID: str
+    COGNITO_JWKS_URL: str = ""  # overrides the user pool's JWKS, e.g. a local one for load tests
     PRODUCT_IMAGES_BUCKET:str
+    S3_ENDPOINT_URL: str = ""
+    EXPORT_PAGE_SIZE: int = 1000
+
+    CHANGE_FEED_SHARDS: int = 4
+    CHANGE_FEED_SETTLE_SECONDS: float = 5.0
+    CHANGE_FEED_RETENTION_DAYS: int = 30  # tombstone lifetime, and so the oldest usable sync token
+    CHANGE_FEED_PAGE_SIZE: int = 500
+    CHANGE_FEED_MAX_PAGE_SIZE: int = 1000
+
+    # Bloom filter of existing codes; lookups of codes it rules out skip DynamoDB
+    KEY_FILTER_ENABLED: bool = False
+    KEY_FILTER_CAPACITY: int = 1_000_000
+    KEY_FILTER_FP_RATE: float = 0.01
+    KEY_FILTER_SCAN_SEGMENTS: int = 8
+    KEY_FILTER_SYNC_SECONDS: float = 2.0  # how often other instances' creates are picked up
+    KEY_FILTER_REBUILD_SECONDS: float = 3600.0
+    KEY_FILTER_MAX_STALENESS_SECONDS: float = 30.0
+
+    # Shared by every AWS client (DynamoDB, S3); per client, not per adapter
+    AWS_MAX_POOL_CONNECTIONS: int = 50
+    AWS_CONNECT_TIMEOUT_SECONDS: float = 2.0
+    AWS_READ_TIMEOUT_SECONDS: float = 10.0
+    AWS_TCP_KEEPALIVE: bool = True
+    AWS_RETRY_MODE: str = "standard"  # "legacy", "standard" or "adaptive"
+    AWS_MAX_ATTEMPTS: int = 3
+
+    # Client-side limits, in item operations per second; 0 = unlimited (on-demand tables)
+    DYNAMODB_READ_RATE: float = 0.0
+    DYNAMODB_WRITE_RATE: float = 0.0
+    DYNAMODB_BURST_SECONDS: float = 2.0
+    DYNAMODB_MAX_ATTEMPTS: int = 6
+    DYNAMODB_BACKOFF_BASE_MS: int = 50
+    DYNAMODB_BACKOFF_MAX_MS: int = 2000
+    DYNAMODB_RETRY_BUDGET_RATIO: float = 0.2
+    DYNAMODB_RETRY_BUDGET_MIN_PER_SECOND: float = 10.0
+
+    TRACING_EXPORTER: str = "none"  # "none", "console", "file" or "otlp"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_SAMPLE_RATIO: float = 1.0  # of traces started here; incoming ones keep their decision
+
+    # Cognito group allowed on /admin and to request X-Profile
+    ADMIN_GROUP: str = "admin"
+    PROFILE_SAMPLE_RATE: float = 0.0  # fraction of requests profiled without being asked
+    PROFILE_INTERVAL_MS: float = 1.0
+    PROFILE_STORE_SIZE: int = 20
+    PROFILE_SAMPLER_INTERVAL_MS: float = 50.0
+    PROFILE_SAMPLER_AUTOSTART: bool = False
+    PROFILE_SAMPLER_MAX_STACKS: int = 10000
+    MEMORY_TRACE_AUTOSTART: bool = False  # tracemalloc from startup; slows every allocation
+    MEMORY_TRACE_FRAMES: int = 1
+    MEMORY_DIFF_STORE_SIZE: int = 20
+    MEMORY_DIFF_TOP: int = 25
+    MEMORY_RSS_DELTA_ENABLED: bool = False  # http_request_rss_delta_bytes; reads /proc twice per request
+
+    # Startup work done before readiness instead of on the first requests
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT_SECONDS: float = 10.0  # per step
+    WARMUP_DYNAMODB_CONNECTIONS: int = 4
+
+    # X-Consumed-Capacity and Server-Timing on responses; the metrics are always kept
+    CONSUMED_CAPACITY_HEADERS: bool = True
+
+    IDEMPOTENCY_TABLE_NAME: str = ""
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_CLAIM_LEASE_SECONDS: float = 60.0  # in-flight claim; longer than the slowest POST
+    IDEMPOTENCY_CACHE_SIZE: int = 10000
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+
+    OUTBOX_TABLE_NAME: str = ""
+    OUTBOX_SINK: str = "local"  # "local" (in-process handlers) or "memory" (stand-in)
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_LEASE_SECONDS: float = 30.0
+    OUTBOX_DELIVERY_CONCURRENCY: int = 8
 
     @property
     def cognito_issuer(self) -> str:
@@ -19,7 +94,7 @@ class Settings(BaseSettings):
 
     @property
     def cognito_jwks_url(self) -> str:
-        return f"{self.cognito_issuer}/.well-known/jwks.json"
+        return self.COGNITO_JWKS_URL or f"{self.cognito_issuer}/.well-known/jwks.json"
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8", "extra": "ignore"}
 
@@ -0,0 +1,99 @@
+"""
+Production server: gunicorn managing uvicorn workers::
+
+    gunicorn -c gunicorn.conf.py main:app
+
+- one worker per CPU the container may use: its cgroup quota (v2
+  ``cpu.max``, else v1 ``cpu.cfs_quota_us``), capped by the CPUs it is
+  pinned to. ``WEB_CONCURRENCY`` sets the count outright;
+  ``WORKERS_PER_CORE`` (default 1) and ``MAX_WORKERS`` scale and cap it
+- uvloop and httptools, failing at start if they are missing rather
+  than falling back to asyncio and h11
+- HTTP keep-alive longer than the load balancer's idle timeout (60 s on
+  an ALB), so the balancer is the side that closes idle connections
+- workers recycled after ``max_requests`` (jittered so they do not all
+  restart together), finishing their requests within ``graceful_timeout``
+- the app imported once in the master before forking: workers share
+  its modules' memory copy-on-write and start in milliseconds. Clients,
+  pools and threads are only made in the lifespan, i.e. per worker
+
+Other settings can be overridden with ``GUNICORN_CMD_ARGS``.
+
+With several workers, Prometheus metrics go through files in
+``PROMETHEUS_MULTIPROC_DIR`` (a temporary directory unless set) so that
+``/metrics`` reports all workers, not the one answering the scrape.
+"""
+
+import math
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from uvicorn_worker import UvicornWorker
+
+
+class Worker(UvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+
+def _cgroup_cpus() -> Optional[float]:
+    """The CPU quota of the cgroup, in CPUs; None when unlimited or not in one."""
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def cpu_limit() -> float:
+    pinned = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota = _cgroup_cpus()
+    return min(quota, pinned) if quota else pinned
+
+
+def worker_count() -> int:
+    if os.environ.get("WEB_CONCURRENCY"):
+        return max(1, int(os.environ["WEB_CONCURRENCY"]))
+    # an async worker keeps one CPU busy on its own; a fraction of one is not worth a process
+    count = max(1, math.floor(cpu_limit() * float(os.environ.get("WORKERS_PER_CORE", "1"))))
+    return min(count, int(os.environ.get("MAX_WORKERS") or count))
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = worker_count()
+worker_class = Worker
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None  # heartbeat files off the overlay fs
+keepalive = 75
+max_requests = 10000
+max_requests_jitter = 1000
+graceful_timeout = 30
+timeout = 60
+preload_app = True
+
+if workers > 1:
+    # before the app, and prometheus_client with it, is imported
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="prometheus-"))
+
+
+def on_starting(server) -> None:
+    server.log.info("%d workers for %.2f CPUs", workers, cpu_limit())
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        # runs after the preload: drops the master's files along with any of a previous run
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker) -> None:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -10,12 +10,62 @@ from src.infrastructure.middlewares.exception_handlers import (
 from src.infrastructure.adapters.http.routers import router as products_router
 from src.infrastructure.logging import setup_logging
 from src.infrastructure.auth import get_current_user
+from src.infrastructure.adapters.db.idempotency_store import build_idempotency_store
+from src.infrastructure.middlewares.capacity import CapacityMiddleware
+from src.infrastructure.middlewares.idempotency import IdempotencyMiddleware
+from src.infrastructure.middlewares.metrics import MetricsMiddleware
+from src.infrastructure.middlewares.tracing import TracingMiddleware
+from src.infrastructure.adapters.http.metrics import router as metrics_router
+from src.infrastructure.adapters.http.admin import router as admin_router
+from src.infrastructure.middlewares.memory import MemoryMiddleware
+from src.infrastructure.middlewares.profiling import ProfilingMiddleware
+from src.infrastructure.metrics import RuntimeStatsCollector, register_runtime_collector
+from src.infrastructure.tracing import setup_tracing, tracing_enabled
+from src.infrastructure.warmup import warm_up
+from src.infrastructure.di import (
+    get_aws_clients,
+    get_capacity_tracker,
+    get_dispatcher,
+    get_guard,
+    get_key_filter,
+    get_memory_tracker,
+    get_profile_store,
+    get_repository,
+    get_single_flight,
+    get_stack_sampler,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging()
+    tracer_provider = setup_tracing()
+    aws_clients = get_aws_clients()  # before any adapter calls AWS
+    get_capacity_tracker().refresh()
+    unregister_metrics = register_runtime_collector(
+        RuntimeStatsCollector(get_guard(), get_single_flight(), get_key_filter(), aws_clients)
+    )
+    if (dispatcher := get_dispatcher()) is not None:
+        await dispatcher.start()
+    if (key_filter := get_key_filter()) is not None:
+        await key_filter.start(get_repository())
+    if settings.WARMUP_ENABLED:
+        await warm_up()
+    if settings.PROFILE_SAMPLER_AUTOSTART:
+        get_stack_sampler().start()
+    if settings.MEMORY_TRACE_AUTOSTART:
+        get_memory_tracker().start(settings.MEMORY_TRACE_FRAMES)
     yield
+    get_memory_tracker().stop()
+    get_stack_sampler().stop()
+    if key_filter is not None:
+        await key_filter.close()
+    if dispatcher is not None:
+        await dispatcher.close()
+    unregister_metrics()
+    aws_clients.close()
+    if tracer_provider is not None:
+        tracer_provider.shutdown()  # flushes the spans still queued
 
 
 app = FastAPI(
@@ -26,6 +76,13 @@ app = FastAPI(
     root_path="/products",
 )
 
+# Replays retried POSTs; added before CORS so replays still get CORS headers
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=build_idempotency_store(get_guard()),
+    wait_timeout=settings.IDEMPOTENCY_WAIT_SECONDS,
+)
+
 # Configure CORS to allow all origins
 app.add_middleware(
     CORSMiddleware,
@@ -35,7 +92,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    MemoryMiddleware,
+    tracker=get_memory_tracker(),
+    diff_top=settings.MEMORY_DIFF_TOP,
+)
+
+# Inside tracing and metrics, so a profile covers only the app itself
+app.add_middleware(
+    ProfilingMiddleware,
+    store=get_profile_store(),
+    sample_rate=settings.PROFILE_SAMPLE_RATE,
+    interval=settings.PROFILE_INTERVAL_MS / 1000,
+)
+
+# Outside idempotency, so the store's reads and writes count too
+app.add_middleware(
+    CapacityMiddleware,
+    tracker=get_capacity_tracker(),
+    headers=settings.CONSUMED_CAPACITY_HEADERS,
+)
+
+if tracing_enabled():
+    app.add_middleware(TracingMiddleware)
+
+# Outermost, so the latency covers the other middlewares too
+app.add_middleware(MetricsMiddleware, rss_delta=settings.MEMORY_RSS_DELTA_ENABLED)
+
 app.include_router(health_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
 app.include_router(products_router, dependencies=[Depends(get_current_user)])
 
 register_exception_handlers(app)
\ No newline at end of file
@@ -1,31 +1,85 @@
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 from uuid import UUID
 from decimal import Decimal
 
-from src.domain.entities import Price, Product
-from src.domain.exceptions import DuplicateProductError, InvalidPriceError, NotFoundError, ImageUploadError
+from src.domain.entities import Price, Product, ProductChange, Watermark
+from src.domain.exceptions import (
+    DuplicateProductError,
+    ExpiredWatermarkError,
+    InvalidPriceError,
+    NotFoundError,
+    ImageUploadError,
+)
 from src.domain.ports import ProductRepositoryPort, ProductServicePort, ImageClientPort
 
 
+# sorts after every code changed at the same instant
+END_OF_INSTANT = UUID(int=(1 << 128) - 1)
+
+
 class ProductService(ProductServicePort):
     """
     Implements the application use-cases for products, enforcing business rules
     and coordinating persistence.
     """
 
-    def __init__(self, repository: ProductRepositoryPort, image_client: ImageClientPort):
+    def __init__(
+        self,
+        repository: ProductRepositoryPort,
+        image_client: ImageClientPort,
+        feed_settle: timedelta = timedelta(seconds=5),
+        feed_retention: timedelta = timedelta(days=30),
+    ):
         self._repo = repository
         self._image_client = image_client
+        # the feed index is eventually consistent and writers stamp
+        # updated_at before they commit: only serve changes old enough
+        # that nothing can still land behind them
+        self._feed_settle = feed_settle
+        self._feed_retention = feed_retention
 
     async def list_products(self) -> List[Product]:
         return await self._repo.list_all()
 
+    async def list_products_page(
+        self, start_after: Optional[UUID], limit: int
+    ) -> Tuple[List[Product], Optional[UUID]]:
+        return await self._repo.list_page(start_after, limit)
+
     async def get_product(self, code: UUID) -> Product:
         product = await self._repo.get_by_code(code)
         if product is None:
             raise NotFoundError(code)
         return product
 
+    async def get_products(self, codes: List[UUID]) -> List[Product]:
+        if not codes:
+            return []
+        return await self._repo.get_many(codes)
+
+    async def list_changes(
+        self, since: Optional[Watermark], limit: int
+    ) -> Tuple[List[ProductChange], Watermark, bool]:
+        now = datetime.now(timezone.utc)
+        if since is not None and since.changed_at < now - self._feed_retention:
+            raise ExpiredWatermarkError(since.changed_at)
+
+        until = now - self._feed_settle
+        changes, more = await self._repo.list_changes(since, until, limit)
+        if more and changes:
+            watermark = changes[-1].watermark
+        elif more and since is not None:
+            # the page only held changes the client had already seen
+            watermark = since
+        else:
+            # caught up: everything up to ``until`` has been seen, so an idle
+            # client keeps moving forward and never ages out
+            watermark = Watermark(until, END_OF_INSTANT)
+            if since is not None:
+                watermark = max(watermark, since)
+        return changes, watermark, more
+
     async def create_product(
         self,
         name: str,
@@ -1,3 +1,4 @@
+from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
@@ -33,3 +34,30 @@ class ImageUploadError(DomainError):
     def __init__(self, detail: str) -> None:
         super().__init__(f"Image upload failed: {detail}")
         self.detail = detail
+
+
+class ExpiredWatermarkError(DomainError):
+    def __init__(self, changed_at: datetime) -> None:
+        """
+        :param changed_at: the position the client asked to resume from; it is
+            older than the tombstones kept, so deletes may have been missed.
+        """
+        super().__init__(f"Sync token from {changed_at.isoformat()} has expired; resync from scratch")
+        self.changed_at = changed_at
+
+
+class InvalidSyncTokenError(DomainError):
+    def __init__(self, token: str) -> None:
+        """
+        :param token: the ``since`` value that is not a token this service issued.
+        """
+        super().__init__(f"Invalid sync token: {token!r}")
+        self.token = token
+
+
+class CapacityExceededError(DomainError):
+    def __init__(self) -> None:
+        """
+        The data store kept refusing the request for lack of capacity.
+        """
+        super().__init__("The product store is busy; retry shortly")
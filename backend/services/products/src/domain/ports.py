@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from decimal import Decimal
 from uuid import UUID
 
-from src.domain.entities import Product
+from src.domain.entities import DomainEvent, Product, ProductChange, Watermark
 
 
 class ProductRepositoryPort(ABC):
@@ -18,6 +19,14 @@ class ProductRepositoryPort(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def list_page(self, start_after: Optional[UUID], limit: int) -> Tuple[List[Product], Optional[UUID]]:
+        """
+        Retrieve one page of products in table order, resuming after
+        ``start_after``; also returns the code to continue after (None at the end).
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def get_by_code(self, code: UUID) -> Optional[Product]:
         """
@@ -25,6 +34,32 @@ class ProductRepositoryPort(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def get_many(self, codes: List[UUID]) -> List[Product]:
+        """
+        Fetch several products in one round trip (BatchGetItem).
+        Unknown codes are silently skipped.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def list_changes(
+        self, after: Optional[Watermark], until: datetime, limit: int
+    ) -> Tuple[List[ProductChange], bool]:
+        """
+        Retrieve products created, updated or deleted after ``after`` (from
+        the start when None) and no later than ``until``, in feed order.
+        :return: at most ``limit`` changes, and whether more may follow.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def scan_codes(self, total_segments: int) -> List[str]:
+        """
+        Codes of all live products, read in ``total_segments`` parallel parts.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def get_by_name(self, name: str) -> Optional[Product]:
         """
@@ -62,7 +97,8 @@ class ProductRepositoryPort(ABC):
     @abstractmethod
     async def delete(self, code: UUID) -> None:
         """
-        Remove a product from the data store by its UUID code.
+        Remove a product from the data store by its UUID code, leaving a
+        tombstone for the change feed.
         """
         raise NotImplementedError()
 
@@ -86,6 +122,15 @@ class ProductServicePort(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def list_products_page(
+        self, start_after: Optional[UUID], limit: int
+    ) -> Tuple[List[Product], Optional[UUID]]:
+        """
+        Business use-case: page through all products, e.g. for exports.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def get_product(self, code: UUID) -> Product:
         """
@@ -93,6 +138,26 @@ class ProductServicePort(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def get_products(self, codes: List[UUID]) -> List[Product]:
+        """
+        Business use-case: retrieve several products at once; unknown codes are omitted.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def list_changes(
+        self, since: Optional[Watermark], limit: int
+    ) -> Tuple[List[ProductChange], Watermark, bool]:
+        """
+        Business use-case: what changed since a client last synced.
+        :return: the changes, the watermark to resume from and whether more
+            are waiting.
+        :raises ExpiredWatermarkError: when ``since`` is older than the
+            tombstones kept.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def create_product(self, name: str, description: str, price: Decimal, image_url: str) -> Product:
         """
@@ -125,4 +190,46 @@ class ImageClientPort(ABC):
         """
         Uploads an image file to S3 and returns its public URL.
         """
-        pass
\ No newline at end of file
+        pass
+
+
+class OutboxPort(ABC):
+    """
+    Outbound port: pending domain events written alongside each change.
+    """
+
+    @abstractmethod
+    async def fetch_pending(self, limit: int) -> List[DomainEvent]:
+        """
+        Read up to ``limit`` undelivered events; events of one aggregate
+        come in sequence order.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def acknowledge(self, events: List[DomainEvent]) -> None:
+        """
+        Remove delivered events from the outbox.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def acquire_lease(self, owner: str, seconds: float) -> bool:
+        """
+        Take or renew the single-dispatcher lease for ``seconds``.
+        :return: False while another owner holds an unexpired lease.
+        """
+        raise NotImplementedError()
+
+
+class EventSinkPort(ABC):
+    """
+    Outbound port: where the dispatcher delivers domain events.
+    """
+
+    @abstractmethod
+    async def deliver(self, event: DomainEvent) -> None:
+        """
+        Deliver one event; raising makes the dispatcher retry it later.
+        """
+        raise NotImplementedError()
@@ -1,6 +1,6 @@
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 from src.domain.ports import ImageClientPort
+from src.infrastructure.metrics import timed
 from config import settings
 
 class S3ImageClient(ImageClientPort):
@@ -8,14 +8,12 @@ class S3ImageClient(ImageClientPort):
     Adapter for uploading images to AWS S3.
     Implements ImageClientPort.
     """
-    def __init__(self):
+    def __init__(self, s3_client):
         self.bucket_name = settings.PRODUCT_IMAGES_BUCKET
         self.region_name = settings.AWS_REGION
-        self.s3_client = boto3.client(
-            "s3",
-            region_name=self.region_name
-        )
+        self.s3_client = s3_client  # shared, from AWSClients
 
+    @timed("s3")
     def upload_image(self, file_obj, filename: str, content_type: str) -> str:
         """
         Uploads an image file to S3 and returns its public URL.
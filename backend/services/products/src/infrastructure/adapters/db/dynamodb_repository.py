@@ -1,17 +1,23 @@
-from datetime import datetime, timezone
+import asyncio
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from email.mime import image
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID, uuid4
 
-from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.attributes import BooleanAttribute, NumberAttribute, TTLAttribute, UnicodeAttribute
+from pynamodb.expressions.condition import Condition
 from pynamodb.models import Model
 from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
 
 from config import settings
-from src.domain.entities import Price, Product
+from src.domain.entities import DomainEvent, Price, Product, ProductChange, Watermark
 from src.domain.exceptions import NotFoundError
 from src.domain.ports import ProductRepositoryPort
+from src.infrastructure.adapters.db.key_filter import KeyFilter
+from src.infrastructure.adapters.db.outbox import DynamoDBOutbox
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard
+from src.infrastructure.adapters.db.single_flight import SingleFlight
+from src.infrastructure.metrics import timed
 
 
 class NameIndex(GlobalSecondaryIndex):
@@ -27,6 +33,21 @@ class NameIndex(GlobalSecondaryIndex):
     name = UnicodeAttribute(hash_key=True)
 
 
+class UpdatedAtIndex(GlobalSecondaryIndex):
+    """
+    Change feed index: every product and tombstone, spread over
+    CHANGE_FEED_SHARDS partitions and sorted by ``updated_at`` within each.
+    """
+    class Meta:
+        index_name = "updated-at-index"
+        read_capacity_units = 1
+        write_capacity_units = 1
+        projection = AllProjection()
+
+    feed_shard = UnicodeAttribute(hash_key=True)
+    updated_at = UnicodeAttribute(range_key=True)
+
+
 class ProductModel(Model):
     """
     PynamoDB model for the products table.
@@ -44,34 +65,152 @@ class ProductModel(Model):
     created_at  = UnicodeAttribute()
     updated_at  = UnicodeAttribute()
     image_url   = UnicodeAttribute()
+    feed_shard  = UnicodeAttribute(null=True)
+    deleted     = BooleanAttribute(null=True)
+    expires_at  = TTLAttribute(null=True)
 
     name_index = NameIndex()
+    updated_at_index = UpdatedAtIndex()
+
+
+class ProductTombstoneModel(Model):
+    """
+    What a deleted product leaves behind in the products table: enough for
+    the change feed, and nothing that keeps it in the name index. DynamoDB
+    TTL purges it after CHANGE_FEED_RETENTION_DAYS.
+    """
+    class Meta:
+        table_name = ProductModel.Meta.table_name
+        region = settings.AWS_REGION
+        if settings.DYNAMODB_ENDPOINT_URL:
+            host = settings.DYNAMODB_ENDPOINT_URL
+
+    code       = UnicodeAttribute(hash_key=True)
+    feed_shard = UnicodeAttribute()
+    updated_at = UnicodeAttribute()
+    deleted    = BooleanAttribute()
+    expires_at = TTLAttribute()
 
 
 class DynamoDBProductRepo(ProductRepositoryPort):
     """
     Outbound adapter: implements ProductRepositoryPort using PynamoDB.
+    With an outbox, each write and its product.* event share one transaction.
+    Every call goes through the DynamoDBGuard (rate limits, throttle retries),
+    and concurrent lookups of the same code or name share one request.
+    With a key filter, codes it rules out are not looked up at all.
     """
 
+    def __init__(
+        self,
+        outbox: Optional[DynamoDBOutbox] = None,
+        guard: Optional[DynamoDBGuard] = None,
+        key_filter: Optional[KeyFilter] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ):
+        self._outbox = outbox
+        self._db = guard or DynamoDBGuard()
+        self._key_filter = key_filter
+        self.single_flight = single_flight or SingleFlight()
+
+    @timed("dynamodb")
     async def list_all(self) -> List[Product]:
-        products: List[Product] = []
-        for item in ProductModel.scan():
-            products.append(_to_domain(item))
-        return products
+        def scan() -> List[ProductModel]:
+            return list(ProductModel.scan(ProductModel.deleted.does_not_exist()))
+
+        return [_to_domain(item) for item in await self._db.read(scan)]
 
+    @timed("dynamodb")
+    async def list_page(self, start_after: Optional[UUID], limit: int) -> Tuple[List[Product], Optional[UUID]]:
+        def scan() -> Tuple[List[Product], Optional[UUID]]:
+            start_key = {"code": {"S": str(start_after)}} if start_after else None
+            result = ProductModel.scan(
+                ProductModel.deleted.does_not_exist(), limit=limit, last_evaluated_key=start_key
+            )
+            items = [_to_domain(item) for item in result]
+            last_key = result.last_evaluated_key
+            return items, UUID(last_key["code"]["S"]) if last_key else None
+
+        return await self._db.read(scan, units=limit)
+
+    @timed("dynamodb")
     async def get_by_code(self, code: UUID) -> Optional[Product]:
-        try:
-            item = ProductModel.get(hash_key=str(code))
-            return _to_domain(item)
-        except ProductModel.DoesNotExist:
+        if self._key_filter is not None and not self._key_filter.might_exist(code):
             return None
 
+        async def get() -> Optional[Product]:
+            item = await self._db.read(_get_live, code)
+            return _to_domain(item) if item is not None else None
+
+        return await self.single_flight.do(("code", code), get)
+
+    @timed("dynamodb")
+    async def get_many(self, codes: List[UUID]) -> List[Product]:
+        if self._key_filter is not None:
+            codes = [c for c in codes if self._key_filter.might_exist(c)]
+        keys = list(dict.fromkeys(str(c) for c in codes))
+        if not keys:
+            return []
+
+        def batch_get() -> List[ProductModel]:
+            return list(ProductModel.batch_get(keys))
+
+        items = await self._db.read(batch_get, units=len(keys))
+        return [_to_domain(item) for item in items if not item.deleted]
+
+    @timed("dynamodb")
+    async def list_changes(
+        self, after: Optional[Watermark], until: datetime, limit: int
+    ) -> Tuple[List[ProductChange], bool]:
+        if after is not None and after.changed_at > until:
+            return [], False
+        upper = until.isoformat()
+        condition: Condition
+        if after is None:
+            condition = ProductModel.updated_at <= upper
+        else:
+            # inclusive, so changes sharing the watermark's instant are not lost
+            condition = ProductModel.updated_at.between(after.changed_at.isoformat(), upper)
+
+        def query(shard: str) -> List[ProductModel]:
+            return list(ProductModel.updated_at_index.query(
+                shard, range_key_condition=condition, limit=limit, page_size=limit
+            ))
+
+        shards = await asyncio.gather(*(
+            self._db.read(query, str(n), units=limit) for n in range(settings.CHANGE_FEED_SHARDS)
+        ))
+        return _merge_shards(shards, after, limit)
+
+    @timed("dynamodb")
+    async def scan_codes(self, total_segments: int) -> List[str]:
+        """
+        Codes of all live products, read with a parallel scan that only
+        fetches the key attribute.
+        """
+        def scan(segment: int) -> List[str]:
+            return [item.code for item in ProductModel.scan(
+                ProductModel.deleted.does_not_exist(),
+                segment=segment,
+                total_segments=total_segments,
+                attributes_to_get=["code"],
+            )]
+
+        segments = await asyncio.gather(*(self._db.read(scan, s) for s in range(total_segments)))
+        return [code for segment in segments for code in segment]
+
+    @timed("dynamodb")
     async def get_by_name(self, name: str) -> Optional[Product]:
-        results = ProductModel.name_index.query(name)
-        for item in results:
-            return _to_domain(item)
-        return None
+        def query() -> Optional[ProductModel]:
+            return next(iter(ProductModel.name_index.query(name, limit=1)), None)
+
+        async def get() -> Optional[Product]:
+            item = await self._db.read(query)
+            return _to_domain(item) if item is not None else None
+
+        return await self.single_flight.do(("name", name), get)
 
+    @timed("dynamodb")
     async def create(
         self,
         name: str,
@@ -88,10 +227,10 @@ class DynamoDBProductRepo(ProductRepositoryPort):
             price=float(price),
             created_at=now.isoformat(),
             updated_at=now.isoformat(),
-            image_url=image_url
+            image_url=image_url,
+            feed_shard=_feed_shard(new_code),
         )
-        obj.save()
-        return Product(
+        product = Product(
             code=new_code,
             name=name,
             description=description,
@@ -100,7 +239,12 @@ class DynamoDBProductRepo(ProductRepositoryPort):
             updated_at=now,
             image_url=image_url
         )
+        if self._key_filter is not None:
+            self._key_filter.add(new_code)
+        await self._save(obj, "product.created", product)
+        return product
 
+    @timed("dynamodb")
     async def update(
         self,
         code: UUID,
@@ -109,20 +253,19 @@ class DynamoDBProductRepo(ProductRepositoryPort):
         price: Decimal,
         image_url: str
     ) -> Product:
-        try:
-            item = ProductModel.get(hash_key=str(code))
-        except ProductModel.DoesNotExist:
+        item = await self._db.read(_get_live, code)
+        if item is None:
             raise NotFoundError(code)
 
+        old_name = item.name
         now = datetime.now(timezone.utc)
+        item.feed_shard  = _feed_shard(code)
         item.name        = name
         item.description = description
         item.price       = float(price)
         item.image_url   = image_url
         item.updated_at  = now.isoformat()
-        item.save()
-
-        return Product(
+        product = Product(
             code=code,
             name=name,
             description=description,
@@ -131,19 +274,119 @@ class DynamoDBProductRepo(ProductRepositoryPort):
             updated_at=now,
             image_url=item.image_url,
         )
+        await self._save(item, "product.updated", product)
+        self._written(code, old_name)
+        return product
 
+    @timed("dynamodb")
     async def delete(self, code: UUID) -> None:
-        try:
-            item = ProductModel.get(hash_key=str(code))
-            item.delete()
-        except ProductModel.DoesNotExist:
+        item = await self._db.read(_get_live, code)
+        if item is None:
             raise NotFoundError(code)
+        # the tombstone replaces the whole item
+        now = datetime.now(timezone.utc)
+        tombstone = ProductTombstoneModel(
+            code=item.code,
+            feed_shard=_feed_shard(code),
+            updated_at=now.isoformat(),
+            deleted=True,
+            expires_at=now + timedelta(days=settings.CHANGE_FEED_RETENTION_DAYS),
+        )
+        if self._outbox is None:
+            await self._db.write(tombstone.save)
+        else:
+            await self._db.write(
+                self._outbox.commit,
+                saves=[tombstone],
+                events=[_event("product.deleted", _to_domain(item))],
+                units=2,
+            )
+        self._written(code, item.name)
+
+    async def _save(self, item: ProductModel, event_type: str, product: Product) -> None:
+        if self._outbox is None:
+            await self._db.write(item.save)
+        else:
+            await self._db.write(
+                self._outbox.commit, saves=[item], events=[_event(event_type, product)], units=2
+            )
+        self._written(product.code, product.name)
 
+    def _written(self, code: UUID, name: str) -> None:
+        """Lookups started from now on must not join one begun before this write."""
+        self.single_flight.forget(("code", code))
+        self.single_flight.forget(("name", name))
+
+    @timed("dynamodb")
     async def ping(self) -> None:
-        if not ProductModel.exists():
+        if not await self._db.read(ProductModel.exists):
             raise RuntimeError(f"Table {ProductModel.Meta.table_name} not found")
 
 
+def _feed_shard(code: UUID) -> str:
+    """
+    Change feed partition of a product. Changing CHANGE_FEED_SHARDS moves
+    products between partitions, so run the backfill again after doing so.
+    """
+    return str(UUID(str(code)).int % settings.CHANGE_FEED_SHARDS)
+
+
+def _get_live(code: UUID) -> Optional[ProductModel]:
+    try:
+        item = ProductModel.get(hash_key=str(code))
+    except ProductModel.DoesNotExist:
+        return None
+    return None if item.deleted else item
+
+
+def _merge_shards(
+    shards: List[List[ProductModel]], after: Optional[Watermark], limit: int
+) -> Tuple[List[ProductChange], bool]:
+    """
+    Merge the per-shard query results into one feed page.
+
+    A shard that filled its ``limit`` may hold more changes past its last
+    item, so the page stops there; otherwise a later page would resume
+    beyond changes it never returned.
+    """
+    changes: List[ProductChange] = []
+    cutoff: Optional[Watermark] = None
+    for items in shards:
+        shard_changes = [_to_change(item) for item in items]
+        if len(items) >= limit:
+            last = shard_changes[-1].watermark
+            cutoff = last if cutoff is None else min(cutoff, last)
+        changes.extend(c for c in shard_changes if after is None or c.watermark > after)
+
+    changes.sort(key=lambda c: c.watermark)
+    if cutoff is not None:
+        changes = [c for c in changes if c.watermark <= cutoff]
+    return changes[:limit], cutoff is not None or len(changes) > limit
+
+
+def _to_change(item: ProductModel) -> ProductChange:
+    return ProductChange(
+        code=UUID(item.code),
+        changed_at=datetime.fromisoformat(item.updated_at),
+        product=None if item.deleted else _to_domain(item),
+    )
+
+
+def backfill_feed_shards() -> int:
+    """
+    Put every product (and tombstone) into its change feed partition:
+    items written before the feed existed, or before CHANGE_FEED_SHARDS changed.
+    :return: how many items were updated.
+    """
+    updated = 0
+    for item in ProductModel.scan():
+        shard = _feed_shard(UUID(item.code))
+        if item.feed_shard != shard:
+            item.update(actions=[ProductModel.feed_shard.set(shard)])
+            updated += 1
+    return updated
+
+
 def _to_domain(item: ProductModel) -> Product:
     return Product(
         code=UUID(item.code),
@@ -154,3 +397,16 @@ def _to_domain(item: ProductModel) -> Product:
         updated_at=datetime.fromisoformat(item.updated_at),
         image_url=item.image_url,
     )
+
+
+def _event(event_type: str, product: Product) -> DomainEvent:
+    """Build the outbox event describing a change to ``product``."""
+    return DomainEvent.new(event_type, str(product.code), {
+        "code": str(product.code),
+        "name": product.name,
+        "description": product.description,
+        "price": str(product.price),
+        "image_url": product.image_url,
+        "created_at": product.created_at.isoformat() if product.created_at else None,
+        "updated_at": product.updated_at.isoformat() if product.updated_at else None,
+    })
@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple
+from uuid import UUID
+
+from src.domain.entities import ProductChange, Watermark
+
+logger = logging.getLogger("product_service.key_filter")
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings: no false negatives, false
+    positives at about ``fp_rate`` while it holds at most ``capacity`` keys.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float):
+        capacity = max(capacity, 1)
+        self.bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def add(self, key: str) -> None:
+        positions = list(self._positions(key))
+        if all(self._array[i >> 3] & (1 << (i & 7)) for i in positions):
+            return  # already in (or a false positive): not counted twice
+        for i in positions:
+            self._array[i >> 3] |= 1 << (i & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._array[i >> 3] & (1 << (i & 7)) for i in self._positions(key))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._array)
+
+    def estimated_fp_rate(self) -> float:
+        """False-positive rate at the current fill."""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # double hashing: k positions out of one 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+
+class KeySource(Protocol):
+    async def scan_codes(self, total_segments: int) -> List[str]: ...
+
+    async def list_changes(
+        self, after: Optional[Watermark], until: datetime, limit: int
+    ) -> Tuple[List[ProductChange], bool]: ...
+
+
+class KeyFilter:
+    """
+    Bloom filter of the product codes that exist, to answer lookups of
+    unknown codes without a GetItem.
+
+    - built at startup from a parallel scan of the table; until then, and
+      whenever it has not synced for ``max_staleness`` seconds, every code
+      is reported as possibly existing, so lookups go to DynamoDB
+    - codes created by this instance are added right away; codes created
+      by other instances are picked up by tailing the change feed every
+      ``sync_interval`` seconds, re-reading ``lag`` seconds back to cover
+      the index's replication delay
+    - rebuilt every ``rebuild_interval`` seconds, which drops deleted codes
+      and sizes the filter for at least twice the codes found
+
+    A code created on another instance can be reported missing for up to
+    about ``sync_interval + lag`` seconds; keep those short.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        fp_rate: float = 0.01,
+        scan_segments: int = 8,
+        sync_interval: float = 2.0,
+        lag: float = 5.0,
+        rebuild_interval: float = 3600.0,
+        max_staleness: float = 30.0,
+        page_size: int = 1000,
+    ):
+        self._capacity = capacity
+        self._fp_rate = fp_rate
+        self._scan_segments = scan_segments
+        self._sync_interval = sync_interval
+        self._lag = timedelta(seconds=lag)
+        self._rebuild_interval = rebuild_interval
+        self._max_staleness = max_staleness
+        self._page_size = page_size
+        self._filter: Optional[BloomFilter] = None
+        self._added_while_building: Optional[List[str]] = None
+        self._synced_at: Optional[datetime] = None
+        self._synced_monotonic = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.checks = 0
+        self.definite_misses = 0
+        self.rebuilds = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None and time.monotonic() - self._synced_monotonic <= self._max_staleness
+
+    def might_exist(self, code: UUID) -> bool:
+        """False only when ``code`` certainly does not exist."""
+        bloom = self._filter
+        if bloom is None or not self.ready:
+            return True
+        self.checks += 1
+        if str(code) in bloom:
+            return True
+        self.definite_misses += 1
+        return False
+
+    def add(self, code: UUID) -> None:
+        if self._filter is not None:
+            self._filter.add(str(code))
+        if self._added_while_building is not None:
+            self._added_while_building.append(str(code))
+
+    def stats(self) -> Dict[str, Any]:
+        bloom = self._filter
+        return {
+            "ready": self.ready,
+            "keys": bloom.count if bloom else 0,
+            "size_bytes": bloom.size_bytes if bloom else 0,
+            "hashes": bloom.hashes if bloom else 0,
+            "target_fp_rate": self._fp_rate,
+            "estimated_fp_rate": bloom.estimated_fp_rate() if bloom else None,
+            "checks": self.checks,
+            "definite_misses": self.definite_misses,
+            "rebuilds": self.rebuilds,
+        }
+
+    async def start(self, source: KeySource) -> None:
+        self._task = asyncio.create_task(self._run(source), name="products-key-filter")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def rebuild(self, source: KeySource) -> None:
+        started = datetime.now(timezone.utc)
+        self._added_while_building = []
+        try:
+            codes = await source.scan_codes(self._scan_segments)
+            bloom = BloomFilter(max(self._capacity, 2 * len(codes)), self._fp_rate)
+            for code in (*codes, *self._added_while_building):
+                bloom.add(code)
+        finally:
+            self._added_while_building = None
+        # what changed during the scan is replayed by the next sync
+        self._synced_at = started if self._synced_at is None else min(self._synced_at, started)
+        self._filter = bloom
+        self.rebuilds += 1
+        await self.sync(source)
+        logger.info("Key filter rebuilt: %d codes, %d bytes", bloom.count, bloom.size_bytes)
+
+    async def sync(self, source: KeySource) -> None:
+        """Add the codes created or updated since the last sync, from the change feed."""
+        until = datetime.now(timezone.utc)
+        after: Optional[Watermark] = None  # never synced: the whole feed
+        if self._synced_at is not None:
+            after = Watermark(self._synced_at - self._lag, UUID(int=0))
+        while True:
+            changes, more = await source.list_changes(after, until, self._page_size)
+            for change in changes:
+                if not change.deleted:
+                    self.add(change.code)
+            if not more or not changes:
+                break
+            after = changes[-1].watermark
+        self._synced_at = until
+        self._synced_monotonic = time.monotonic()
+
+    async def _run(self, source: KeySource) -> None:
+        rebuild_at = 0.0
+        while True:
+            try:
+                if time.monotonic() >= rebuild_at:
+                    await self.rebuild(source)
+                    rebuild_at = time.monotonic() + self._rebuild_interval
+                else:
+                    await self.sync(source)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Key filter refresh failed")
+            await asyncio.sleep(self._sync_interval)
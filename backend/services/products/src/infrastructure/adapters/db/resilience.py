@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, List, TypeVar
+
+from opentelemetry.trace import SpanKind
+from pynamodb.exceptions import PutError, PynamoDBException, TransactWriteError
+
+from src.domain.exceptions import CapacityExceededError
+from src.infrastructure.tracing import tracer
+
+logger = logging.getLogger("product_service.dynamodb")
+
+T = TypeVar("T")
+
+THROTTLING_CODES = frozenset({
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+})
+# TransactWriteItems reports throttling per item, inside a cancellation
+THROTTLING_REASONS = frozenset({"ThrottlingError", "ProvisionedThroughputExceeded"})
+
+
+def is_throttle(error: Exception) -> bool:
+    """
+    Whether a PynamoDB error means DynamoDB refused the call for capacity.
+    """
+    if not isinstance(error, PynamoDBException):
+        return False
+    if error.cause_response_code in THROTTLING_CODES:
+        return True
+    if isinstance(error, TransactWriteError):
+        return any(r is not None and r.code in THROTTLING_REASONS for r in error.cancellation_reasons)
+    # BatchWriteItem gives up with a bare PutError once unprocessed items
+    # ran out of retries, which only happens under throttling
+    return isinstance(error, PutError) and error.cause is None and "max_retry_attempts" in str(error)
+
+
+class TokenBucket:
+    """
+    Client-side rate limiter: ``rate`` units per second, bursts of up to
+    ``burst`` units. Waiters are served in arrival order. A rate of 0
+    disables it.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, units: float = 1.0) -> float:
+        """
+        Wait until ``units`` are available and take them.
+
+        :return: Seconds spent waiting.
+        """
+        if self.rate <= 0:
+            return 0.0
+        units = min(units, self.burst)  # a batch larger than a burst waits for a full bucket
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= units:
+                    self._tokens -= units
+                    return waited
+                delay = (units - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def drain(self) -> None:
+        """Give up the saved burst, e.g. after DynamoDB pushed back."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RetryBudget:
+    """
+    Allows retries up to ``ratio`` of the calls made in the last ``window``
+    seconds, plus ``min_per_second``, so a sustained throttle is not met
+    with a multiple of the load that caused it.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, window: int = 10):
+        self._ratio = ratio
+        self._floor = min_per_second * window
+        self._window = window
+        self._buckets: Deque[List[int]] = deque()  # [second, calls, retries]
+
+    def record_call(self) -> None:
+        self._current()[1] += 1
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False when it is used up."""
+        current = self._current()
+        calls = sum(b[1] for b in self._buckets)
+        retries = sum(b[2] for b in self._buckets)
+        if retries >= self._ratio * calls + self._floor:
+            return False
+        current[2] += 1
+        return True
+
+    def _current(self) -> List[int]:
+        now = int(time.monotonic())
+        while self._buckets and self._buckets[0][0] <= now - self._window:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0])
+        return self._buckets[-1]
+
+
+@dataclass
+class DynamoDBStats:
+    """
+    Counters of the resilience layer, since process start.
+    """
+    calls: int = 0
+    throttles: int = 0
+    retries: int = 0
+    budget_exhausted: int = 0
+    gave_up: int = 0
+    rate_limited_seconds: float = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class DynamoDBGuard:
+    """
+    Resilience layer every DynamoDB call goes through (repository,
+    outbox, idempotency store).
+
+    - calls run in worker threads, after taking ``units`` from the read or
+      write token bucket, so bursts are queued client-side instead of
+      being throttled by the table
+    - a throttled call drains its bucket and is retried with exponential
+      backoff and full jitter, up to ``max_attempts`` in total and only
+      while the retry budget allows
+    - anything else is raised as is; a call that stays throttled raises
+      ``CapacityExceededError`` (503) instead of surfacing as a 500
+
+    Units are item operations, an approximation of capacity units.
+    botocore still retries each request a few times on its own; this
+    layer handles what outlasts those retries.
+    """
+
+    def __init__(
+        self,
+        read_rate: float = 0.0,
+        write_rate: float = 0.0,
+        burst_seconds: float = 2.0,
+        max_attempts: int = 6,
+        base_delay: float = 0.05,
+        max_delay: float = 2.0,
+        budget_ratio: float = 0.2,
+        budget_min_per_second: float = 10.0,
+    ):
+        self.stats = DynamoDBStats()
+        self._buckets = {
+            "read": TokenBucket(read_rate, read_rate * burst_seconds),
+            "write": TokenBucket(write_rate, write_rate * burst_seconds),
+        }
+        self._max_attempts = max(1, max_attempts)
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._budget = RetryBudget(budget_ratio, budget_min_per_second)
+
+    async def read(self, fn: Callable[..., T], *args, units: float = 1.0, **kwargs) -> T:
+        return await self._call("read", units, fn, args, kwargs)
+
+    async def write(self, fn: Callable[..., T], *args, units: float = 1.0, **kwargs) -> T:
+        return await self._call("write", units, fn, args, kwargs)
+
+    async def _call(self, kind: str, units: float, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        bucket = self._buckets[kind]
+        self.stats.calls += 1
+        self._budget.record_call()
+        span_name = f"dynamodb.{getattr(fn, '__name__', 'call').lstrip('_')}"
+        attempt = 1
+        while True:
+            waited = await bucket.acquire(units)
+            self.stats.rate_limited_seconds += waited
+            try:
+                with tracer.start_as_current_span(span_name, kind=SpanKind.CLIENT, attributes={
+                    "db.system": "dynamodb",
+                    "dynamodb.attempt": attempt,
+                    "dynamodb.rate_limited_seconds": waited,
+                }):
+                    return await asyncio.to_thread(fn, *args, **kwargs)
+            except PynamoDBException as e:
+                if not is_throttle(e):
+                    raise
+                self.stats.throttles += 1
+                bucket.drain()
+                if attempt >= self._max_attempts:
+                    self.stats.gave_up += 1
+                    logger.warning("DynamoDB %s still throttled after %d attempts", kind, attempt)
+                    raise CapacityExceededError() from e
+                if not self._budget.try_spend():
+                    self.stats.budget_exhausted += 1
+                    logger.warning("DynamoDB %s throttled and the retry budget is spent", kind)
+                    raise CapacityExceededError() from e
+            self.stats.retries += 1
+            await asyncio.sleep(random.uniform(0, min(self._max_delay, self._base_delay * 2 ** attempt)))
+            attempt += 1
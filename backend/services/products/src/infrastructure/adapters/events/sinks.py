@@ -0,0 +1,50 @@
+import logging
+from typing import Awaitable, Callable, Dict, List
+
+from src.domain.entities import DomainEvent
+from src.domain.ports import EventSinkPort
+
+logger = logging.getLogger("product_service.events")
+
+Handler = Callable[[DomainEvent], Awaitable[None]]
+
+
+class LocalEventBus(EventSinkPort):
+    """
+    In-process sink: runs the async handlers registered for an event type
+    (or ``"*"`` for all of them), one after the other. If one raises, the
+    event is redelivered later, to every handler again, so handlers must be
+    idempotent.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+
+    def subscribe(self, event_type: str, handler: Handler) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    async def deliver(self, event: DomainEvent) -> None:
+        for handler in self._handlers.get(event.event_type, []) + self._handlers.get("*", []):
+            await handler(event)
+
+
+class InMemoryEventSink(EventSinkPort):
+    """
+    Stand-in sink for tests and local runs: records what it receives.
+    Set ``failures`` to make the next N deliveries raise.
+    """
+
+    def __init__(self):
+        self.delivered: List[DomainEvent] = []
+        self.failures = 0
+
+    async def deliver(self, event: DomainEvent) -> None:
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("stand-in sink failure")
+        self.delivered.append(event)
+
+
+async def log_event(event: DomainEvent) -> None:
+    """Default handler: make every event visible in the service log."""
+    logger.info("%s %s (%s)", event.event_type, event.aggregate_id, event.event_id)
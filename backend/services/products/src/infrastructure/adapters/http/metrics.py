@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from src.infrastructure.metrics import exposition
+
+router = APIRouter(include_in_schema=False)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    return Response(exposition(), media_type=CONTENT_TYPE_LATEST)
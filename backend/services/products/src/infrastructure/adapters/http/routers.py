@@ -1,16 +1,37 @@
 from uuid import UUID
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, status, File, UploadFile, Form, Body
+from fastapi.responses import StreamingResponse
 import json
 
+from config import settings
+
 from src.domain.exceptions import DuplicateProductError, InvalidPriceError, NotFoundError
 from src.domain.ports import ProductServicePort
-from src.infrastructure.adapters.http.schemas import ProductIn, ProductOut
+from src.infrastructure.adapters.http import sync_token
+from src.infrastructure.adapters.http.export import ExportColumn, export_response
+from src.infrastructure.adapters.http.schemas import (
+    ProductBatchIn,
+    ProductChangeOut,
+    ProductChangesOut,
+    ProductIn,
+    ProductOut,
+)
 from src.infrastructure.di import get_product_service
 
 router = APIRouter(prefix="/api/v1", tags=["products"])
 
+EXPORT_COLUMNS = (
+    ExportColumn("code", "string", lambda p: p.code),
+    ExportColumn("name", "string", lambda p: p.name),
+    ExportColumn("description", "string", lambda p: p.description),
+    ExportColumn("price", "decimal", lambda p: p.price.amount),
+    ExportColumn("image_url", "string", lambda p: p.image_url),
+    ExportColumn("created_at", "timestamp", lambda p: p.created_at),
+    ExportColumn("updated_at", "timestamp", lambda p: p.updated_at),
+)
+
 
 @router.get("/", response_model=List[ProductOut])
 async def list_products(
@@ -21,6 +42,34 @@ async def list_products(
     return [ProductOut.from_domain(p) for p in domain_products]
 
 
+@router.get("/export", response_class=StreamingResponse)
+async def export_products(
+    format: Literal["csv", "parquet"] = Query("csv"),
+    cursor: Optional[UUID] = Query(None, description="Resume after this product code (the last one received)"),
+    service: ProductServicePort = Depends(get_product_service),
+):
+    """Stream every product as CSV or Parquet, page by page."""
+    return export_response(
+        "products", format, EXPORT_COLUMNS, service.list_products_page, cursor, settings.EXPORT_PAGE_SIZE
+    )
+
+
+@router.get("/changes", response_model=ProductChangesOut)
+async def list_changes(
+    since: Optional[str] = Query(None, description="nextToken of the previous call; omit for a full sync"),
+    limit: int = Query(settings.CHANGE_FEED_PAGE_SIZE, ge=1, le=settings.CHANGE_FEED_MAX_PAGE_SIZE),
+    service: ProductServicePort = Depends(get_product_service),
+):
+    """Products created, updated or deleted since a sync token (410 once it has expired)."""
+    watermark = sync_token.decode(since) if since else None
+    changes, next_watermark, has_more = await service.list_changes(watermark, limit)
+    return ProductChangesOut(
+        changes=[ProductChangeOut.from_domain(c) for c in changes],
+        next_token=sync_token.encode(next_watermark),
+        has_more=has_more,
+    )
+
+
 @router.get("/{code}", response_model=ProductOut)
 async def get_product(
     code: UUID,
@@ -80,6 +129,16 @@ async def create_product(
     return ProductOut.from_domain(created)
 
 
+@router.post("/batch-get", response_model=List[ProductOut])
+async def batch_get_products(
+    payload: ProductBatchIn,
+    service: ProductServicePort = Depends(get_product_service),
+):
+    """Get several products by their UUID codes in one call."""
+    products = await service.get_products(payload.codes)
+    return [ProductOut.from_domain(p) for p in products]
+
+
 @router.put("/{code}", response_model=ProductOut)
 async def update_product(
     code: UUID,
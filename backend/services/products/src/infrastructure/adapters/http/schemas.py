@@ -1,11 +1,12 @@
 from datetime import datetime
 from decimal import Decimal
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
 from pydantic.alias_generators import to_camel
 
-from src.domain.entities import Price, Product
+from src.domain.entities import Price, Product, ProductChange
 
 
 class ProductIn(BaseModel):
@@ -37,6 +38,14 @@ class ProductIn(BaseModel):
         )
 
 
+class ProductBatchIn(BaseModel):
+    """
+    Incoming schema for a batched lookup of products by code.
+    """
+
+    codes: List[UUID] = Field(..., max_length=100, description="Product UUIDs (max 100)")
+
+
 class ProductOut(BaseModel):
     """
     Outgoing schema for product responses, with camelCase aliases.
@@ -69,3 +78,44 @@ class ProductOut(BaseModel):
             updated_at=product.updated_at,
             image_url=product.image_url,
         )
+
+
+class ProductChangeOut(BaseModel):
+    """
+    One change feed entry; ``product`` is null when the product was deleted.
+    """
+
+    code: UUID
+    deleted: bool
+    changed_at: datetime
+    product: Optional[ProductOut] = None
+
+    model_config = {
+        "alias_generator": to_camel,
+        "populate_by_name": True,
+    }
+
+    @classmethod
+    def from_domain(cls, change: ProductChange) -> 'ProductChangeOut':
+        return cls(
+            code=change.code,
+            deleted=change.deleted,
+            changed_at=change.changed_at,
+            product=ProductOut.from_domain(change.product) if change.product else None,
+        )
+
+
+class ProductChangesOut(BaseModel):
+    """
+    A page of the change feed. Pass ``nextToken`` as ``since`` on the next
+    call; keep paging while ``hasMore`` is true.
+    """
+
+    changes: List[ProductChangeOut]
+    next_token: str
+    has_more: bool
+
+    model_config = {
+        "alias_generator": to_camel,
+        "populate_by_name": True,
+    }
@@ -0,0 +1,56 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.memory import rss_bytes
+from src.infrastructure.metrics import REQUEST_LATENCY, REQUEST_RSS_DELTA, REQUESTS_IN_FLIGHT
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Records the latency of every HTTP request by method, route template
+    (``/api/v1/{code}``, not the raw path, to keep label cardinality
+    bounded) and status, and the number of requests in flight.
+
+    With ``rss_delta``, also the resident set size at the end of each
+    request minus at its start (``http_request_rss_delta_bytes``, floored
+    at 0). That is memory the process kept, shared with the requests
+    running alongside, not the request's peak: freed memory and memory
+    the allocator reuses do not show. The peak of each request is
+    ``http_request_traced_peak_bytes``, while tracemalloc runs (see
+    MemoryMiddleware).
+
+    Streaming responses are measured until their last chunk is sent.
+    """
+
+    def __init__(self, app: ASGIApp, rss_delta: bool = False):
+        self.app = app
+        self._rss_delta = rss_delta
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # unless a response starts, the request failed
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        start_rss = rss_bytes() if self._rss_delta else 0
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # the router stores the matched route in the (shared) scope
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            REQUEST_LATENCY.labels(scope["method"], route, str(status)).observe(time.perf_counter() - start)
+            if self._rss_delta:
+                REQUEST_RSS_DELTA.labels(scope["method"], route).observe(max(0, rss_bytes() - start_rss))
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict
+
+from config import settings
+from src.infrastructure.auth import get_jwk_client
+from src.infrastructure.di import get_image_client, get_product_service, get_repository
+from src.infrastructure.metrics import WARMUP_DURATION
+
+logger = logging.getLogger("product_service.warmup")
+
+
+async def warm_up() -> Dict[str, float]:
+    """
+    Pay at startup what the first requests would pay otherwise: build the
+    singletons FastAPI only creates on first use, load the Cognito JWKS
+    (fetch and RSA key parsing), and open DynamoDB connections
+    (credentials, TLS handshake). Runs in the lifespan, so the service
+    only reports ready afterwards.
+
+    A step that fails or outlasts WARMUP_TIMEOUT_SECONDS is logged and
+    left for the first request to redo.
+
+    :return: seconds taken by each step.
+    """
+    steps: Dict[str, Callable[[], Awaitable[None]]] = {
+        "singletons": _singletons,
+        "jwks": _jwks,
+        "dynamodb": _dynamodb,
+    }
+    timings = {}
+    for name, step in steps.items():
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(step(), settings.WARMUP_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning("Warm-up step %s failed: %r", name, e)
+        timings[name] = time.perf_counter() - start
+        WARMUP_DURATION.labels(name).set(timings[name])
+    logger.info(
+        "Warmed up in %.0f ms (%s)",
+        sum(timings.values()) * 1000,
+        ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()),
+    )
+    return timings
+
+
+async def _singletons() -> None:
+    # keyword arguments, as FastAPI passes them, or lru_cache keeps a second instance
+    get_product_service(repo=get_repository(), image_client=get_image_client())
+
+
+async def _jwks() -> None:
+    await asyncio.to_thread(get_jwk_client().get_signing_keys)
+
+
+async def _dynamodb() -> None:
+    # concurrent calls each open a connection of the shared pool
+    repo = get_repository()
+    await asyncio.gather(*(repo.ping() for _ in range(settings.WARMUP_DYNAMODB_CONNECTIONS)))
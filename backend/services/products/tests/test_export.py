@@ -0,0 +1,44 @@
+import asyncio
+import csv
+import io
+from decimal import Decimal
+
+import pyarrow.parquet as pq
+from moto import mock_aws
+
+from src.infrastructure.adapters.db.dynamodb_repository import DynamoDBProductRepo, ProductModel
+from src.infrastructure.adapters.http.export import export_response
+from src.infrastructure.adapters.http.routers import EXPORT_COLUMNS
+
+PRICES = [Decimal("9.99"), Decimal("0.1"), Decimal("0.07"), Decimal("1234.5")]
+
+
+def export(fmt: str) -> bytes:
+    async def main():
+        repository = DynamoDBProductRepo()
+        for n, price in enumerate(PRICES):
+            await repository.create(f"product {n}", "", price, "https://example.com/p.png")
+        response = export_response("products", fmt, EXPORT_COLUMNS, repository.list_page, None, page_size=2)
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    with mock_aws():
+        ProductModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+        return asyncio.run(main())
+
+
+def test_parquet_prices_from_float_attributes_are_rounded_to_cents():
+    table = pq.read_table(io.BytesIO(export("parquet")))
+
+    # stored as floats: 9.99 reads back as 9.9900000000000002131...
+    assert sorted(table.column("price").to_pylist()) == [
+        Decimal("0.07"), Decimal("0.10"), Decimal("9.99"), Decimal("1234.50")
+    ]
+    assert table.num_rows == len(PRICES)
+
+
+def test_csv_prices_match_the_parquet_ones():
+    rows = list(csv.DictReader(io.StringIO(export("csv").decode())))
+
+    assert sorted(Decimal(r["price"]) for r in rows) == [
+        Decimal("0.07"), Decimal("0.10"), Decimal("9.99"), Decimal("1234.50")
+    ]
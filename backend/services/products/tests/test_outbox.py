@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from moto import mock_aws
+from pynamodb.exceptions import TransactWriteError
+
+from src.application.outbox_dispatcher import OutboxDispatcher
+from src.domain.entities import DomainEvent
+from src.infrastructure.adapters.db.dynamodb_repository import DynamoDBProductRepo, ProductModel
+from src.infrastructure.adapters.db.outbox import DynamoDBOutbox, OutboxModel
+from src.infrastructure.adapters.events.sinks import InMemoryEventSink
+
+
+@pytest.fixture
+def tables():
+    with mock_aws():
+        ProductModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+        OutboxModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+        yield
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def create(repository: DynamoDBProductRepo, name: str = "lamp"):
+    return await repository.create(name, "", Decimal("9.99"), "https://example.com/p.png")
+
+
+def test_a_write_and_its_event_are_committed_together(tables):
+    outbox = DynamoDBOutbox()
+    repository = DynamoDBProductRepo(outbox=outbox)
+
+    product = run(create(repository))
+    [event] = run(outbox.fetch_pending(10))
+
+    assert ProductModel.get(str(product.code)).name == "lamp"
+    assert event.event_type == "product.created"
+    assert event.aggregate_id == str(product.code)
+    assert event.payload["name"] == "lamp"
+
+
+def test_a_failed_transaction_leaves_neither_the_item_nor_the_event(tables):
+    outbox = DynamoDBOutbox()
+    now = datetime.now(timezone.utc).isoformat()
+    item = ProductModel(
+        code=str(uuid4()), name="lamp", description="", price=9.99, created_at=now,
+        updated_at=now, image_url="https://example.com/p.png", feed_shard="0",
+    )
+    event = DomainEvent.new("product.created", item.code, {})
+
+    with pytest.raises(TransactWriteError):
+        outbox.commit(saves=[item], events=[event, event])  # one item twice: rejected
+
+    assert ProductModel.count() == 0
+    assert run(outbox.fetch_pending(10)) == []
+
+
+def test_the_dispatcher_delivers_in_sequence_and_empties_the_outbox(tables):
+    outbox = DynamoDBOutbox()
+    repository = DynamoDBProductRepo(outbox=outbox)
+    product = run(create(repository))
+    run(repository.update(product.code, "desk lamp", "", Decimal("12.50"), product.image_url))
+    sink = InMemoryEventSink()
+
+    assert run(OutboxDispatcher(outbox, sink).drain_once()) == 2
+
+    assert [e.event_type for e in sink.delivered] == ["product.created", "product.updated"]
+    assert run(outbox.fetch_pending(10)) == []
+
+
+def test_a_failed_delivery_is_kept_and_holds_back_its_aggregate(tables):
+    outbox = DynamoDBOutbox()
+    repository = DynamoDBProductRepo(outbox=outbox)
+    product = run(create(repository))
+    run(repository.delete(product.code))
+    sink = InMemoryEventSink()
+    sink.failures = 1
+    dispatcher = OutboxDispatcher(outbox, sink)
+
+    run(dispatcher.drain_once())
+    assert sink.delivered == []
+    assert len(run(outbox.fetch_pending(10))) == 2
+
+    run(dispatcher.drain_once())
+    assert [e.event_type for e in sink.delivered] == ["product.created", "product.deleted"]
+    assert run(outbox.fetch_pending(10)) == []
+
+
+def test_only_one_dispatcher_holds_the_lease(tables):
+    outbox = DynamoDBOutbox()
+
+    assert run(outbox.acquire_lease("a", 30))
+    assert not run(outbox.acquire_lease("b", 30))
+    assert run(outbox.acquire_lease("a", 30))  # renewal
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.domain.entities import Watermark
+from src.infrastructure.adapters.http import sync_token
+from src.infrastructure.adapters.http.routers import router
+from src.infrastructure.di import get_product_service
+from src.infrastructure.middlewares.exception_handlers import register_exception_handlers
+
+
+def test_a_token_decodes_to_the_position_it_was_made_from():
+    watermark = Watermark(datetime(2026, 3, 10, 12, 30, tzinfo=timezone.utc), uuid4())
+
+    assert sync_token.decode(sync_token.encode(watermark)) == watermark
+
+
+def test_an_invalid_token_is_a_problem_response():
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(router)
+    app.dependency_overrides[get_product_service] = lambda: None
+
+    response = TestClient(app).get("/api/v1/changes", params={"since": "not-a-token"})
+
+    assert response.status_code == 400
+    assert response.json() == {
+        "title": "Invalid Sync Token",
+        "detail": "Invalid sync token: 'not-a-token'",
+        "status": 400,
+    }
@@ -0,0 +1,60 @@
+"""
+Production server: gunicorn managing one uvicorn worker::
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Sales runs a single worker per container and scales out by ECS tasks,
+because several parts of it hold state in the process:
+
+- the SSE broker: a sale is only pushed to subscribers of the worker
+  that wrote it, and its event ids carry a per-process epoch, so a
+  ``Last-Event-ID`` from another worker always gets a reset
+- the leaderboard: each worker counts only the sales it wrote or was
+  notified of between rebuilds
+- the group-commit journal: ``SALES_WRITE_JOURNAL_PATH`` is one file,
+  which one writer appends to and replays at start
+
+``WEB_CONCURRENCY`` is ignored (with a warning) until these go through a
+shared channel. Otherwise the settings match the other services:
+
+- uvloop and httptools, failing at start if they are missing rather
+  than falling back to asyncio and h11
+- HTTP keep-alive longer than the load balancer's idle timeout (60 s on
+  an ALB), so the balancer is the side that closes idle connections
+- no recycling after ``max_requests``: restarting the only worker
+  would drop every SSE connection and leave nothing serving meanwhile
+- the app imported once in the master before forking, so a restarted
+  worker starts in milliseconds. Clients, pools and threads are only
+  made in the lifespan, i.e. per worker
+
+Other settings can be overridden with ``GUNICORN_CMD_ARGS``.
+"""
+
+import os
+
+from uvicorn_worker import UvicornWorker
+
+
+class Worker(UvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = 1  # see above: SSE, leaderboard and write journal are per process
+worker_class = Worker
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None  # heartbeat files off the overlay fs
+keepalive = 75
+max_requests = 0
+graceful_timeout = 30
+timeout = 60
+preload_app = True
+
+
+def on_starting(server) -> None:
+    requested = os.environ.get("WEB_CONCURRENCY")
+    if requested and requested != "1":
+        server.log.warning(
+            "WEB_CONCURRENCY=%s ignored: sales keeps SSE, leaderboard and write journal state in one process",
+            requested,
+        )
+    server.log.info("1 worker")
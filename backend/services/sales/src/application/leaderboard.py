@@ -0,0 +1,250 @@
+# src/application/leaderboard.py
+
+import asyncio
+import logging
+from datetime import UTC, date, datetime, timedelta
+from typing import Callable, Dict, Generic, Hashable, List, Optional, Set, Tuple, TypeVar
+from uuid import UUID
+
+from src.domain.entities import LeaderboardEntry, Sale
+from src.domain.ports import SaleObserverPort, SaleRepositoryPort
+
+logger = logging.getLogger("sales_service.leaderboard")
+
+K = TypeVar("K", bound=Hashable)
+
+WINDOW_DAYS = {"day": 1, "week": 7}
+SEED_RETRY_SECONDS = 30.0  # until the first rebuild succeeds
+DIMENSIONS = {
+    "seller": lambda sale: sale.seller_code,
+    "product": lambda sale: sale.product_code,
+}
+
+
+class _Bucket(Generic[K]):
+    """
+    All keys sharing one count; buckets form a list sorted by count, descending.
+    """
+    __slots__ = ("count", "keys", "prev", "next")
+
+    def __init__(self, count: int):
+        self.count = count
+        self.keys: Dict[K, None] = {}  # insertion-ordered set
+        self.prev: Optional["_Bucket[K]"] = None
+        self.next: Optional["_Bucket[K]"] = None
+
+
+class RankedCounter(Generic[K]):
+    """
+    Counter that keeps its keys ordered by count.
+
+    Keys live in count buckets linked from the highest count down, so a
+    +1/-1 moves a key to a neighbouring bucket in O(1) and ``top(k)``
+    walks at most k keys. Ties keep no particular order.
+    """
+
+    def __init__(self):
+        self._head: Optional[_Bucket[K]] = None
+        self._tail: Optional[_Bucket[K]] = None
+        self._where: Dict[K, _Bucket[K]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def items(self) -> List[Tuple[K, int]]:
+        return [(key, bucket.count) for key, bucket in self._where.items()]
+
+    def add(self, key: K, delta: int = 1) -> None:
+        """
+        Add ``delta`` (may be negative) to ``key``; keys reaching 0 are dropped.
+        """
+        if delta == 0:
+            return
+        bucket = self._where.pop(key, None)
+        if bucket is None:
+            target = delta
+            higher, lower = self._tail, None
+        else:
+            target = bucket.count + delta
+            del bucket.keys[key]
+            if bucket.keys:
+                higher, lower = (bucket, bucket.next) if delta < 0 else (bucket.prev, bucket)
+            else:
+                higher, lower = bucket.prev, bucket.next
+                self._unlink(bucket)
+        if target <= 0:
+            return
+
+        # slide to where higher.count >= target > lower.count;
+        # one step at most for +1/-1
+        while higher is not None and higher.count < target:
+            higher, lower = higher.prev, higher
+        while lower is not None and lower.count >= target:
+            higher, lower = lower, lower.next
+
+        if higher is not None and higher.count == target:
+            destination = higher
+        else:
+            destination = self._link(_Bucket(target), higher, lower)
+        destination.keys[key] = None
+        self._where[key] = destination
+
+    def top(self, k: int) -> List[Tuple[K, int]]:
+        ranked: List[Tuple[K, int]] = []
+        bucket = self._head
+        while bucket is not None and len(ranked) < k:
+            for key in bucket.keys:
+                ranked.append((key, bucket.count))
+                if len(ranked) == k:
+                    break
+            bucket = bucket.next
+        return ranked
+
+    def _link(self, bucket: _Bucket[K], higher: Optional[_Bucket[K]], lower: Optional[_Bucket[K]]) -> _Bucket[K]:
+        bucket.prev, bucket.next = higher, lower
+        if higher is None:
+            self._head = bucket
+        else:
+            higher.next = bucket
+        if lower is None:
+            self._tail = bucket
+        else:
+            lower.prev = bucket
+        return bucket
+
+    def _unlink(self, bucket: _Bucket[K]) -> None:
+        if bucket.prev is None:
+            self._head = bucket.next
+        else:
+            bucket.prev.next = bucket.next
+        if bucket.next is None:
+            self._tail = bucket.prev
+        else:
+            bucket.next.prev = bucket.prev
+
+
+class Leaderboard(SaleObserverPort):
+    """
+    In-process top-N of sellers and products by number of sales, for the
+    current UTC day and the rolling 7 days ending today (by ``sale_date``).
+
+    Kept current by create/delete notifications from SaleService and
+    rebuilt from the repository in the background: first right after
+    startup (retried until it succeeds; until then the counts only hold
+    what was notified), then every ``refresh_seconds``, which also folds
+    in sales written by other instances.
+    """
+
+    def __init__(self, today: Callable[[], date] = lambda: datetime.now(UTC).date()):
+        self._today = today
+        self._days: Dict[str, Dict[date, RankedCounter[UUID]]] = {}
+        self._week: Dict[str, RankedCounter[UUID]] = {}
+        self._current = self._today()
+        self.seeded = False
+        self._rebuilding: Optional[List[Tuple[int, Sale]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._reset(self._current)
+
+    async def on_created(self, sale: Sale) -> None:
+        self._record(+1, sale)
+
+    async def on_deleted(self, sale: Sale) -> None:
+        self._record(-1, sale)
+
+    def top(self, by: str, window: str, limit: int) -> List[LeaderboardEntry]:
+        """
+        Highest-selling sellers or products in ``window``; O(limit).
+        """
+        today = self._roll()
+        if window == "day":
+            counter = self._days[by].get(today)
+            if counter is None:
+                return []
+        else:
+            counter = self._week[by]
+        return [LeaderboardEntry(code=key, sales=count) for key, count in counter.top(limit)]
+
+    async def rebuild(self, repository: SaleRepositoryPort) -> None:
+        """
+        Recount the window from the repository. Events received while the
+        scan runs are replayed on top of it, unless the scan already saw them.
+        """
+        self._rebuilding = []
+        try:
+            today = self._today()
+            sales = await repository.list_since(today - timedelta(days=WINDOW_DAYS["week"] - 1))
+            events, self._rebuilding = self._rebuilding, None
+        except BaseException:
+            self._rebuilding = None
+            raise
+
+        self._reset(today)
+        scanned: Set = set()
+        for sale in sales:
+            scanned.add(sale.id)
+            self._apply(+1, sale)
+        for delta, sale in events:
+            if (delta > 0) != (sale.id in scanned):
+                self._apply(delta, sale)
+        self.seeded = True
+        logger.info("Leaderboard rebuilt from %d sales", len(sales))
+
+    async def start(self, repository: SaleRepositoryPort, refresh_seconds: float) -> None:
+        """Start rebuilding in the background; returns at once."""
+        self._task = asyncio.create_task(self._refresh(repository, refresh_seconds), name="sales-leaderboard")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _refresh(self, repository: SaleRepositoryPort, interval: float) -> None:
+        while True:
+            try:
+                await self.rebuild(repository)
+            except Exception:
+                logger.exception("Leaderboard rebuild failed; keeping current counts")
+            if self.seeded and interval <= 0:
+                return
+            await asyncio.sleep(interval if self.seeded else min(interval or SEED_RETRY_SECONDS, SEED_RETRY_SECONDS))
+
+    def _record(self, delta: int, sale: Sale) -> None:
+        if self._rebuilding is not None:
+            self._rebuilding.append((delta, sale))
+        self._roll()
+        self._apply(delta, sale)
+
+    def _apply(self, delta: int, sale: Sale) -> None:
+        if sale.sale_date not in self._days["seller"]:
+            return  # outside the window
+        for by, key_of in DIMENSIONS.items():
+            key = key_of(sale)
+            self._days[by][sale.sale_date].add(key, delta)
+            self._week[by].add(key, delta)
+
+    def _roll(self) -> date:
+        """
+        Slide the window when the UTC day changes, expiring old days.
+
+        :return: The current day.
+        """
+        today = self._today()
+        if today == self._current:
+            return today
+        oldest = today - timedelta(days=WINDOW_DAYS["week"] - 1)
+        for by in DIMENSIONS:
+            days = self._days[by]
+            for day in [d for d in days if d < oldest]:
+                for key, count in days.pop(day).items():
+                    self._week[by].add(key, -count)
+            for offset in range(WINDOW_DAYS["week"]):
+                days.setdefault(oldest + timedelta(days=offset), RankedCounter())
+        self._current = today
+        return today
+
+    def _reset(self, today: date) -> None:
+        oldest = today - timedelta(days=WINDOW_DAYS["week"] - 1)
+        for by in DIMENSIONS:
+            self._days[by] = {oldest + timedelta(days=i): RankedCounter() for i in range(WINDOW_DAYS["week"])}
+            self._week[by] = RankedCounter()
+        self._current = today
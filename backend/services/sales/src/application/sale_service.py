@@ -1,17 +1,34 @@
 # src/application/services/sale_service.py
 
 import asyncio
+import logging
 from datetime import UTC, datetime
-from typing import List
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 from uuid import UUID
 
-from src.domain.entities import Sale
+from src.domain.entities import (
+    BulkSaleResult,
+    ProductRef,
+    Sale,
+    SaleDraft,
+    SaleReferences,
+    SellerRef,
+)
 from src.domain.exceptions import (
     DuplicateSaleError,
     InvalidSaleError,
     NotFoundError,
+    ReferenceUnavailableError,
+    UnknownReferenceError,
+)
+from src.domain.ports import (
+    ReferenceDataPort,
+    SaleObserverPort,
+    SaleRepositoryPort,
+    SaleServicePort,
 )
-from src.domain.ports import SaleRepositoryPort, SaleServicePort
+
+logger = logging.getLogger("sales_service.service")
 
 
 class SaleService(SaleServicePort):
@@ -19,13 +36,47 @@ class SaleService(SaleServicePort):
     Implements the sales use-cases, enforcing domain rules and coordinating persistence.
     """
 
-    def __init__(self, repository: SaleRepositoryPort):
+    def __init__(
+        self,
+        repository: SaleRepositoryPort,
+        references: Optional[ReferenceDataPort] = None,
+        validate_references: bool = False,
+        fail_open: bool = True,
+        observers: Sequence[SaleObserverPort] = (),
+        snapshot_references: bool = True,
+        expand_max_codes: int = 0,
+    ):
+        """
+        :param references:          Client for the sellers/products services.
+        :param validate_references: Reject sales whose seller/product does not exist.
+        :param fail_open:           Accept the sale (and log) when a lookup
+                                    cannot be made, instead of failing it.
+        :param observers:           Notified after each create and delete.
+        :param snapshot_references: Store the product name and price and the
+                                    seller name on each new sale.
+        :param expand_max_codes:    Distinct sellers (and products) resolved
+                                    per call of resolve_references; 0 = all.
+        """
         self._repo = repository
+        self._observers = list(observers)
+        self._references = references
+        self._validate_references = validate_references and references is not None
+        self._snapshot_references = snapshot_references and references is not None
+        self._fail_open = fail_open
+        self._expand_max_codes = expand_max_codes
+        # per side: lookups skipped since it became unavailable; logged on the change only
+        self._unverified = {"sellers": 0, "products": 0}
 
     async def list_sales(self) -> List[Sale]:
         """Return all recorded sales."""
         return await self._repo.list_all()
 
+    async def list_sales_page(
+        self, start_after: Optional[UUID], limit: int
+    ) -> Tuple[List[Sale], Optional[UUID]]:
+        """Return one page of sales and the id to continue after."""
+        return await self._repo.list_page(start_after, limit)
+
     async def get_sale(self, sale_id: UUID) -> Sale:
         """
         Retrieve a sale by its UUID.
@@ -54,26 +105,159 @@ class SaleService(SaleServicePort):
         :returns:               The created Sale entity.
         :raises InvalidSaleError:     if sale_date > today.
         :raises DuplicateSaleError:   if invoice_number already used.
+        :raises UnknownReferenceError: if the seller or product does not exist.
+        :raises ReferenceUnavailableError: if a lookup failed and fail_open is off.
         """
         # 1) enforce date invariant
         if sale_date > datetime.now(UTC).date():
             raise InvalidSaleError("sale_date cannot be in the future")
 
-        # 2) check for existing invoice
-        existing_invoice = await self._repo.get_by_invoice(invoice_number)
+        # 2) check invoice uniqueness and both references concurrently
+        existing_invoice, (seller, product) = await asyncio.gather(
+            self._repo.get_by_invoice(invoice_number),
+            self._check_references(seller_code, product_code),
+        )
         if existing_invoice is not None:
             raise DuplicateSaleError(invoice_number)
 
-        # 3) create domain entity
-        new_sale = Sale.new(
+        # 3) persist, with the references as they are now, notify and return
+        sale = await self._repo.create(
             invoice_number=invoice_number,
             sale_date=sale_date,
             seller_code=seller_code,
             product_code=product_code,
+            seller=seller,
+            product=product,
+        )
+        await self._notify("on_created", sale)
+        return sale
+
+    async def bulk_create_sales(self, drafts: List[SaleDraft]) -> List[BulkSaleResult]:
+        """
+        Ingest a batch of sales with a constant number of lookups.
+
+        1) rows dated in the future are invalid; repeated invoices inside
+           the batch are duplicates (first occurrence wins)
+        2) stored invoices and all references are checked concurrently,
+           in bulk; the same lookups feed the sales' snapshots
+        3) the remaining rows are written with batched writes
+        """
+        results: Dict[int, BulkSaleResult] = {}
+        today = datetime.now(UTC).date()
+        seen: Set[str] = set()
+        candidates: List[Tuple[int, SaleDraft]] = []
+        for index, draft in enumerate(drafts):
+            if draft.sale_date > today:
+                results[index] = BulkSaleResult(
+                    index, BulkSaleResult.INVALID, error="sale_date cannot be in the future"
+                )
+            elif draft.invoice_number in seen:
+                results[index] = BulkSaleResult(
+                    index,
+                    BulkSaleResult.DUPLICATE,
+                    error=f"Duplicate invoice in batch: {draft.invoice_number}",
+                )
+            else:
+                seen.add(draft.invoice_number)
+                candidates.append((index, draft))
+
+        existing, (sellers, products) = await asyncio.gather(
+            self._repo.find_existing_invoices(seen),
+            self._lookup_references(
+                {d.seller_code for _, d in candidates},
+                {d.product_code for _, d in candidates},
+            ),
         )
 
-        # 4) persist and return
-        return await self._repo.create(new_sale)
+        to_write: List[Tuple[int, Sale]] = []
+        for index, draft in candidates:
+            if draft.invoice_number in existing:
+                results[index] = BulkSaleResult(
+                    index, BulkSaleResult.DUPLICATE, error=str(DuplicateSaleError(draft.invoice_number))
+                )
+            elif self._validate_references and sellers is not None and draft.seller_code not in sellers:
+                results[index] = BulkSaleResult(
+                    index, BulkSaleResult.INVALID, error=str(UnknownReferenceError("seller", draft.seller_code))
+                )
+            elif self._validate_references and products is not None and draft.product_code not in products:
+                results[index] = BulkSaleResult(
+                    index, BulkSaleResult.INVALID, error=str(UnknownReferenceError("product", draft.product_code))
+                )
+            else:
+                to_write.append((index, Sale.new(
+                    invoice_number=draft.invoice_number,
+                    sale_date=draft.sale_date,
+                    seller_code=draft.seller_code,
+                    product_code=draft.product_code,
+                    seller=(sellers or {}).get(draft.seller_code),
+                    product=(products or {}).get(draft.product_code),
+                )))
+
+        failures = await self._repo.create_many([sale for _, sale in to_write]) if to_write else {}
+        for index, sale in to_write:
+            if sale.id in failures:
+                results[index] = BulkSaleResult(index, BulkSaleResult.FAILED, error=failures[sale.id])
+            else:
+                results[index] = BulkSaleResult(index, BulkSaleResult.CREATED, sale=sale)
+                await self._notify("on_created", sale)
+
+        return [results[i] for i in range(len(drafts))]
+
+    async def _check_references(
+        self, seller_code: UUID, product_code: UUID
+    ) -> Tuple[Optional[SellerRef], Optional[ProductRef]]:
+        """
+        Look up the seller and the product, both at once; when validating,
+        verify that they exist.
+
+        :return: The seller and product found (None when not looked up).
+        """
+        sellers, products = await self._lookup_references({seller_code}, {product_code})
+        if self._validate_references:
+            if sellers is not None and seller_code not in sellers:
+                raise UnknownReferenceError("seller", seller_code)
+            if products is not None and product_code not in products:
+                raise UnknownReferenceError("product", product_code)
+        return (sellers or {}).get(seller_code), (products or {}).get(product_code)
+
+    async def _lookup_references(
+        self,
+        seller_codes: Set[UUID],
+        product_codes: Set[UUID],
+    ) -> Tuple[Optional[Dict[UUID, SellerRef]], Optional[Dict[UUID, ProductRef]]]:
+        """
+        Fetch sellers and products concurrently, for validation and for
+        the sales' snapshots. A side comes back as ``None`` when it could
+        not (or need not) be looked up; when validating with fail_open off
+        an unavailable lookup raises instead.
+        """
+        references = self._references
+        if references is None or not (self._validate_references or self._snapshot_references):
+            return None, None
+        results = await asyncio.gather(
+            references.get_sellers(seller_codes) if seller_codes else _empty(),
+            references.get_products(product_codes) if product_codes else _empty(),
+            return_exceptions=True,
+        )
+        checked: List[Optional[dict]] = []
+        for side, result in zip(("sellers", "products"), results):
+            if isinstance(result, ReferenceUnavailableError):
+                if self._validate_references and not self._fail_open:
+                    raise result
+                if not self._unverified[side]:
+                    logger.warning("Accepting sales without %s verification or snapshot: %s", side, result)
+                self._unverified[side] += 1
+                checked.append(None)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                if self._unverified[side]:
+                    logger.info(
+                        "%s lookups back after %d skipped", side.capitalize(), self._unverified[side]
+                    )
+                    self._unverified[side] = 0
+                checked.append(result)
+        return checked[0], checked[1]
 
     async def delete_sale(self, sale_id: UUID) -> None:
         """
@@ -81,4 +265,63 @@ class SaleService(SaleServicePort):
 
         :raises NotFoundError: if no such sale exists.
         """
-        await self._repo.delete(sale_id)
+        sale = await self._repo.delete(sale_id)
+        await self._notify("on_deleted", sale)
+
+    async def _notify(self, event: str, sale: Sale) -> None:
+        """
+        Tell every observer about a change; an observer failing is logged,
+        never surfaced to the caller.
+        """
+        for observer in self._observers:
+            try:
+                await getattr(observer, event)(sale)
+            except Exception:
+                logger.exception("Observer %s failed on %s", type(observer).__name__, event)
+
+    async def resolve_references(
+        self,
+        sales: List[Sale],
+        sellers: bool = True,
+        products: bool = True,
+    ) -> SaleReferences:
+        """
+        Resolve the distinct seller/product codes of a page of sales.
+
+        Both lookups run concurrently and each is batched by the adapter,
+        so a page costs a constant number of downstream calls. A failing
+        lookup is logged and leaves its references unresolved, as do the
+        codes past ``expand_max_codes`` (the first ones seen are resolved).
+        """
+        if self._references is None or not sales:
+            return SaleReferences()
+
+        lookups = [
+            self._references.get_sellers(self._capped("seller", [s.seller_code for s in sales]))
+            if sellers else _empty(),
+            self._references.get_products(self._capped("product", [s.product_code for s in sales]))
+            if products else _empty(),
+        ]
+        found_sellers, found_products = await asyncio.gather(*lookups, return_exceptions=True)
+        for kind, result in (("seller", found_sellers), ("product", found_products)):
+            if isinstance(result, BaseException):
+                logger.warning("Could not resolve %s references: %s", kind, result)
+        return SaleReferences(
+            sellers={} if isinstance(found_sellers, BaseException) else found_sellers,
+            products={} if isinstance(found_products, BaseException) else found_products,
+        )
+
+    def _capped(self, kind: str, codes: List[UUID]) -> List[UUID]:
+        """The distinct codes in order of appearance, at most ``expand_max_codes``."""
+        distinct = list(dict.fromkeys(codes))
+        if self._expand_max_codes and len(distinct) > self._expand_max_codes:
+            logger.warning(
+                "Resolving %d of %d distinct %s references; the rest stay unexpanded",
+                self._expand_max_codes, len(distinct), kind,
+            )
+            return distinct[:self._expand_max_codes]
+        return distinct
+
+
+async def _empty() -> dict:
+    return {}
@@ -1,5 +1,8 @@
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Optional
 from uuid import UUID, uuid4
 
 
@@ -7,6 +10,10 @@ from uuid import UUID, uuid4
 class Sale:
     """
     Core domain entity for a Sale.
+
+    ``product_name``, ``unit_price`` and ``seller_name`` are snapshots taken
+    when the sale was recorded, so revenue does not depend on today's
+    catalog; they are None when the reference could not be looked up.
     """
     id: UUID
     invoice_number: str
@@ -14,6 +21,9 @@ class Sale:
     seller_code: UUID
     product_code: UUID
     created_at: datetime
+    product_name: Optional[str] = None
+    unit_price: Optional[Decimal] = None
+    seller_name: Optional[str] = None
 
     @classmethod
     def new(
@@ -22,6 +32,8 @@ class Sale:
         sale_date: date,
         seller_code: UUID,
         product_code: UUID,
+        seller: Optional["SellerRef"] = None,
+        product: Optional["ProductRef"] = None,
     ) -> 'Sale':
         """
         Factory method to create a new Sale with generated UUID and timestamp.
@@ -30,6 +42,8 @@ class Sale:
         :param sale_date:       Date of the sale.
         :param seller_code:     UUID of the seller.
         :param product_code:    UUID of the product.
+        :param seller:          Seller to snapshot, if it was looked up.
+        :param product:         Product to snapshot, if it was looked up.
         :return:                A new Sale entity.
         """
         return cls(
@@ -39,4 +53,104 @@ class Sale:
             seller_code=seller_code,
             product_code=product_code,
             created_at=datetime.now(timezone.utc),
-        )
\ No newline at end of file
+            product_name=product.name if product else None,
+            unit_price=product.price if product else None,
+            seller_name=seller.name if seller else None,
+        )
+
+
+@dataclass(frozen=True)
+class SellerRef:
+    """
+    Read-only view of a seller owned by the sellers service.
+    """
+    code: UUID
+    name: str
+    email: str
+
+
+@dataclass(frozen=True)
+class ProductRef:
+    """
+    Read-only view of a product owned by the products service.
+    """
+    code: UUID
+    name: str
+    price: Decimal
+
+
+@dataclass(frozen=True)
+class SaleReferences:
+    """
+    Sellers and products referenced by a set of sales, keyed by code.
+    Codes that could not be resolved are simply absent.
+    """
+    sellers: Dict[UUID, SellerRef] = field(default_factory=dict)
+    products: Dict[UUID, ProductRef] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class SaleDraft:
+    """
+    Client-supplied fields of a sale that has not been persisted yet.
+    """
+    invoice_number: str
+    sale_date: date
+    seller_code: UUID
+    product_code: UUID
+
+
+@dataclass(frozen=True)
+class BulkSaleResult:
+    """
+    Outcome of one row of a bulk ingestion, in submission order.
+    """
+    CREATED = "created"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+    FAILED = "failed"
+
+    index: int
+    status: str
+    sale: Optional[Sale] = None
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    """
+    A seller or product and its number of sales within a leaderboard window.
+    """
+    code: UUID
+    sales: int
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """
+    A change to an aggregate, recorded in the outbox with the change itself.
+    ``sequence`` orders the events of one aggregate.
+    """
+    event_id: UUID
+    event_type: str
+    aggregate_type: str
+    aggregate_id: str
+    sequence: str
+    occurred_at: datetime
+    payload: Dict[str, Any]
+
+    @classmethod
+    def new(cls, event_type: str, aggregate_id: str, payload: Dict[str, Any]) -> "DomainEvent":
+        """
+        Factory for a new event; ``event_type`` is ``<aggregate>.<change>``.
+        """
+        event_id = uuid4()
+        return cls(
+            event_id=event_id,
+            event_type=event_type,
+            aggregate_type=event_type.split(".", 1)[0],
+            aggregate_id=aggregate_id,
+            sequence=f"{time.time_ns():020d}-{event_id.hex[:8]}",
+            occurred_at=datetime.now(timezone.utc),
+            payload=payload,
+        )
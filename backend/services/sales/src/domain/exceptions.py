@@ -24,4 +24,31 @@ class DuplicateSaleError(DomainError):
     """
     def __init__(self, invoice_number: str):
         super().__init__(f"Duplicate sale invoice: {invoice_number}")
-        self.invoice_number = invoice_number
\ No newline at end of file
+        self.invoice_number = invoice_number
+
+class UnknownReferenceError(DomainError):
+    """
+    Raised when a sale references a seller or product that does not exist.
+    """
+    def __init__(self, kind: str, code: UUID):
+        super().__init__(f"Unknown {kind}: {code}")
+        self.kind = kind
+        self.code = code
+
+class ReferenceUnavailableError(DomainError):
+    """
+    Raised when the sellers or products service cannot be consulted
+    (timeout, error response or open circuit breaker).
+    """
+    def __init__(self, kind: str, reason: str):
+        super().__init__(f"Cannot verify {kind}: {reason}")
+        self.kind = kind
+        self.reason = reason
+
+class CapacityExceededError(DomainError):
+    """
+    Raised when DynamoDB keeps throttling a call after the retries the
+    resilience layer allows.
+    """
+    def __init__(self):
+        super().__init__("The sales store is busy; retry shortly")
@@ -1,9 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Collection, Dict, List, Optional, Set, Tuple
 from uuid import UUID
 from datetime import date
 
-from src.domain.entities import Sale
+from src.domain.entities import (
+    BulkSaleResult,
+    DomainEvent,
+    ProductRef,
+    Sale,
+    SaleDraft,
+    SaleReferences,
+    SellerRef,
+)
 
 
 class SaleRepositoryPort(ABC):
@@ -20,6 +28,28 @@ class SaleRepositoryPort(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def list_page(self, start_after: Optional[UUID], limit: int) -> Tuple[List[Sale], Optional[UUID]]:
+        """
+        Retrieve one page of sales in table order.
+
+        :param start_after: Id of the last sale of the previous page, or None.
+        :param limit:       Maximum number of sales in the page.
+        :return:            The page and the id to continue after
+                            (None once the table is exhausted).
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def list_since(self, sale_date: date) -> List[Sale]:
+        """
+        Retrieve the sales dated on or after ``sale_date``.
+
+        :param sale_date: Earliest sale_date to include.
+        :return:          List of Sale entities.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def get_by_id(self, sale_id: UUID) -> Optional[Sale]:
         """
@@ -49,7 +79,9 @@ class SaleRepositoryPort(ABC):
         invoice_number: str,
         sale_date: date,
         seller_code: UUID,
-        product_code: UUID
+        product_code: UUID,
+        seller: Optional[SellerRef] = None,
+        product: Optional[ProductRef] = None,
     ) -> Sale:
         """
         Persist a new sale record, generating its UUID and created_at timestamp.
@@ -58,16 +90,41 @@ class SaleRepositoryPort(ABC):
         :param sale_date:       Date of the sale (must be ≤ today).
         :param seller_code:     UUID of the seller (assumed valid).
         :param product_code:    UUID of the product (assumed valid).
+        :param seller:          Seller whose name is stored with the sale.
+        :param product:         Product whose name and price are stored with the sale.
         :return:                The created Sale entity.
         """
         raise NotImplementedError()
 
     @abstractmethod
-    async def delete(self, sale_id: UUID) -> None:
+    async def find_existing_invoices(self, invoice_numbers: Collection[str]) -> Set[str]:
+        """
+        Bulk variant of get_by_invoice.
+
+        :param invoice_numbers: Distinct invoice identifiers to check.
+        :return:                The subset already used by a stored sale.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def create_many(self, sales: List[Sale]) -> Dict[UUID, str]:
+        """
+        Persist many already-built sales with batched writes.
+
+        :param sales: Sale entities (ids and timestamps already assigned).
+        :return:      Error message per sale id that could not be written;
+                      empty when everything was stored.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete(self, sale_id: UUID) -> Sale:
         """
         Remove a sale by its UUID.
 
         :param sale_id: UUID of the sale to delete.
+        :return:        The deleted Sale entity.
+        :raises NotFoundError: if the sale does not exist.
         """
         raise NotImplementedError()
 
@@ -78,6 +135,75 @@ class SaleRepositoryPort(ABC):
         """
         raise NotImplementedError()
 
+    async def start(self) -> None:
+        """
+        Start background work (called once from the app lifespan).
+        """
+        return None
+
+    async def close(self) -> None:
+        """
+        Flush and stop background work on shutdown.
+        """
+        return None
+
+
+class SaleObserverPort(ABC):
+    """
+    Outbound port: notified after a sale is created or deleted.
+    """
+
+    @abstractmethod
+    async def on_created(self, sale: Sale) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def on_deleted(self, sale: Sale) -> None:
+        raise NotImplementedError()
+
+
+class OutboxPort(ABC):
+    """
+    Outbound port: pending domain events written alongside each change.
+    """
+
+    @abstractmethod
+    async def fetch_pending(self, limit: int) -> List[DomainEvent]:
+        """
+        Read up to ``limit`` undelivered events; events of one aggregate
+        come in sequence order.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def acknowledge(self, events: List[DomainEvent]) -> None:
+        """
+        Remove delivered events from the outbox.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def acquire_lease(self, owner: str, seconds: float) -> bool:
+        """
+        Take or renew the single-dispatcher lease for ``seconds``.
+
+        :return: False while another owner holds an unexpired lease.
+        """
+        raise NotImplementedError()
+
+
+class EventSinkPort(ABC):
+    """
+    Outbound port: where the dispatcher delivers domain events.
+    """
+
+    @abstractmethod
+    async def deliver(self, event: DomainEvent) -> None:
+        """
+        Deliver one event; raising makes the dispatcher retry it later.
+        """
+        raise NotImplementedError()
+
 
 class SaleServicePort(ABC):
     """
@@ -93,6 +219,17 @@ class SaleServicePort(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def list_sales_page(self, start_after: Optional[UUID], limit: int) -> Tuple[List[Sale], Optional[UUID]]:
+        """
+        Business use-case: page through all sales, e.g. for exports.
+
+        :param start_after: Id of the last sale already returned, or None.
+        :param limit:       Maximum number of sales in the page.
+        :return:            The page and the id to continue after, if any.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def get_sale(self, sale_id: UUID) -> Sale:
         """
@@ -114,7 +251,8 @@ class SaleServicePort(ABC):
     ) -> Sale:
         """
         Business use-case: create a new sale, enforcing local invariants
-        (e.g. sale_date ≤ today). Seller and product codes are assumed valid.
+        (e.g. sale_date ≤ today) and, when enabled, that the seller and
+        product exist in their owning services.
 
         :param invoice_number: Unique invoice identifier.
         :param sale_date:       Date of the sale.
@@ -122,6 +260,7 @@ class SaleServicePort(ABC):
         :param product_code:    UUID of the product.
         :return:                The created Sale entity.
         :raises InvalidSaleError: if any local invariant is violated.
+        :raises UnknownReferenceError: if the seller or product does not exist.
         """
         raise NotImplementedError()
 
@@ -133,4 +272,76 @@ class SaleServicePort(ABC):
         :param sale_id: UUID of the sale.
         :raises NotFoundError: if the sale does not exist.
         """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def bulk_create_sales(self, drafts: List[SaleDraft]) -> List[BulkSaleResult]:
+        """
+        Business use-case: ingest a batch of sales (e.g. a POS end-of-day sync).
+
+        Invoices repeated inside the batch or already stored are reported
+        as duplicates; every other row is validated like create_sale and
+        the valid ones are written with batched writes.
+
+        :param drafts: Sales to create, in submission order.
+        :return:       One result per draft, ``index`` matching its position.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def resolve_references(
+        self,
+        sales: List[Sale],
+        sellers: bool = True,
+        products: bool = True,
+    ) -> SaleReferences:
+        """
+        Business use-case: resolve the sellers and/or products referenced
+        by a page of sales with a constant number of downstream calls.
+
+        :param sales:    Sales whose references should be resolved.
+        :param sellers:  Whether to resolve seller codes.
+        :param products: Whether to resolve product codes.
+        :return:         The resolved references; unknown codes are omitted.
+        """
+        raise NotImplementedError()
+
+
+class ReferenceDataPort(ABC):
+    """
+    Outbound port: read access to sellers and products owned by other services.
+    """
+
+    @abstractmethod
+    async def get_sellers(self, codes: Collection[UUID]) -> Dict[UUID, SellerRef]:
+        """
+        Resolve seller codes in as few calls as possible.
+
+        :param codes: Distinct seller UUIDs.
+        :return:      Found sellers keyed by code.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_products(self, codes: Collection[UUID]) -> Dict[UUID, ProductRef]:
+        """
+        Resolve product codes in as few calls as possible.
+
+        :param codes: Distinct product UUIDs.
+        :return:      Found products keyed by code.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """
+        Open the pooled connections ahead of the first lookups.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Release pooled connections.
+        """
         raise NotImplementedError()
\ No newline at end of file
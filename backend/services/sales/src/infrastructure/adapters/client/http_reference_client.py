@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Any, Callable, Collection, Dict, List, TypeVar
+from uuid import UUID
+
+import httpx
+from opentelemetry import propagate
+from opentelemetry.trace import SpanKind
+
+from config import settings
+from src.domain.entities import ProductRef, SellerRef
+from src.domain.exceptions import ReferenceUnavailableError
+from src.domain.ports import ReferenceDataPort
+from src.infrastructure.auth import current_token
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.circuit_breaker import CircuitBreaker
+from src.infrastructure.metrics import timed
+from src.infrastructure.tracing import tracer
+
+logger = logging.getLogger("sales_service.references")
+
+BATCH_SIZE = 100  # DynamoDB BatchGetItem limit on the remote side
+CENTS = Decimal("0.01")
+
+T = TypeVar("T", SellerRef, ProductRef)
+
+
+class HttpReferenceClient(ReferenceDataPort):
+    """
+    Adapter resolving sellers/products through the sibling services'
+    ``POST /api/v1/batch-get`` endpoints over one pooled keep-alive client.
+    Found records are cached briefly so hot codes cost no downstream call;
+    misses are never cached. Each downstream sits behind its own circuit
+    breaker, and any failure surfaces as ``ReferenceUnavailableError``.
+    Batch calls in flight are bounded by the pool size, so a large lookup
+    queues here instead of timing out waiting for a connection.
+    """
+
+    def __init__(self):
+        self._client = httpx.AsyncClient(
+            timeout=settings.REFERENCE_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.REFERENCE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.REFERENCE_HTTP_MAX_CONNECTIONS,
+            ),
+        )
+        self._sellers: TTLCache[UUID, SellerRef] = TTLCache(settings.REFERENCE_CACHE_TTL_SECONDS)
+        self._products: TTLCache[UUID, ProductRef] = TTLCache(settings.REFERENCE_CACHE_TTL_SECONDS)
+        self._slots = asyncio.Semaphore(settings.REFERENCE_HTTP_MAX_CONNECTIONS)
+        self._seller_breaker = _breaker("seller")
+        self._product_breaker = _breaker("product")
+
+    @timed("references")
+    async def get_sellers(self, codes: Collection[UUID]) -> Dict[UUID, SellerRef]:
+        return await self._resolve(
+            codes,
+            cache=self._sellers,
+            breaker=self._seller_breaker,
+            url=f"{settings.SELLERS_SERVICE_URL}/api/v1/batch-get",
+            parse=_parse_seller,
+        )
+
+    @timed("references")
+    async def get_products(self, codes: Collection[UUID]) -> Dict[UUID, ProductRef]:
+        return await self._resolve(
+            codes,
+            cache=self._products,
+            breaker=self._product_breaker,
+            url=f"{settings.PRODUCTS_SERVICE_URL}/api/v1/batch-get",
+            parse=_parse_product,
+        )
+
+    async def connect(self) -> None:
+        """
+        Open a keep-alive connection to each configured service through its
+        liveness probe. Failures are only logged: lookups connect anyway.
+        """
+        urls = [url for url in (settings.SELLERS_SERVICE_URL, settings.PRODUCTS_SERVICE_URL) if url]
+        results = await asyncio.gather(
+            *(self._client.get(f"{url}/health/live") for url in urls), return_exceptions=True
+        )
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.warning("Could not connect to %s: %r", url, result)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def _resolve(
+        self,
+        codes: Collection[UUID],
+        cache: TTLCache[UUID, T],
+        breaker: CircuitBreaker,
+        url: str,
+        parse: Callable[[Dict[str, Any]], T],
+    ) -> Dict[UUID, T]:
+        found: Dict[UUID, T] = {}
+        missing: List[UUID] = []
+        for code in set(codes):
+            hit = cache.get(code)
+            if hit is None:
+                missing.append(code)
+            else:
+                found[code] = hit
+
+        chunks = [missing[i:i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+        pages = await asyncio.gather(*(self._fetch(breaker, url, chunk) for chunk in chunks))
+        for page in pages:
+            for raw in page:
+                ref = parse(raw)
+                cache.set(ref.code, ref)
+                found[ref.code] = ref
+        return found
+
+    async def _fetch(
+        self,
+        breaker: CircuitBreaker,
+        url: str,
+        codes: List[UUID],
+    ) -> List[Dict[str, Any]]:
+        if not breaker.allow_request():
+            raise ReferenceUnavailableError(breaker.name, "circuit open")
+
+        async with self._slots:
+            return await self._post(breaker, url, codes)
+
+    async def _post(
+        self,
+        breaker: CircuitBreaker,
+        url: str,
+        codes: List[UUID],
+    ) -> List[Dict[str, Any]]:
+        if not breaker.allow_request():  # may have opened while queued
+            raise ReferenceUnavailableError(breaker.name, "circuit open")
+
+        headers = {}
+        token = current_token.get()
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        with tracer.start_as_current_span(
+            f"POST {breaker.name} batch-get", kind=SpanKind.CLIENT, attributes={"url.full": url}
+        ) as span:
+            propagate.inject(headers)  # W3C traceparent, so the callee joins this trace
+            try:
+                response = await self._client.post(
+                    url,
+                    json={"codes": [str(c) for c in codes]},
+                    headers=headers,
+                )
+            except httpx.HTTPError as e:
+                breaker.record_failure()
+                raise ReferenceUnavailableError(breaker.name, str(e) or type(e).__name__)
+            span.set_attribute("http.response.status_code", response.status_code)
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+            raise ReferenceUnavailableError(breaker.name, f"HTTP {response.status_code}")
+        breaker.record_success()
+        if response.status_code != 200:
+            # e.g. 401 for an expired token: the dependency is healthy, the call is not
+            raise ReferenceUnavailableError(breaker.name, f"HTTP {response.status_code}")
+        return response.json()
+
+
+def _breaker(kind: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name=kind,
+        failure_threshold=settings.REFERENCE_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.REFERENCE_BREAKER_RESET_SECONDS,
+    )
+
+
+def _parse_seller(raw: Dict[str, Any]) -> SellerRef:
+    return SellerRef(code=UUID(raw["code"]), name=raw["name"], email=raw["email"])
+
+
+def _parse_product(raw: Dict[str, Any]) -> ProductRef:
+    # the products service stores prices as floats, so 9.99 can come back
+    # as 9.9900000000000002131...; sales snapshot it in cents
+    price = Decimal(str(raw["price"])).quantize(CENTS, ROUND_HALF_EVEN)
+    return ProductRef(code=UUID(raw["code"]), name=raw["name"], price=price)
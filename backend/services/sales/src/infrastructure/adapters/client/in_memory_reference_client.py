@@ -0,0 +1,41 @@
+from typing import Collection, Dict, Iterable, Mapping, Optional
+from uuid import UUID
+
+from src.domain.entities import ProductRef, SellerRef
+from src.domain.exceptions import ReferenceUnavailableError
+from src.domain.ports import ReferenceDataPort
+
+
+class InMemoryReferenceClient(ReferenceDataPort):
+    """
+    Stand-in for the sellers/products services, for tests and local runs.
+    Set ``unavailable`` to ``"seller"`` or ``"product"`` to simulate an outage.
+    """
+
+    def __init__(
+        self,
+        sellers: Iterable[SellerRef] = (),
+        products: Iterable[ProductRef] = (),
+    ):
+        self.sellers: Dict[UUID, SellerRef] = {s.code: s for s in sellers}
+        self.products: Dict[UUID, ProductRef] = {p.code: p for p in products}
+        self.unavailable: Optional[str] = None
+        self.calls = 0
+
+    async def get_sellers(self, codes: Collection[UUID]) -> Dict[UUID, SellerRef]:
+        return self._lookup("seller", self.sellers, codes)
+
+    async def get_products(self, codes: Collection[UUID]) -> Dict[UUID, ProductRef]:
+        return self._lookup("product", self.products, codes)
+
+    async def connect(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    def _lookup(self, kind: str, store: Mapping[UUID, object], codes: Collection[UUID]) -> dict:
+        self.calls += 1
+        if self.unavailable == kind:
+            raise ReferenceUnavailableError(kind, "stand-in outage")
+        return {code: store[code] for code in codes if code in store}
@@ -1,6 +1,8 @@
-from datetime import datetime, timezone, date
-from typing import List, Optional
-from uuid import UUID, uuid4
+import asyncio
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Any, Collection, Dict, List, Optional, Set, Tuple
+from uuid import UUID
 
 from pynamodb.attributes import UnicodeAttribute
 from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
@@ -8,9 +10,16 @@ from pynamodb.models import Model
 from pynamodb.exceptions import PynamoDBException
 
 from config import settings
-from src.domain.entities import Sale
-from src.domain.exceptions import NotFoundError
+from src.domain.entities import DomainEvent, ProductRef, Sale, SellerRef
+from src.domain.exceptions import CapacityExceededError, NotFoundError
 from src.domain.ports import SaleRepositoryPort
+from src.infrastructure.adapters.db.group_commit import GroupCommitWriter
+from src.infrastructure.adapters.db.outbox import TRANSACT_MAX_ITEMS, DynamoDBOutbox
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard
+from src.infrastructure.adapters.db.single_flight import SingleFlight
+from src.infrastructure.metrics import timed
+
+BATCH_WRITE_SIZE = 25  # DynamoDB BatchWriteItem limit
 
 
 class InvoiceNumberIndex(GlobalSecondaryIndex):
@@ -42,6 +51,10 @@ class SaleModel(Model):
     seller_code    = UnicodeAttribute()
     product_code   = UnicodeAttribute()
     created_at     = UnicodeAttribute()  # ISO datetime string
+    # snapshots taken when the sale was recorded
+    product_name   = UnicodeAttribute(null=True)
+    unit_price     = UnicodeAttribute(null=True)  # decimal string, kept exact
+    seller_name    = UnicodeAttribute(null=True)
 
     invoice_index = InvoiceNumberIndex()
 
@@ -49,81 +62,265 @@ class SaleModel(Model):
 class DynamoDBSaleRepo(SaleRepositoryPort):
     """
     Outbound adapter: implements SaleRepositoryPort using PynamoDB and GSI.
+
+    With SALES_WRITE_COALESCING on, single creates go through a
+    GroupCommitWriter instead of one PutItem each. With an outbox, every
+    write carries its sale.created / sale.deleted event in the same
+    transaction. Every call goes through the DynamoDBGuard (rate limits,
+    throttle retries), and concurrent lookups of the same id or invoice
+    share one request.
     """
 
+    def __init__(
+        self,
+        outbox: Optional[DynamoDBOutbox] = None,
+        guard: Optional[DynamoDBGuard] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ):
+        self._outbox = outbox
+        self._db = guard or DynamoDBGuard()
+        self.single_flight = single_flight or SingleFlight()
+        self._writer: Optional[GroupCommitWriter] = None
+        if settings.SALES_WRITE_COALESCING:
+            self._writer = GroupCommitWriter(
+                SaleModel,
+                max_batch=min(settings.SALES_WRITE_BATCH_SIZE, BATCH_WRITE_SIZE),
+                flush_interval=settings.SALES_WRITE_FLUSH_INTERVAL_MS / 1000,
+                journal_path=settings.SALES_WRITE_JOURNAL_PATH,
+                ack=settings.SALES_WRITE_ACK,
+                write=self._write_coalesced,
+                max_attempts=settings.SALES_WRITE_MAX_ATTEMPTS,
+            )
+
+    async def start(self) -> None:
+        if self._writer is not None:
+            await self._writer.start()
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            await self._writer.close()
+
+    @timed("dynamodb")
     async def list_all(self) -> List[Sale]:
+        def scan() -> List[SaleModel]:
+            return list(SaleModel.scan())
+
+        return [_to_domain(item) for item in await self._db.read(scan)]
+
+    @timed("dynamodb")
+    async def list_page(self, start_after: Optional[UUID], limit: int) -> Tuple[List[Sale], Optional[UUID]]:
+        """
+        One Scan request of ``limit`` items, resumed from ``start_after``.
+        """
+        def scan() -> Tuple[List[Sale], Optional[UUID]]:
+            start_key = {"id": {"S": str(start_after)}} if start_after else None
+            result = SaleModel.scan(limit=limit, last_evaluated_key=start_key)
+            items = [_to_domain(item) for item in result]
+            last_key = result.last_evaluated_key
+            return items, UUID(last_key["id"]["S"]) if last_key else None
+
+        return await self._db.read(scan, units=limit)
+
+    @timed("dynamodb")
+    async def list_since(self, sale_date: date) -> List[Sale]:
+        """
+        Filtered scan on sale_date (ISO strings sort chronologically), one
+        Scan request of LEADERBOARD_SCAN_PAGE_SIZE items per guarded call,
+        so the rate limiter is charged for every item the scan reads.
+        """
+        condition = SaleModel.sale_date >= sale_date.isoformat()
+        page_size = settings.LEADERBOARD_SCAN_PAGE_SIZE
+
+        def scan(start_key: Any) -> dict:  # a LastEvaluatedKey; typed as str by pynamodb
+            return SaleModel._get_connection().scan(
+                filter_condition=condition, limit=page_size, exclusive_start_key=start_key
+            )
+
         sales: List[Sale] = []
-        for item in SaleModel.scan():
-            sales.append(_to_domain(item))
-        return sales
+        start_key: Any = None
+        while True:
+            page = await self._db.read(scan, start_key, units=page_size)
+            sales += [_to_domain(SaleModel.from_raw_data(item)) for item in page.get("Items", [])]
+            start_key = page.get("LastEvaluatedKey")
+            if not start_key:
+                return sales
 
+    @timed("dynamodb")
     async def get_by_id(self, sale_id: UUID) -> Optional[Sale]:
-        try:
-            item = SaleModel.get(hash_key=str(sale_id))
-            return _to_domain(item)
-        except SaleModel.DoesNotExist:
-            return None
+        if self._writer is not None and (pending := self._writer.pending_by_id(str(sale_id))):
+            return _to_domain(pending)
+
+        async def get() -> Optional[Sale]:
+            item = await self._db.read(_get, sale_id)
+            return _to_domain(item) if item is not None else None
+
+        return await self.single_flight.do(("id", sale_id), get)
 
+    @timed("dynamodb")
     async def get_by_invoice(self, invoice_number: str) -> Optional[Sale]:
         """
         Query the invoice-number-index GSI rather than scanning the table.
+        Sales still queued for a group commit count as existing.
         """
-        try:
-            iterator = SaleModel.invoice_index.query(invoice_number)
-            first = next(iterator, None)
-            return _to_domain(first) if first else None
-        except PynamoDBException:
-            return None
+        if self._writer is not None and (pending := self._writer.pending_by_invoice(invoice_number)):
+            return _to_domain(pending)
+        def query() -> Optional[SaleModel]:
+            return next(SaleModel.invoice_index.query(invoice_number, limit=1), None)
+
+        async def get() -> Optional[Sale]:
+            try:
+                first = await self._db.read(query)
+                return _to_domain(first) if first else None
+            except PynamoDBException:
+                return None
+
+        return await self.single_flight.do(("invoice", invoice_number), get)
 
+    @timed("dynamodb")
     async def create(
         self,
         invoice_number: str,
         sale_date: date,
         seller_code: UUID,
-        product_code: UUID
+        product_code: UUID,
+        seller: Optional[SellerRef] = None,
+        product: Optional[ProductRef] = None,
     ) -> Sale:
         """
         Persist a new sale, generate its UUID & timestamp,
         and return the created Sale entity.
         """
-        now = datetime.now(timezone.utc)
-        new_id = uuid4()
-
-        obj = SaleModel(
-            id=str(new_id),
-            invoice_number=invoice_number,
-            sale_date=sale_date.isoformat(),
-            seller_code=str(seller_code),
-            product_code=str(product_code),
-            created_at=now.isoformat(),
-        )
-        obj.save()
-
-        return Sale(
-            id=new_id,
+        sale = Sale.new(
             invoice_number=invoice_number,
             sale_date=sale_date,
             seller_code=seller_code,
             product_code=product_code,
-            created_at=now,
+            seller=seller,
+            product=product,
         )
+        obj = _to_model(sale)
+        if self._writer is not None:
+            await self._writer.submit(obj)
+        elif self._outbox is not None:
+            await self._db.write(
+                self._outbox.commit, saves=[obj], events=[_event("sale.created", sale)], units=2
+            )
+        else:
+            await self._db.write(obj.save)
+        self._written(sale)
+        return sale
 
-    async def delete(self, sale_id: UUID) -> None:
-        try:
-            item = SaleModel.get(hash_key=str(sale_id))
-            item.delete()
-        except SaleModel.DoesNotExist:
+    @timed("dynamodb")
+    async def find_existing_invoices(self, invoice_numbers: Collection[str]) -> Set[str]:
+        """
+        Probe the invoice-number-index GSI for many invoices at once.
+        GSIs cannot be batch-read, so queries run concurrently in worker
+        threads, bounded by SALES_BULK_QUERY_CONCURRENCY.
+        """
+        semaphore = asyncio.Semaphore(settings.SALES_BULK_QUERY_CONCURRENCY)
+
+        def exists(invoice_number: str) -> bool:
+            query = SaleModel.invoice_index.query(invoice_number, limit=1)
+            return next(query, None) is not None
+
+        async def check(invoice_number: str) -> tuple[str, bool]:
+            async with semaphore:
+                return invoice_number, await self._db.read(exists, invoice_number)
+
+        results = await asyncio.gather(*(check(i) for i in set(invoice_numbers)))
+        return {invoice for invoice, found in results if found}
+
+    @timed("dynamodb")
+    async def create_many(self, sales: List[Sale]) -> Dict[UUID, str]:
+        """
+        Write sales in BatchWriteItem chunks of 25 (transactions of 50 sales
+        plus their events with an outbox), several chunks in flight
+        (SALES_BULK_WRITE_CONCURRENCY). PynamoDB retries unprocessed items
+        and the guard retries a throttled chunk; a chunk that still fails is
+        reported item by item.
+        """
+        semaphore = asyncio.Semaphore(settings.SALES_BULK_WRITE_CONCURRENCY)
+        size = BATCH_WRITE_SIZE if self._outbox is None else TRANSACT_MAX_ITEMS // 2
+        chunks = [sales[i:i + size] for i in range(0, len(sales), size)]
+
+        def write(chunk: List[Sale]) -> None:
+            self._write_models([_to_model(sale) for sale in chunk])
+
+        async def run(chunk: List[Sale]) -> Dict[UUID, str]:
+            units = len(chunk) if self._outbox is None else 2 * len(chunk)
+            async with semaphore:
+                try:
+                    await self._db.write(write, chunk, units=units)
+                except (PynamoDBException, CapacityExceededError) as e:
+                    return {sale.id: str(e) for sale in chunk}
+                for sale in chunk:
+                    self._written(sale)
+                return {}
+
+        failures: Dict[UUID, str] = {}
+        for result in await asyncio.gather(*(run(c) for c in chunks)):
+            failures.update(result)
+        return failures
+
+    @timed("dynamodb")
+    async def delete(self, sale_id: UUID) -> Sale:
+        item = await self._db.read(_get, sale_id)
+        if item is None:
             raise NotFoundError(sale_id)
+        sale = _to_domain(item)
+        if self._outbox is None:
+            await self._db.write(item.delete)
+        else:
+            await self._db.write(
+                self._outbox.commit, deletes=[item], events=[_event("sale.deleted", sale)], units=2
+            )
+        self._written(sale)
+        return sale
+
+    def _written(self, sale: Sale) -> None:
+        """Lookups started from now on must not join one begun before this write."""
+        self.single_flight.forget(("id", sale.id))
+        self.single_flight.forget(("invoice", sale.invoice_number))
+
+    async def _write_coalesced(self, items: List[SaleModel]) -> None:
+        units = len(items) if self._outbox is None else 2 * len(items)
+        await self._db.write(self._write_models, items, units=units)
+
+    def _write_models(self, items: List[SaleModel]) -> None:
+        """
+        Store up to 25 sales with BatchWriteItem, or with an outbox up to
+        50 sales plus their events per transaction.
+        """
+        if self._outbox is None:
+            with SaleModel.batch_write() as batch:
+                for item in items:
+                    batch.save(item)
+            return
+        size = TRANSACT_MAX_ITEMS // 2
+        for i in range(0, len(items), size):
+            chunk = items[i:i + size]
+            self._outbox.commit(
+                saves=chunk,
+                events=[_event("sale.created", _to_domain(item)) for item in chunk],
+            )
 
+    @timed("dynamodb")
     async def ping(self) -> None:
         # readiness check: raises if table or index are unreachable
         try:
-            if not SaleModel.exists():
+            if not await self._db.read(SaleModel.exists):
                 raise RuntimeError(f"Table {SaleModel.Meta.table_name} not found")
         except PynamoDBException as e:
             raise e
 
 
+def _get(sale_id: UUID) -> Optional[SaleModel]:
+    try:
+        return SaleModel.get(hash_key=str(sale_id))
+    except SaleModel.DoesNotExist:
+        return None
+
+
 def _to_domain(item: SaleModel) -> Sale:
     """Convert a PynamoDB model into a domain Sale entity."""
     return Sale(
@@ -133,4 +330,37 @@ def _to_domain(item: SaleModel) -> Sale:
         seller_code=UUID(item.seller_code),
         product_code=UUID(item.product_code),
         created_at=datetime.fromisoformat(item.created_at),
-    )
\ No newline at end of file
+        product_name=item.product_name,
+        unit_price=Decimal(item.unit_price) if item.unit_price is not None else None,
+        seller_name=item.seller_name,
+    )
+
+
+def _to_model(sale: Sale) -> SaleModel:
+    """Convert a domain Sale entity into a PynamoDB model."""
+    return SaleModel(
+        id=str(sale.id),
+        invoice_number=sale.invoice_number,
+        sale_date=sale.sale_date.isoformat(),
+        seller_code=str(sale.seller_code),
+        product_code=str(sale.product_code),
+        created_at=sale.created_at.isoformat(),
+        product_name=sale.product_name,
+        unit_price=str(sale.unit_price) if sale.unit_price is not None else None,
+        seller_name=sale.seller_name,
+    )
+
+
+def _event(event_type: str, sale: Sale) -> DomainEvent:
+    """Build the outbox event describing a change to ``sale``."""
+    return DomainEvent.new(event_type, str(sale.id), {
+        "id": str(sale.id),
+        "invoice_number": sale.invoice_number,
+        "sale_date": sale.sale_date.isoformat(),
+        "seller_code": str(sale.seller_code),
+        "product_code": str(sale.product_code),
+        "created_at": sale.created_at.isoformat(),
+        "product_name": sale.product_name,
+        "unit_price": str(sale.unit_price) if sale.unit_price is not None else None,
+        "seller_name": sale.seller_name,
+    })
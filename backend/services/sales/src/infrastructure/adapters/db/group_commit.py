@@ -0,0 +1,271 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from pynamodb.exceptions import PynamoDBException, TransactWriteError
+
+from src.domain.exceptions import CapacityExceededError
+
+if TYPE_CHECKING:
+    from src.infrastructure.adapters.db.dynamodb_repository import SaleModel
+
+logger = logging.getLogger("sales_service.group_commit")
+
+ACK_DYNAMODB = "dynamodb"
+ACK_JOURNAL = "journal"
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_BACKOFF_MAX_SECONDS = 8.0
+# errors a retry cannot fix
+PERMANENT_CODES = frozenset({
+    "ValidationException",
+    "ConditionalCheckFailedException",
+    "ResourceNotFoundException",
+    "AccessDeniedException",
+    "ItemCollectionSizeLimitExceededException",
+})
+PERMANENT_REASONS = frozenset({"ConditionalCheckFailed", "ValidationError", "ItemCollectionSizeLimitExceeded"})
+
+
+class GroupCommitWriter:
+    """
+    Coalesces single-sale writes into BatchWriteItem groups of ``model``
+    (``SaleModel``: items are tracked by id and invoice number).
+
+    Callers ``submit()`` a model and await their own future. A background
+    task drains the queue every ``flush_interval`` seconds or as soon as
+    ``max_batch`` items are waiting, appends the batch to a local
+    write-ahead journal (one fsync per batch) and writes it to DynamoDB.
+
+    ``ack`` decides when a caller is released:
+
+    - ``dynamodb``: after the batch is stored (failures reach the caller)
+    - ``journal``:  right after the fsync; the batch is then written in
+      the background (see ``_store_journaled``), and replayed from the
+      journal on the next start if the process dies first
+
+    ``write`` is a coroutine function replacing the plain BatchWriteItem
+    (e.g. to add outbox records, or to go through the DynamoDBGuard).
+    Sales that are accepted but not yet stored stay visible through
+    ``pending_by_id`` / ``pending_by_invoice`` for read-your-writes.
+    """
+
+    def __init__(
+        self,
+        model: Type["SaleModel"],
+        max_batch: int = 25,
+        flush_interval: float = 0.005,
+        journal_path: str = "",
+        ack: str = ACK_DYNAMODB,
+        write: Optional[Callable[[List["SaleModel"]], Awaitable[None]]] = None,
+        max_attempts: int = 5,
+    ):
+        if ack not in (ACK_DYNAMODB, ACK_JOURNAL):
+            raise ValueError(f"Unsupported ack mode {ack!r}")
+        if ack == ACK_JOURNAL and not journal_path:
+            raise ValueError("ack='journal' requires a journal path")
+        self._model = model
+        self._write = write or self._batch_write
+        self._max_batch = max_batch
+        self._flush_interval = flush_interval
+        self._journal = Path(journal_path) if journal_path else None
+        self._ack = ack
+        self._max_attempts = max(1, max_attempts)
+        self.dead_lettered = 0
+        self._queue: asyncio.Queue[Tuple["SaleModel", asyncio.Future]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._pending_by_id: Dict[str, "SaleModel"] = {}
+        self._pending_by_invoice: Dict[str, "SaleModel"] = {}
+
+    async def start(self) -> None:
+        """Replay any batch left in the journal, then start flushing."""
+        if self._journal is not None:
+            leftovers = await asyncio.to_thread(self._read_journal, self._journal)
+            if leftovers:
+                logger.warning("Replaying %d journaled sales from %s", len(leftovers), self._journal)
+                await self._store_journaled(self._journal, leftovers)
+                await asyncio.to_thread(_truncate, self._journal)
+        self._task = asyncio.create_task(self._run(), name="sales-group-commit")
+
+    async def close(self) -> None:
+        """Flush what is queued and stop the background task."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def submit(self, item: "SaleModel") -> None:
+        """Queue a sale and wait until it is acknowledged."""
+        if self._task is None:
+            raise RuntimeError("GroupCommitWriter.start() was not awaited")
+        future = asyncio.get_running_loop().create_future()
+        self._pending_by_id[item.id] = item
+        self._pending_by_invoice[item.invoice_number] = item
+        await self._queue.put((item, future))
+        await future
+
+    def pending_by_id(self, sale_id: str) -> Optional["SaleModel"]:
+        return self._pending_by_id.get(sale_id)
+
+    def pending_by_invoice(self, invoice_number: str) -> Optional["SaleModel"]:
+        return self._pending_by_invoice.get(invoice_number)
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[Tuple["SaleModel", asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        journal = self._journal
+        try:
+            if journal is not None:
+                await asyncio.to_thread(_append, journal, [item.serialize() for item in items])
+        except OSError as e:
+            logger.exception("Could not journal %d sales", len(items))
+            self._settle(batch, error=e)
+            return
+
+        if self._ack == ACK_JOURNAL and journal is not None:  # the constructor requires one
+            _resolve(batch)
+            await self._store_journaled(journal, items)
+            self._settle(batch)
+        else:
+            try:
+                await self._write(items)
+            except Exception as e:
+                self._settle(batch, error=e)
+            else:
+                self._settle(batch)
+
+        if journal is not None:
+            await asyncio.to_thread(_truncate, journal)
+
+    async def _store_journaled(self, journal: Path, items: List["SaleModel"]) -> None:
+        """
+        Write sales whose callers were already answered. Transient errors
+        are retried with backoff, up to ``max_attempts``. A permanent one
+        (validation, failed condition...) fails the whole batch, so its
+        sales are then written one by one to find the culprits. What
+        cannot be stored goes to the dead-letter file (the journal path
+        plus ``.dead``) instead of holding up the batches behind it.
+        """
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                await self._write(items)
+                return
+            except Exception as e:
+                if is_permanent(e):
+                    if len(items) == 1:
+                        await asyncio.to_thread(self._dead_letter, journal, items, e)
+                    else:
+                        for item in items:
+                            await self._store_journaled(journal, [item])
+                    return
+                if attempt == self._max_attempts:
+                    await asyncio.to_thread(self._dead_letter, journal, items, e)
+                    return
+                logger.warning("Batch write of %d journaled sales failed (%r); retrying", len(items), e)
+                await asyncio.sleep(min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)))
+
+    def _settle(self, batch: List[Tuple["SaleModel", asyncio.Future]], error: Optional[BaseException] = None) -> None:
+        for item, future in batch:
+            self._pending_by_id.pop(item.id, None)
+            if self._pending_by_invoice.get(item.invoice_number) is item:
+                del self._pending_by_invoice[item.invoice_number]
+        if error is None:
+            _resolve(batch)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+
+    def _dead_letter(self, journal: Path, items: List["SaleModel"], error: BaseException) -> None:
+        dead_letters = journal.with_name(f"{journal.name}.dead")
+        logger.error("Dead-lettering %d journaled sales to %s: %r", len(items), dead_letters, error)
+        _append(dead_letters, [{"error": repr(error), "item": item.serialize()} for item in items])
+        self.dead_lettered += len(items)
+
+    def _read_journal(self, journal: Path) -> List["SaleModel"]:
+        if not journal.exists():
+            return []
+        items = []
+        with open(journal, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    items.append(self._model.from_raw_data(json.loads(line)))
+                except ValueError:
+                    # a torn last line: that batch was never acknowledged
+                    logger.warning("Skipping unreadable journal line")
+        return items
+
+    async def _batch_write(self, items: List["SaleModel"]) -> None:
+        def write() -> None:
+            with self._model.batch_write() as batch:
+                for item in items:
+                    batch.save(item)
+
+        await asyncio.to_thread(write)
+
+
+def _append(path: Path, records: Iterable[dict]) -> None:
+    """Append JSON lines to ``path`` and fsync before returning."""
+    lines = "".join(json.dumps(record) + "\n" for record in records)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(lines)
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _truncate(path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def is_permanent(error: BaseException) -> bool:
+    """
+    Whether retrying the write that raised ``error`` cannot succeed.
+    Throttling, server errors and lost connections are transient; so is
+    an error from outside PynamoDB only if it is an OSError (a bug in
+    building the item is not).
+    """
+    if isinstance(error, CapacityExceededError):
+        return False
+    if not isinstance(error, PynamoDBException):
+        return not isinstance(error, OSError)
+    if isinstance(error, TransactWriteError) and any(
+        r is not None and r.code in PERMANENT_REASONS for r in error.cancellation_reasons
+    ):
+        return True
+    return error.cause_response_code in PERMANENT_CODES
+
+
+def _resolve(batch: List[Tuple["SaleModel", asyncio.Future]]) -> None:
+    for _, future in batch:
+        if not future.done():
+            future.set_result(None)
@@ -0,0 +1,155 @@
+import json
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.connection import Connection
+from pynamodb.exceptions import PutError
+from pynamodb.models import Model
+from pynamodb.transactions import TransactWrite
+
+from config import settings
+from src.domain.entities import DomainEvent
+from src.domain.ports import OutboxPort
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard
+
+TRANSACT_MAX_ITEMS = 100  # DynamoDB TransactWriteItems limit
+LEASE_KEY = "__dispatcher__"
+
+
+class OutboxModel(Model):
+    """
+    PynamoDB model for the outbox table: one item collection per
+    aggregate, sorted by event sequence.
+    """
+    class Meta:
+        table_name = settings.OUTBOX_TABLE_NAME or "SalesOutbox"
+        region     = settings.AWS_REGION
+        if settings.DYNAMODB_ENDPOINT_URL:
+            host = settings.DYNAMODB_ENDPOINT_URL
+
+    aggregate_id   = UnicodeAttribute(hash_key=True)
+    sequence       = UnicodeAttribute(range_key=True)
+    event_id       = UnicodeAttribute()
+    event_type     = UnicodeAttribute()
+    aggregate_type = UnicodeAttribute()
+    occurred_at    = UnicodeAttribute()  # ISO datetime string
+    payload        = UnicodeAttribute()  # JSON document
+
+
+class OutboxLeaseModel(Model):
+    """
+    Dispatcher lease, kept as a single item in the outbox table.
+    """
+    class Meta:
+        table_name = OutboxModel.Meta.table_name
+        region     = settings.AWS_REGION
+        if settings.DYNAMODB_ENDPOINT_URL:
+            host = settings.DYNAMODB_ENDPOINT_URL
+
+    aggregate_id = UnicodeAttribute(hash_key=True)
+    sequence     = UnicodeAttribute(range_key=True)
+    owner        = UnicodeAttribute()
+    lease_until  = NumberAttribute()  # epoch seconds
+
+
+class DynamoDBOutbox(OutboxPort):
+    """
+    Outbox on DynamoDB. Repositories call ``commit()`` so their writes and
+    the matching events land in a single TransactWriteItems. The
+    dispatcher's reads, deletes and lease go through ``guard``, like the
+    repository's calls.
+    """
+
+    def __init__(self, guard: Optional[DynamoDBGuard] = None):
+        self._db = guard or DynamoDBGuard()
+        self._connection = Connection(
+            region=settings.AWS_REGION,
+            host=settings.DYNAMODB_ENDPOINT_URL or None,
+        )
+
+    @property
+    def connection(self) -> Connection:
+        """The connection the transactions go through."""
+        return self._connection
+
+    def commit(
+        self,
+        saves: Iterable[Model] = (),
+        deletes: Iterable[Model] = (),
+        events: Iterable[DomainEvent] = (),
+    ) -> None:
+        """
+        Write items and their events atomically (at most 100 in total).
+        """
+        with TransactWrite(connection=self._connection) as transaction:
+            for item in saves:
+                transaction.save(item)
+            for item in deletes:
+                transaction.delete(item)
+            for event in events:
+                transaction.save(_to_record(event))
+
+    async def fetch_pending(self, limit: int) -> List[DomainEvent]:
+        def scan() -> List[DomainEvent]:
+            # a scan walks each item collection in sort-key order
+            items = OutboxModel.scan(
+                OutboxModel.aggregate_id != LEASE_KEY,
+                limit=limit,
+                consistent_read=True,
+            )
+            return [_to_event(item) for item in items]
+
+        return await self._db.read(scan, units=limit)
+
+    async def acknowledge(self, events: List[DomainEvent]) -> None:
+        def delete() -> None:
+            with OutboxModel.batch_write() as batch:
+                for event in events:
+                    batch.delete(OutboxModel(event.aggregate_id, event.sequence))
+
+        await self._db.write(delete, units=len(events))
+
+    async def acquire_lease(self, owner: str, seconds: float) -> bool:
+        now = time.time()
+        lease = OutboxLeaseModel(LEASE_KEY, "lease", owner=owner, lease_until=now + seconds)
+        try:
+            await self._db.write(
+                lease.save,
+                condition=(
+                    OutboxLeaseModel.aggregate_id.does_not_exist()
+                    | (OutboxLeaseModel.owner == owner)
+                    | (OutboxLeaseModel.lease_until < now)
+                ),
+            )
+            return True
+        except PutError as e:
+            if e.cause_response_code == "ConditionalCheckFailedException":
+                return False
+            raise
+
+
+def _to_record(event: DomainEvent) -> OutboxModel:
+    return OutboxModel(
+        event.aggregate_id,
+        event.sequence,
+        event_id=str(event.event_id),
+        event_type=event.event_type,
+        aggregate_type=event.aggregate_type,
+        occurred_at=event.occurred_at.isoformat(),
+        payload=json.dumps(event.payload),
+    )
+
+
+def _to_event(item: OutboxModel) -> DomainEvent:
+    return DomainEvent(
+        event_id=UUID(item.event_id),
+        event_type=item.event_type,
+        aggregate_type=item.aggregate_type,
+        aggregate_id=item.aggregate_id,
+        sequence=item.sequence,
+        occurred_at=datetime.fromisoformat(item.occurred_at),
+        payload=json.loads(item.payload),
+    )
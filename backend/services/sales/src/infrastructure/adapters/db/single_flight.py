@@ -0,0 +1,57 @@
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """
+    Lookups made, and how many of them joined a call already in flight.
+    """
+    calls: int = 0
+    coalesced: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical reads into one call.
+
+    The first caller for a key starts ``fn()``; callers arriving while it
+    runs await the same task and get its result (or its exception). The
+    key is released as soon as the call completes, so nothing is cached:
+    a burst on a hot key costs one DynamoDB request instead of one per
+    request. A caller that is cancelled leaves the call running for the
+    others.
+
+    Writes ``forget()`` the keys they touch, so a read that starts after
+    a write never joins a call that began before it.
+    """
+
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.stats.calls += 1
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable) -> None:
+        self._calls.pop(key, None)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved, even when every caller went away
@@ -2,7 +2,8 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from src.domain.ports import SaleRepositoryPort
-from src.infrastructure.di import get_repository
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard
+from src.infrastructure.di import get_guard, get_repository
 
 router = APIRouter(
     prefix="/health",
@@ -30,3 +31,9 @@ async def readiness(repo: SaleRepositoryPort = Depends(get_repository)):
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Readiness failed: {e}",
         )
+
+
+@router.get("/dynamodb", include_in_schema=False)
+async def dynamodb_stats(guard: DynamoDBGuard = Depends(get_guard)):
+    """Throttling, retry and rate-limit counters of the DynamoDB layer."""
+    return guard.stats.snapshot()
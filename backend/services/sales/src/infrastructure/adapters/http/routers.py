@@ -1,36 +1,147 @@
+import json
 from uuid import UUID
-from typing import List
+from typing import Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
+from config import settings
+from src.domain.entities import BulkSaleResult
 from src.domain.exceptions import NotFoundError, InvalidSaleError
 from src.domain.ports import SaleServicePort
-from src.infrastructure.adapters.http.schemas import SaleIn, SaleOut
-from src.infrastructure.di import get_service
+from src.application.leaderboard import Leaderboard
+from src.infrastructure.adapters.http.export import ExportColumn, export_response
+from src.infrastructure.adapters.http.sse import SaleEventBroker, TooManySubscribersError
+from src.infrastructure.adapters.http.schemas import (
+    BulkSaleResponse,
+    BulkSaleResultOut,
+    LeaderboardEntryOut,
+    LeaderboardOut,
+    SaleIn,
+    SaleOut,
+)
+from src.infrastructure.di import get_broker, get_leaderboard, get_service
 
 router = APIRouter(prefix="/api/v1", tags=["sales"])
 
+EXPANDABLE = frozenset({"seller", "product"})
 
-@router.get("/", response_model=List[SaleOut])
+EXPORT_COLUMNS = (
+    ExportColumn("id", "string", lambda s: s.id),
+    ExportColumn("invoice_number", "string", lambda s: s.invoice_number),
+    ExportColumn("sale_date", "date", lambda s: s.sale_date),
+    ExportColumn("seller_code", "string", lambda s: s.seller_code),
+    ExportColumn("product_code", "string", lambda s: s.product_code),
+    ExportColumn("created_at", "timestamp", lambda s: s.created_at),
+    ExportColumn("seller_name", "string", lambda s: s.seller_name),
+    ExportColumn("product_name", "string", lambda s: s.product_name),
+    ExportColumn("unit_price", "decimal", lambda s: s.unit_price),
+)
+
+
+def parse_expand(
+    expand: Optional[str] = Query(
+        None,
+        description="Comma-separated references to embed: seller, product",
+    ),
+) -> frozenset:
+    """Parse and validate the ``expand`` query parameter."""
+    if not expand:
+        return frozenset()
+    requested = frozenset(part.strip() for part in expand.split(",") if part.strip())
+    unknown = requested - EXPANDABLE
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported expand value(s): {', '.join(sorted(unknown))}",
+        )
+    return requested
+
+
+@router.get("/", response_model=List[SaleOut], response_model_exclude_unset=True)
 async def list_sales(
+    expand: frozenset = Depends(parse_expand),
     service: SaleServicePort = Depends(get_service),
 ):
-    """List all sales."""
+    """List all sales, optionally embedding their seller and/or product."""
     sales = await service.list_sales()
-    return [SaleOut.from_domain(s) for s in sales]
+    references = None
+    if expand:
+        references = await service.resolve_references(
+            sales, sellers="seller" in expand, products="product" in expand
+        )
+    return [SaleOut.from_domain(s, references, expand) for s in sales]
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_sales(
+    format: Literal["csv", "parquet"] = Query("csv"),
+    cursor: Optional[UUID] = Query(None, description="Resume after this sale id (the last one received)"),
+    service: SaleServicePort = Depends(get_service),
+):
+    """Stream every sale as CSV or Parquet, page by page."""
+    return export_response(
+        "sales", format, EXPORT_COLUMNS, service.list_sales_page, cursor, settings.EXPORT_PAGE_SIZE
+    )
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_sales(
+    last_event_id: Optional[str] = Header(None, description="Resume after this event id"),
+    broker: SaleEventBroker = Depends(get_broker),
+):
+    """
+    Server-Sent Events feed of ``sale.created`` / ``sale.deleted``.
+    A ``reset`` event means the missed events are gone: refetch the list.
+    """
+    try:
+        frames = broker.subscribe(last_event_id, settings.SSE_KEEPALIVE_SECONDS)
+    except TooManySubscribersError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live subscribers, retry later",
+        )
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-@router.get("/{sale_id}", response_model=SaleOut)
+@router.get("/leaderboard", response_model=LeaderboardOut)
+async def leaderboard(
+    by: Literal["seller", "product"] = Query("seller"),
+    window: Literal["day", "week"] = Query("day", description="today, or the last 7 days including today"),
+    limit: int = Query(10, ge=1, le=settings.LEADERBOARD_MAX_LIMIT),
+    board: Leaderboard = Depends(get_leaderboard),
+):
+    """Top sellers or products by number of sales, served from memory."""
+    entries = board.top(by, window, limit)
+    return LeaderboardOut(
+        by=by,
+        window=window,
+        entries=[LeaderboardEntryOut.from_domain(rank, e) for rank, e in enumerate(entries, start=1)],
+    )
+
+
+@router.get("/{sale_id}", response_model=SaleOut, response_model_exclude_unset=True)
 async def get_sale(
     sale_id: UUID,
+    expand: frozenset = Depends(parse_expand),
     service: SaleServicePort = Depends(get_service),
 ):
-    """Get a sale by its UUID."""
+    """Get a sale by its UUID, optionally embedding its seller and/or product."""
     try:
         sale = await service.get_sale(sale_id)
-        return SaleOut.from_domain(sale)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    references = None
+    if expand:
+        references = await service.resolve_references(
+            [sale], sellers="seller" in expand, products="product" in expand
+        )
+    return SaleOut.from_domain(sale, references, expand)
 
 
 @router.post("/", response_model=SaleOut, status_code=status.HTTP_201_CREATED)
@@ -51,6 +162,82 @@ async def create_sale(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkSaleResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/SaleIn"}}
+                },
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/SaleIn"}
+                },
+            },
+        }
+    },
+)
+async def bulk_create_sales(
+    request: Request,
+    service: SaleServicePort = Depends(get_service),
+):
+    """
+    Create many sales at once from a JSON array or an NDJSON body
+    (one sale per line). Every row gets its own result; the request only
+    fails as a whole if the body itself cannot be read.
+    """
+    rows = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    if len(rows) > settings.SALES_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.SALES_BULK_MAX_ITEMS} sales per request",
+        )
+
+    results: Dict[int, BulkSaleResultOut] = {}
+    drafts = []
+    positions = []
+    for index, row in enumerate(rows):
+        try:
+            if isinstance(row, ValueError):
+                raise row
+            drafts.append(SaleIn.model_validate(row).to_draft())
+            positions.append(index)
+        except (ValidationError, ValueError) as e:
+            results[index] = BulkSaleResultOut(index=index, status=BulkSaleResult.INVALID, error=str(e))
+
+    for result in await service.bulk_create_sales(drafts):
+        out = BulkSaleResultOut.from_domain(result)
+        out.index = positions[result.index]
+        results[out.index] = out
+
+    return BulkSaleResponse.from_results([results[i] for i in range(len(rows))])
+
+
+def _parse_bulk_body(body: bytes, content_type: str) -> list:
+    """
+    Decode a JSON array, or NDJSON where a malformed line only spoils its row.
+    """
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        rows: list = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                rows.append(ValueError(f"Malformed JSON line: {e}"))
+        return rows
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Malformed JSON body: {e}")
+    if not isinstance(data, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array of sales")
+    return data
+
+
 @router.delete("/{sale_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_sale(
     sale_id: UUID,
@@ -1,10 +1,20 @@
 from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
 from pydantic.alias_generators import to_camel
 
-from src.domain.entities import Sale
+from src.domain.entities import (
+    BulkSaleResult,
+    LeaderboardEntry,
+    ProductRef,
+    Sale,
+    SaleDraft,
+    SaleReferences,
+    SellerRef,
+)
 
 
 class SaleIn(BaseModel):
@@ -27,6 +37,17 @@ class SaleIn(BaseModel):
             raise ValueError("sale_date cannot be in the future")
         return v
 
+    def to_draft(self) -> SaleDraft:
+        """
+        Convert this payload into a SaleDraft for bulk ingestion.
+        """
+        return SaleDraft(
+            invoice_number=self.invoice_number,
+            sale_date=self.sale_date,
+            seller_code=self.seller_code,
+            product_code=self.product_code,
+        )
+
     def to_domain(self) -> Sale:
         """
         Convert this payload into a domain Sale entity (id & created_at
@@ -40,9 +61,39 @@ class SaleIn(BaseModel):
         )
 
 
+class SellerSummaryOut(BaseModel):
+    """
+    Seller embedded in a sale when ``expand=seller`` is requested.
+    """
+
+    code: UUID
+    name: str
+    email: str
+
+    @classmethod
+    def from_domain(cls, seller: SellerRef) -> "SellerSummaryOut":
+        return cls(code=seller.code, name=seller.name, email=seller.email)
+
+
+class ProductSummaryOut(BaseModel):
+    """
+    Product embedded in a sale when ``expand=product`` is requested.
+    """
+
+    code: UUID
+    name: str
+    price: Decimal
+
+    @classmethod
+    def from_domain(cls, product: ProductRef) -> "ProductSummaryOut":
+        return cls(code=product.code, name=product.name, price=product.price)
+
+
 class SaleOut(BaseModel):
     """
     Outgoing schema for sale responses, using camelCase aliases.
+    ``seller``/``product`` are only present when expanded; the names and
+    price recorded with the sale always are (null for older sales).
     """
 
     id: UUID = Field(..., description="UUID of the sale")
@@ -51,6 +102,11 @@ class SaleOut(BaseModel):
     seller_code: UUID
     product_code: UUID
     created_at: datetime
+    seller_name: Optional[str] = Field(None, description="Seller name when the sale was recorded")
+    product_name: Optional[str] = Field(None, description="Product name when the sale was recorded")
+    unit_price: Optional[Decimal] = Field(None, description="Product price when the sale was recorded")
+    seller: Optional[SellerSummaryOut] = None
+    product: Optional[ProductSummaryOut] = None
 
     model_config = {
         "alias_generator": to_camel,
@@ -58,10 +114,23 @@ class SaleOut(BaseModel):
     }
 
     @classmethod
-    def from_domain(cls, sale: Sale) -> "SaleOut":
+    def from_domain(
+        cls,
+        sale: Sale,
+        references: Optional[SaleReferences] = None,
+        expand: frozenset = frozenset(),
+    ) -> "SaleOut":
         """
-        Produce an output DTO from a domain Sale entity.
+        Produce an output DTO from a domain Sale entity, embedding the
+        requested references (``None`` when a code could not be resolved).
         """
+        extra: Dict[str, Any] = {}
+        if references is not None and "seller" in expand:
+            seller = references.sellers.get(sale.seller_code)
+            extra["seller"] = SellerSummaryOut.from_domain(seller) if seller else None
+        if references is not None and "product" in expand:
+            product = references.products.get(sale.product_code)
+            extra["product"] = ProductSummaryOut.from_domain(product) if product else None
         return cls(
             id=sale.id,
             invoice_number=sale.invoice_number,
@@ -69,4 +138,77 @@ class SaleOut(BaseModel):
             seller_code=sale.seller_code,
             product_code=sale.product_code,
             created_at=sale.created_at,
+            seller_name=sale.seller_name,
+            product_name=sale.product_name,
+            unit_price=sale.unit_price,
+            **extra,
         )
+
+
+class BulkSaleResultOut(BaseModel):
+    """
+    Per-row outcome of a bulk ingestion, in submission order.
+    """
+
+    index: int
+    status: str = Field(..., description="created | duplicate | invalid | failed")
+    id: Optional[UUID] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_domain(cls, result: BulkSaleResult) -> "BulkSaleResultOut":
+        return cls(
+            index=result.index,
+            status=result.status,
+            id=result.sale.id if result.sale else None,
+            error=result.error,
+        )
+
+
+class BulkSaleResponse(BaseModel):
+    """
+    Summary and per-row results of ``POST /api/v1/bulk``.
+    """
+
+    created: int
+    duplicates: int
+    invalid: int
+    failed: int
+    results: List[BulkSaleResultOut]
+
+    @classmethod
+    def from_results(cls, results: List[BulkSaleResultOut]) -> "BulkSaleResponse":
+        def count(status: str) -> int:
+            return sum(1 for r in results if r.status == status)
+
+        return cls(
+            created=count(BulkSaleResult.CREATED),
+            duplicates=count(BulkSaleResult.DUPLICATE),
+            invalid=count(BulkSaleResult.INVALID),
+            failed=count(BulkSaleResult.FAILED),
+            results=results,
+        )
+
+
+class LeaderboardEntryOut(BaseModel):
+    """
+    One ranked seller or product of ``GET /api/v1/leaderboard``.
+    """
+
+    rank: int
+    code: UUID
+    sales: int
+
+    @classmethod
+    def from_domain(cls, rank: int, entry: LeaderboardEntry) -> "LeaderboardEntryOut":
+        return cls(rank=rank, code=entry.code, sales=entry.sales)
+
+
+class LeaderboardOut(BaseModel):
+    """
+    Top sellers or products by number of sales for a window ending today (UTC).
+    """
+
+    by: str
+    window: str
+    entries: List[LeaderboardEntryOut]
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import AsyncIterator, Deque, Optional, Set, Tuple
+
+from src.domain.entities import Sale
+from src.domain.ports import SaleObserverPort
+from src.infrastructure.adapters.http.schemas import SaleOut
+
+logger = logging.getLogger("sales_service.sse")
+
+CREATED = "sale.created"
+DELETED = "sale.deleted"
+RESET = "reset"
+RETRY_MS = 3000  # how soon EventSource reconnects after a drop
+
+# (event id, event type, JSON payload)
+Event = Tuple[str, str, str]
+_CLOSED: Event = ("", "", "")
+
+
+class TooManySubscribersError(Exception):
+    """Raised when the broker already serves its maximum number of clients."""
+
+
+class _Subscriber:
+    """
+    One connected client: a bounded queue, and whether it fell behind.
+    """
+
+    def __init__(self, size: int):
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=size)
+        self.lagged = False
+
+
+class SaleEventBroker(SaleObserverPort):
+    """
+    Bounded in-process fan-out of sale changes to SSE clients.
+
+    - every event gets an id ``<epoch>-<seq>``; the last ``replay_size``
+      events are kept so a reconnecting client (``Last-Event-ID``) gets
+      what it missed
+    - each client has its own queue of ``queue_size`` events; publishing
+      never waits, a client whose queue is full is disconnected and
+      catches up through replay when it reconnects
+    - ids from another process or older than the buffer cannot be
+      replayed: the client receives a ``reset`` event and should refetch
+    """
+
+    def __init__(self, replay_size: int, queue_size: int, max_subscribers: int):
+        self._epoch = os.urandom(4).hex()
+        self._seq = 0
+        self._history: Deque[Event] = deque(maxlen=replay_size)
+        self._queue_size = queue_size
+        self._max_subscribers = max_subscribers
+        self._subscribers: Set[_Subscriber] = set()
+
+    async def on_created(self, sale: Sale) -> None:
+        self.publish(CREATED, SaleOut.from_domain(sale).model_dump_json(by_alias=True))
+
+    async def on_deleted(self, sale: Sale) -> None:
+        self.publish(DELETED, json.dumps({"id": str(sale.id)}))
+
+    def publish(self, event_type: str, data: str) -> None:
+        self._seq += 1
+        event = (f"{self._epoch}-{self._seq}", event_type, data)
+        self._history.append(event)
+        for subscriber in self._subscribers:
+            if subscriber.lagged:
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscriber.lagged = True
+                logger.info("Dropping SSE client that fell %d events behind", self._queue_size)
+
+    def _backlog(self, last_event_id: Optional[str]) -> list:
+        """
+        Events after ``last_event_id``; a single reset event if they are gone.
+        """
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self._epoch or not seq.isdigit():
+            return [self._reset_event()]
+        seq_no = int(seq)
+        if self._history and seq_no < self._seq_of(self._history[0]) - 1:
+            return [self._reset_event()]
+        return [e for e in self._history if self._seq_of(e) > seq_no]
+
+    def subscribe(self, last_event_id: Optional[str], keepalive: float) -> AsyncIterator[str]:
+        """
+        Yield SSE frames for one client until it disconnects or lags.
+
+        :raises TooManySubscribersError: when the broker is full.
+        """
+        if len(self._subscribers) >= self._max_subscribers:
+            raise TooManySubscribersError()
+        return self._frames(last_event_id, keepalive)
+
+    def close(self) -> None:
+        """Wake every client so its stream ends (on shutdown)."""
+        for subscriber in self._subscribers:
+            subscriber.lagged = True
+            try:
+                subscriber.queue.put_nowait(_CLOSED)
+            except asyncio.QueueFull:
+                pass
+
+    async def _frames(self, last_event_id: Optional[str], keepalive: float) -> AsyncIterator[str]:
+        subscriber = _Subscriber(self._queue_size)
+        # register and read the backlog without awaiting in between, so
+        # every event lands in exactly one of the two
+        self._subscribers.add(subscriber)
+        backlog = self._backlog(last_event_id)
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            for event in backlog:
+                yield _frame(event)
+            while not subscriber.lagged:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is _CLOSED:
+                    break
+                yield _frame(event)
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def _reset_event(self) -> Event:
+        return (f"{self._epoch}-{self._seq}", RESET, "{}")
+
+    @staticmethod
+    def _seq_of(event: Event) -> int:
+        return int(event[0].rsplit("-", 1)[1])
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+
+def _frame(event: Event) -> str:
+    event_id, event_type, data = event
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
@@ -0,0 +1,119 @@
+"""
+Offline sales analytics.
+
+    python -m src.infrastructure.analytics export --out ./snapshots/latest
+    python -m src.infrastructure.analytics report --snapshot ./snapshots/latest --by seller --top 10
+    python -m src.infrastructure.analytics report --snapshot ./snapshots/latest --by product --metric revenue
+    python -m src.infrastructure.analytics backfill --token "$ACCESS_TOKEN"
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from dataclasses import asdict
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from src.infrastructure.adapters.client.http_reference_client import HttpReferenceClient
+from src.infrastructure.analytics.backfill import backfill_snapshots
+from src.infrastructure.analytics.query import (
+    GROUP_KEYS,
+    METRICS,
+    load_snapshot,
+    top_k,
+    where,
+)
+from src.infrastructure.analytics.snapshot import export_snapshot
+from src.infrastructure.auth import current_token
+from src.infrastructure.logging import setup_logging
+
+
+def _export(args: argparse.Namespace) -> None:
+    manifest = export_snapshot(
+        out_dir=args.out,
+        total_segments=args.segments,
+        chunk_size=args.chunk_size,
+    )
+    print(json.dumps({k: v for k, v in manifest.items() if k != "parts"}, indent=2))
+
+
+def _report(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    snapshot = load_snapshot(args.snapshot)
+    loaded = time.perf_counter()
+    mask = where(
+        snapshot,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        seller=args.seller,
+        product=args.product,
+    )
+    rows = top_k(snapshot, by=args.by, k=args.top, mask=mask, metric=args.metric)
+    finished = time.perf_counter()
+
+    for key, value in rows:
+        print(f"{key}\t{Decimal(value).scaleb(-2) if args.metric == 'revenue' else value}")
+    logging.getLogger("sales_service.analytics").info(
+        "%d rows, %d matched; load %.3fs, query %.3fs",
+        len(snapshot),
+        int(mask.sum()),
+        loaded - started,
+        finished - loaded,
+    )
+
+
+def _backfill(args: argparse.Namespace) -> None:
+    async def run() -> dict:
+        # the sellers/products services want the caller's bearer token
+        current_token.set(args.token)
+        references = HttpReferenceClient()
+        try:
+            stats = await backfill_snapshots(
+                references,
+                total_segments=args.segments,
+                chunk_size=args.chunk_size,
+            )
+        finally:
+            await references.close()
+        return asdict(stats)
+
+    print(json.dumps(asyncio.run(run()), indent=2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.infrastructure.analytics")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="Snapshot the sales table to disk")
+    export.add_argument("--out", required=True)
+    export.add_argument("--segments", type=int, default=8)
+    export.add_argument("--chunk-size", type=int, default=100_000)
+    export.set_defaults(func=_export)
+
+    report = sub.add_parser("report", help="Top-k group-by over a snapshot")
+    report.add_argument("--snapshot", required=True)
+    report.add_argument("--by", choices=GROUP_KEYS, default="seller")
+    report.add_argument("--top", type=int, default=10)
+    report.add_argument("--metric", choices=METRICS, default="count")
+    report.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    report.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    report.add_argument("--seller", type=UUID)
+    report.add_argument("--product", type=UUID)
+    report.set_defaults(func=_report)
+
+    backfill = sub.add_parser("backfill", help="Store seller/product snapshots on older sales")
+    backfill.add_argument("--token", help="Bearer token for the sellers/products services")
+    backfill.add_argument("--segments", type=int, default=8)
+    backfill.add_argument("--chunk-size", type=int, default=100)
+    backfill.set_defaults(func=_backfill)
+
+    args = parser.parse_args()
+    setup_logging()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pynamodb.exceptions import UpdateError
+from pynamodb.expressions.update import Action
+
+from src.domain.entities import ProductRef, SellerRef
+from src.domain.exceptions import ReferenceUnavailableError
+from src.domain.ports import ReferenceDataPort
+from src.infrastructure.adapters.db.dynamodb_repository import SaleModel
+
+logger = logging.getLogger("sales_service.analytics")
+
+# sales recorded before snapshots existed, or whose lookup failed back then
+MISSING_SNAPSHOT = (
+    SaleModel.seller_name.does_not_exist()
+    | SaleModel.product_name.does_not_exist()
+    | SaleModel.unit_price.does_not_exist()
+)
+
+
+@dataclass
+class BackfillStats:
+    scanned: int = 0
+    updated: int = 0
+    unresolved: int = 0  # reference gone, or lookup unavailable; retried on the next run
+
+    def add(self, other: "BackfillStats") -> None:
+        self.scanned += other.scanned
+        self.updated += other.updated
+        self.unresolved += other.unresolved
+
+
+async def backfill_snapshots(
+    references: ReferenceDataPort,
+    total_segments: int = 8,
+    chunk_size: int = 100,
+    page_size: Optional[int] = None,
+) -> BackfillStats:
+    """
+    Fill in the seller name, product name and unit price of sales that
+    lack them.
+
+    The table is read with a parallel scan (one worker thread per
+    segment), filtered to sales missing a snapshot. Each chunk of
+    ``chunk_size`` sales costs one batched lookup per kind, made on the
+    event loop through ``references`` (which caches, so popular codes are
+    fetched once), then one conditional UpdateItem per sale that only sets
+    the missing fields, so a sale deleted meanwhile is not resurrected.
+
+    Older sales get the *current* name and price: the value at sale time
+    was never recorded. The job is idempotent and can be rerun.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def lookup(items: List[SaleModel]) -> Tuple[Dict[UUID, SellerRef], Dict[UUID, ProductRef]]:
+        return await asyncio.gather(
+            references.get_sellers({UUID(i.seller_code) for i in items}),
+            references.get_products({UUID(i.product_code) for i in items}),
+        )
+
+    def fill(items: List[SaleModel]) -> BackfillStats:
+        stats = BackfillStats(scanned=len(items))
+        try:
+            sellers, products = asyncio.run_coroutine_threadsafe(lookup(items), loop).result()
+        except ReferenceUnavailableError as e:
+            logger.warning("Skipping %d sales, lookup unavailable: %s", len(items), e)
+            stats.unresolved = len(items)
+            return stats
+
+        for item in items:
+            seller = sellers.get(UUID(item.seller_code))
+            product = products.get(UUID(item.product_code))
+            actions: List[Action] = []
+            if seller is not None and item.seller_name is None:
+                actions.append(SaleModel.seller_name.set(seller.name))
+            if product is not None and item.product_name is None:
+                actions.append(SaleModel.product_name.set(product.name))
+            if product is not None and item.unit_price is None:
+                actions.append(SaleModel.unit_price.set(str(product.price)))
+            if seller is None or product is None:
+                stats.unresolved += 1
+            if not actions:
+                continue
+            try:
+                item.update(actions=actions, condition=SaleModel.id.exists())
+                stats.updated += 1
+            except UpdateError as e:
+                if e.cause_response_code != "ConditionalCheckFailedException":
+                    raise
+        return stats
+
+    def scan_segment(segment: int) -> BackfillStats:
+        totals = BackfillStats()
+        chunk: List[SaleModel] = []
+        for item in SaleModel.scan(
+            MISSING_SNAPSHOT,
+            segment=segment,
+            total_segments=total_segments,
+            page_size=page_size,
+        ):
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                totals.add(fill(chunk))
+                chunk = []
+        if chunk:
+            totals.add(fill(chunk))
+        logger.info(
+            "Segment %d: %d sales without snapshot, %d updated, %d unresolved",
+            segment, totals.scanned, totals.updated, totals.unresolved,
+        )
+        return totals
+
+    results = await asyncio.gather(*(asyncio.to_thread(scan_segment, s) for s in range(total_segments)))
+    stats = BackfillStats()
+    for result in results:
+        stats.add(result)
+    return stats
@@ -0,0 +1,193 @@
+import json
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from src.infrastructure.analytics.snapshot import MANIFEST_FILE, NO_PRICE
+
+GROUP_KEYS = ("seller", "product", "day", "month")
+METRICS = ("count", "revenue")
+
+
+@dataclass(frozen=True)
+class SalesSnapshot:
+    """
+    In-memory columnar view of an exported sales snapshot.
+    ``seller``/``product`` hold int32 codes into ``seller_keys``/``product_keys``;
+    ``unit_price`` is in cents, ``NO_PRICE`` where the sale has no snapshot.
+    """
+
+    id: np.ndarray
+    invoice_number: np.ndarray
+    sale_date: np.ndarray
+    created_at: np.ndarray
+    seller: np.ndarray
+    product: np.ndarray
+    unit_price: np.ndarray
+    seller_keys: np.ndarray
+    product_keys: np.ndarray
+    manifest: dict
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+
+def load_snapshot(path: str | Path) -> SalesSnapshot:
+    """
+    Load every part listed in the manifest and merge the per-part
+    dictionaries into one global dictionary per encoded column.
+    """
+    root = Path(path)
+    manifest = json.loads((root / MANIFEST_FILE).read_text())
+    parts = [np.load(root / name) for name in manifest["parts"]]
+
+    def column(name: str, dtype: str) -> np.ndarray:
+        if not parts:
+            return np.empty(0, dtype=dtype)
+        return np.concatenate([
+            # version 1 parts have no unit_price
+            p[name] if name in p.files else np.full(len(p["id"]), NO_PRICE, dtype=dtype)
+            for p in parts
+        ])
+
+    seller, seller_keys = _merge_dictionary(parts, "seller")
+    product, product_keys = _merge_dictionary(parts, "product")
+    return SalesSnapshot(
+        id=column("id", "S16"),
+        invoice_number=column("invoice_number", "U1"),
+        sale_date=column("sale_date", "datetime64[D]"),
+        created_at=column("created_at", "datetime64[us]"),
+        seller=seller,
+        product=product,
+        unit_price=column("unit_price", "int64"),
+        seller_keys=seller_keys,
+        product_keys=product_keys,
+        manifest=manifest,
+    )
+
+
+def where(
+    snapshot: SalesSnapshot,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    seller: Optional[UUID] = None,
+    product: Optional[UUID] = None,
+) -> np.ndarray:
+    """
+    Build a boolean row mask; every bound is optional and inclusive.
+    """
+    mask = np.ones(len(snapshot), dtype=bool)
+    if date_from is not None:
+        mask &= snapshot.sale_date >= np.datetime64(date_from, "D")
+    if date_to is not None:
+        mask &= snapshot.sale_date <= np.datetime64(date_to, "D")
+    if seller is not None:
+        mask &= snapshot.seller == _code_of(snapshot.seller_keys, seller)
+    if product is not None:
+        mask &= snapshot.product == _code_of(snapshot.product_keys, product)
+    return mask
+
+
+def group_count(
+    snapshot: SalesSnapshot,
+    by: str,
+    mask: Optional[np.ndarray] = None,
+    metric: str = "count",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Count sales, or sum their revenue, per group.
+
+    :param by:     One of ``seller``, ``product``, ``day`` or ``month``.
+    :param mask:   Optional row mask from :func:`where`.
+    :param metric: ``count``, or ``revenue`` in cents from the recorded
+                   unit prices (sales without one add nothing).
+    :return:       ``(keys, values)``; keys are 16-byte UUIDs or datetime64 values.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unsupported metric {metric!r}; expected one of {METRICS}")
+    weights = None
+    if metric == "revenue":
+        prices = snapshot.unit_price if mask is None else snapshot.unit_price[mask]
+        weights = np.where(prices == NO_PRICE, 0, prices)
+
+    if by in ("seller", "product"):
+        codes = getattr(snapshot, by)
+        keys = getattr(snapshot, f"{by}_keys")
+        if mask is not None:
+            codes = codes[mask]
+        counts = np.bincount(codes, minlength=len(keys))
+        present = counts > 0
+        if weights is None:
+            return keys[present], counts[present]
+        totals = np.bincount(codes, weights=weights, minlength=len(keys))
+        return keys[present], totals[present].round().astype(np.int64)
+    if by in ("day", "month"):
+        dates = snapshot.sale_date if mask is None else snapshot.sale_date[mask]
+        if by == "month":
+            dates = dates.astype("datetime64[M]")
+        if weights is None:
+            return np.unique(dates, return_counts=True)
+        keys, inverse = np.unique(dates, return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=weights, minlength=len(keys))
+        return keys, totals.round().astype(np.int64)
+    raise ValueError(f"Unsupported group key {by!r}; expected one of {GROUP_KEYS}")
+
+
+def top_k(
+    snapshot: SalesSnapshot,
+    by: str,
+    k: int = 10,
+    mask: Optional[np.ndarray] = None,
+    metric: str = "count",
+) -> List[Tuple[object, int]]:
+    """
+    Return the ``k`` largest groups, highest count (or revenue) first.
+    Uses ``argpartition`` so only the winners are sorted.
+    """
+    keys, counts = group_count(snapshot, by, mask, metric)
+    if len(counts) > k:
+        idx = np.argpartition(counts, -k)[-k:]
+    else:
+        idx = np.arange(len(counts))
+    idx = idx[np.argsort(counts[idx])[::-1]]
+    return [(_decode_key(keys[i]), int(counts[i])) for i in idx]
+
+
+def _merge_dictionary(parts: list, name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Re-encode per-part dictionary codes against a global sorted dictionary.
+    """
+    if not parts:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype="S16")
+    all_keys = np.concatenate([p[f"{name}_keys"] for p in parts])
+    global_keys, inverse = np.unique(all_keys, return_inverse=True)
+    codes = []
+    offset = 0
+    for p in parts:
+        local_keys = p[f"{name}_keys"]
+        remap = inverse[offset:offset + len(local_keys)].astype(np.int32)
+        codes.append(remap[p[name]])
+        offset += len(local_keys)
+    return np.concatenate(codes), global_keys
+
+
+def _code_of(keys: np.ndarray, value: UUID) -> int:
+    """Dictionary code of a UUID, or -1 (matches nothing) if absent."""
+    needle = np.array(value.bytes, dtype="S16")
+    pos = int(np.searchsorted(keys, needle))
+    if pos < len(keys) and keys[pos] == needle:
+        return pos
+    return -1
+
+
+def _decode_key(key: object) -> object:
+    if isinstance(key, bytes):
+        # numpy strips trailing NULs from S16 values; pad them back
+        return UUID(bytes=key.ljust(16, b"\x00"))
+    if isinstance(key, np.datetime64):
+        return str(key)
+    return key
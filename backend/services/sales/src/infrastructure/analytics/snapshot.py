@@ -0,0 +1,173 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Dict, List, Optional
+from uuid import UUID
+
+import numpy as np
+
+from src.infrastructure.adapters.db.dynamodb_repository import SaleModel
+
+logger = logging.getLogger("sales_service.analytics")
+
+MANIFEST_FILE = "manifest.json"
+SNAPSHOT_VERSION = 2  # 2: unit_price column
+NO_PRICE = -1  # unit_price of sales recorded without a price snapshot
+
+
+class _DictionaryEncoder:
+    """
+    Maps UUID strings to dense int32 codes, keeping the raw 16-byte
+    UUIDs as the dictionary so repeated sellers/products cost 4 bytes a row.
+    """
+
+    def __init__(self) -> None:
+        self._codes: Dict[str, int] = {}
+        self.keys: List[bytes] = []
+
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.keys)
+            self._codes[value] = code
+            self.keys.append(UUID(value).bytes)
+        return code
+
+
+@dataclass
+class _PartWriter:
+    """
+    Accumulates one scan segment into columns and spills them to an
+    ``.npz`` part every ``chunk_size`` rows, so memory stays bounded.
+    """
+
+    out_dir: Path
+    segment: int
+    chunk_size: int
+    parts: List[str] = field(default_factory=list)
+    rows: int = 0
+
+    def __post_init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._ids: List[bytes] = []
+        self._invoices: List[str] = []
+        self._sale_dates: List[str] = []
+        self._created_at: List[str] = []
+        self._sellers: List[int] = []
+        self._products: List[int] = []
+        self._unit_price: List[int] = []
+        self._seller_enc = _DictionaryEncoder()
+        self._product_enc = _DictionaryEncoder()
+
+    def add(self, item: SaleModel) -> None:
+        self._ids.append(UUID(item.id).bytes)
+        self._invoices.append(item.invoice_number)
+        self._sale_dates.append(item.sale_date)
+        self._created_at.append(_naive_utc(item.created_at))
+        self._sellers.append(self._seller_enc.encode(item.seller_code))
+        self._products.append(self._product_enc.encode(item.product_code))
+        self._unit_price.append(_cents(item.unit_price))
+        if len(self._ids) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._ids:
+            return
+        name = f"part-{self.segment:04d}-{len(self.parts):05d}.npz"
+        np.savez(
+            self.out_dir / name,
+            id=np.array(self._ids, dtype="S16"),
+            invoice_number=np.array(self._invoices, dtype=np.str_),
+            sale_date=np.array(self._sale_dates, dtype="datetime64[D]"),
+            created_at=np.array(self._created_at, dtype="datetime64[us]"),
+            seller=np.array(self._sellers, dtype=np.int32),
+            product=np.array(self._products, dtype=np.int32),
+            unit_price=np.array(self._unit_price, dtype=np.int64),
+            seller_keys=np.array(self._seller_enc.keys, dtype="S16"),
+            product_keys=np.array(self._product_enc.keys, dtype="S16"),
+        )
+        self.parts.append(name)
+        self.rows += len(self._ids)
+        self._reset()
+
+
+def export_snapshot(
+    out_dir: str | Path,
+    total_segments: int = 8,
+    chunk_size: int = 100_000,
+    page_size: int | None = None,
+) -> dict:
+    """
+    Stream the whole sales table into a columnar snapshot directory.
+
+    The table is read with a DynamoDB parallel scan (one thread per
+    segment); every segment writes its own ``.npz`` parts with
+    dictionary-encoded seller/product UUIDs and each sale's recorded unit
+    price in cents, and a ``manifest.json`` lists the parts once all
+    segments finished.
+
+    :param out_dir:        Target directory (created if missing).
+    :param total_segments: Number of parallel scan segments.
+    :param chunk_size:     Rows per part file.
+    :param page_size:      Optional DynamoDB scan page size.
+    :return:               The written manifest.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    started_at = datetime.now(timezone.utc)
+
+    def scan_segment(segment: int) -> _PartWriter:
+        writer = _PartWriter(out_dir=out, segment=segment, chunk_size=chunk_size)
+        for item in SaleModel.scan(
+            segment=segment,
+            total_segments=total_segments,
+            page_size=page_size,
+        ):
+            writer.add(item)
+        writer.flush()
+        logger.info("Segment %d exported %d sales", segment, writer.rows)
+        return writer
+
+    with ThreadPoolExecutor(max_workers=total_segments) as pool:
+        writers = list(pool.map(scan_segment, range(total_segments)))
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "table": SaleModel.Meta.table_name,
+        "started_at": started_at.isoformat(),
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "rows": sum(w.rows for w in writers),
+        "parts": [part for w in writers for part in w.parts],
+    }
+    (out / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _cents(value: Optional[str]) -> int:
+    """
+    Decimal price string to integer cents, so sums stay exact.
+    """
+    if value is None:
+        return NO_PRICE
+    return int((Decimal(value) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def _naive_utc(value: str) -> str:
+    """
+    Normalise an ISO timestamp to naive UTC so NumPy can parse it
+    without the deprecated timezone handling.
+    """
+    if value.endswith("+00:00"):
+        return value[:-6]
+    if value.endswith("Z"):
+        return value[:-1]
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
@@ -1,11 +1,14 @@
+import asyncio
 import logging
-from fastapi import Security, HTTPException, status
+from contextvars import ContextVar
+from fastapi import Depends, Security, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 from jwt import PyJWKClient
 import time
 
 from config import settings
+from src.infrastructure.tracing import tracer
 
 
 logger = logging.getLogger("product_service.auth")
@@ -13,6 +16,9 @@ logger = logging.getLogger("product_service.auth")
 
 bearer_scheme = HTTPBearer()
 
+# Raw bearer token of the current request, forwarded on calls to sibling services
+current_token: ContextVar[str | None] = ContextVar("current_token", default=None)
+
 _jwk_client: PyJWKClient | None = None
 _last_fetch = 0
 
@@ -23,6 +29,36 @@ def get_jwk_client() -> PyJWKClient:
         _last_fetch = time.time()
     return _jwk_client
 
+def decode_token(token: str) -> dict:
+    """
+    Verify a Cognito JWT (signature, audience, issuer, expiry) and return its claims.
+    """
+    key = get_jwk_client().get_signing_key_from_jwt(token).key
+    return jwt.decode(
+        token,
+        key,
+        algorithms=["RS256"],
+        audience=settings.COGNITO_APP_CLIENT_ID,
+        issuer=settings.cognito_issuer,
+    )
+
+# Token and claims of the current request once verified, so that the
+# idempotency middleware and the auth dependency verify it only once
+_verified: ContextVar[tuple[str, dict] | None] = ContextVar("verified_token", default=None)
+
+
+async def verify_token(token: str) -> dict:
+    """
+    decode_token, off the event loop (fetching the JWKS is a blocking
+    HTTP call), and only once per request for the same token.
+    """
+    verified = _verified.get()
+    if verified is not None and verified[0] == token:
+        return verified[1]
+    claims = await asyncio.to_thread(decode_token, token)
+    _verified.set((token, claims))
+    return claims
+
 async def get_current_user(
     creds: HTTPAuthorizationCredentials = Security(bearer_scheme)
 ):
@@ -31,14 +67,8 @@ async def get_current_user(
     """
     token = creds.credentials
     try:
-        key = get_jwk_client().get_signing_key_from_jwt(token).key
-        payload = jwt.decode(
-            token,
-            key,
-            algorithms=["RS256"],
-            audience=settings.COGNITO_APP_CLIENT_ID,
-            issuer=settings.cognito_issuer,
-        )
+        with tracer.start_as_current_span("auth.verify_token"):
+            payload = await verify_token(token)
     except Exception as e:
         logger.warning("Invalid or expired token: %s", e)
         raise HTTPException(
@@ -46,4 +76,21 @@ async def get_current_user(
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return payload
\ No newline at end of file
+    current_token.set(token)
+    return payload
+
+
+def is_admin(claims: dict) -> bool:
+    """
+    Whether the token's user belongs to the ADMIN_GROUP Cognito group.
+    """
+    return settings.ADMIN_GROUP in claims.get("cognito:groups", [])
+
+
+async def require_admin(claims: dict = Depends(get_current_user)) -> dict:
+    """
+    Security dependency of the admin endpoints: 403 for non-admin users.
+    """
+    if not is_admin(claims):
+        raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Admin group required")
+    return claims
@@ -0,0 +1,42 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Small in-process LRU cache whose entries expire after ``ttl`` seconds.
+    Not thread-safe; meant to be used from the event loop only.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 10_000):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._items: "OrderedDict[K, tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """Store ``value``, expiring after ``ttl`` seconds (the cache's by default)."""
+        self._items[key] = (time.monotonic() + (self._ttl if ttl is None else ttl), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        self._items.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,49 @@
+import time
+
+
+class CircuitBreaker:
+    """
+    Minimal closed → open → half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    callers should skip the dependency for ``reset_timeout`` seconds; the
+    first call after that is let through as a probe and either closes the
+    circuit again or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """True if a call may go through (closed, or a half-open probe)."""
+        state = self.state
+        if state == self.HALF_OPEN:
+            # let exactly one probe through; re-arm the timer for everyone else
+            self._opened_at = time.monotonic()
+            return True
+        return state == self.CLOSED
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.OPEN or self._failures >= self._failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
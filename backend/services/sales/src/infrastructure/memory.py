@@ -0,0 +1,178 @@
+import linecache
+import logging
+import os
+import resource
+import sys
+import tracemalloc
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger("sales_service.memory")
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+# ru_maxrss is in kilobytes on Linux, in bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# allocations made by tracemalloc itself or the import system are noise
+_NOISE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def rss_bytes() -> int:
+    """Current resident set size of the process."""
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except OSError:  # no procfs (macOS): the high-water mark is the best we have
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """Highest resident set size the process has reached."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+
+@dataclass
+class RoutePeak:
+    """
+    Python heap growth of the requests of one route, between their start
+    and the highest point reached while they ran.
+    """
+    requests: int = 0
+    max_bytes: int = 0
+    total_bytes: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "mean_bytes": self.total_bytes // self.requests if self.requests else 0,
+        }
+
+
+@dataclass(frozen=True)
+class AllocationDiff:
+    """
+    Allocation sites whose memory changed the most over one request,
+    from tracemalloc snapshots taken before and after it.
+    """
+    id: str
+    method: str
+    path: str
+    route: Optional[str]
+    status: int
+    started_at: datetime
+    size_diff_bytes: int
+    peak_bytes: int
+    top: List[Dict[str, Any]] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "size_diff_bytes": self.size_diff_bytes,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+class MemoryTracker:
+    """
+    Runs tracemalloc on demand and keeps what it measured about requests.
+
+    While tracing, the MemoryMiddleware records for each route how far
+    the Python heap grew during its requests. The peak is process-wide:
+    requests running at the same time share it, so per-route figures are
+    upper bounds under concurrency. Tracing slows allocations down
+    noticeably; leave it off outside investigations.
+    """
+
+    def __init__(self, diff_store_size: int = 20):
+        self._routes: Dict[str, RoutePeak] = {}
+        self._diffs: Deque[AllocationDiff] = deque(maxlen=diff_store_size)
+        self.started_at: Optional[datetime] = None
+
+    @property
+    def running(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        if self.running:
+            return
+        tracemalloc.start(frames)
+        self._routes.clear()
+        self.started_at = datetime.now(UTC)
+        logger.info("tracemalloc started, %d frame(s) per allocation", frames)
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        tracemalloc.stop()  # also frees the traces
+        logger.info("tracemalloc stopped")
+
+    def snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_NOISE)
+
+    def top(self, limit: int = 20, group_by: str = "lineno") -> List[Dict[str, Any]]:
+        """The allocation sites holding the most memory right now."""
+        if not self.running:
+            return []
+        return [_stat(s) for s in self.snapshot().statistics(group_by)[:limit]]
+
+    def record(self, route: str, peak_bytes: int) -> None:
+        peak = self._routes.setdefault(route, RoutePeak())
+        peak.requests += 1
+        peak.total_bytes += peak_bytes
+        peak.max_bytes = max(peak.max_bytes, peak_bytes)
+
+    def routes(self) -> Dict[str, Dict[str, Any]]:
+        ranked = sorted(self._routes.items(), key=lambda item: item[1].max_bytes, reverse=True)
+        return {route: peak.snapshot() for route, peak in ranked}
+
+    def add_diff(self, diff: AllocationDiff) -> None:
+        self._diffs.appendleft(diff)
+
+    def get_diff(self, diff_id: str) -> Optional[AllocationDiff]:
+        return next((d for d in self._diffs if d.id == diff_id), None)
+
+    def list_diffs(self) -> List[AllocationDiff]:
+        return list(self._diffs)
+
+    def stats(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory() if self.running else (0, 0)
+        return {
+            "tracing": self.running,
+            "frames": tracemalloc.get_traceback_limit() if self.running else None,
+            "started_at": self.started_at.isoformat() if self.running and self.started_at else None,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if self.running else 0,
+            "rss_bytes": rss_bytes(),
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+
+def compare(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    """The ``limit`` allocation sites whose size changed the most between two snapshots."""
+    return [_stat(s) for s in after.compare_to(before, "lineno")[:limit]]
+
+
+def _stat(stat) -> Dict[str, Any]:
+    out = {
+        "site": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        "size_bytes": stat.size,
+        "count": stat.count,
+    }
+    if isinstance(stat, tracemalloc.StatisticDiff):
+        out["size_diff_bytes"] = stat.size_diff
+        out["count_diff"] = stat.count_diff
+    return out
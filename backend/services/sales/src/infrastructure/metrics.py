@@ -0,0 +1,212 @@
+import functools
+import inspect
+import os
+import time
+from typing import Callable, Iterator, List, TypeVar, cast
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard
+from src.infrastructure.adapters.db.single_flight import SingleFlight
+from src.infrastructure.aws import AWSClients
+from src.infrastructure.memory import peak_rss_bytes
+
+F = TypeVar("F", bound=Callable)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template and status.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being served.",
+    multiprocess_mode="livesum",
+)
+WARMUP_DURATION = Gauge(
+    "startup_warmup_seconds",
+    "Time each warm-up step took before the service reported ready.",
+    ["step"],
+)
+_MEMORY_BUCKETS = tuple(float(2 ** n) for n in range(16, 31, 2))  # 64 KiB .. 1 GiB
+REQUEST_RSS_DELTA = Histogram(
+    "http_request_rss_delta_bytes",
+    "Process resident set size at the end of a request minus at its start, by route; not a peak.",
+    ["method", "route"],
+    buckets=(0.0, *_MEMORY_BUCKETS),
+)
+REQUEST_TRACED_PEAK = Histogram(
+    "http_request_traced_peak_bytes",
+    "Python heap growth from the start of a request to its peak; only while tracemalloc runs.",
+    ["method", "route"],
+    buckets=_MEMORY_BUCKETS,
+)
+CONSUMED_CAPACITY = Counter(
+    "dynamodb_consumed_capacity_units_total",
+    "DynamoDB capacity units consumed, by route (or background), table, index and read/write.",
+    ["route", "table", "index", "kind"],
+)
+REQUEST_CONSUMED_CAPACITY = Histogram(
+    "http_request_consumed_capacity_units",
+    "DynamoDB capacity units, reads and writes, consumed by a request, by route.",
+    ["method", "route"],
+    buckets=(0.0, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0),
+)
+DEPENDENCY_LATENCY = Histogram(
+    "dependency_call_duration_seconds",
+    "Time spent in a repository, reference-data or AWS client call, retries included.",
+    ["dependency", "operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DEPENDENCY_ERRORS = Counter(
+    "dependency_call_errors_total",
+    "Repository, reference-data or AWS client calls that raised, by exception type.",
+    ["dependency", "operation", "error"],
+)
+
+
+def timed(dependency: str) -> Callable[[F], F]:
+    """
+    Record the duration of every call of the decorated function (sync or
+    async) and count the ones that raise. The histogram child is looked
+    up once, at decoration time.
+    """
+    def decorator(fn: F) -> F:
+        operation = fn.__name__
+        latency = DEPENDENCY_LATENCY.labels(dependency, operation)
+
+        def failed(e: BaseException) -> None:
+            DEPENDENCY_ERRORS.labels(dependency, operation, type(e).__name__).inc()
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception as e:
+                    failed(e)
+                    raise
+                finally:
+                    latency.observe(time.perf_counter() - start)
+            return cast(F, async_wrapper)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                failed(e)
+                raise
+            finally:
+                latency.observe(time.perf_counter() - start)
+        return cast(F, wrapper)
+
+    return decorator
+
+
+class RuntimeStatsCollector(Collector):
+    """
+    Exposes the counters the DynamoDB guard and the single-flight layer
+    keep anyway, read at scrape time only.
+    """
+
+    def __init__(self, guard: DynamoDBGuard, single_flight: SingleFlight, aws_clients: AWSClients):
+        self._guard = guard
+        self._single_flight = single_flight
+        self._aws_clients = aws_clients
+
+    def collect(self) -> Iterator:
+        guard = self._guard.stats
+        yield _counter("dynamodb_guard_calls", "Calls made through the DynamoDB guard.", guard.calls)
+        yield _counter("dynamodb_throttles", "Calls DynamoDB refused for capacity.", guard.throttles)
+        yield _counter("dynamodb_retries", "Throttled calls retried by the guard.", guard.retries)
+        yield _counter(
+            "dynamodb_retry_budget_exhausted", "Throttles not retried: budget spent.", guard.budget_exhausted
+        )
+        yield _counter("dynamodb_gave_up", "Calls still throttled after the last attempt.", guard.gave_up)
+        yield _counter(
+            "dynamodb_rate_limited_seconds",
+            "Time calls waited for the client-side rate limiter.",
+            guard.rate_limited_seconds,
+        )
+
+        yield _gauge("process_peak_resident_memory_bytes", "Highest resident set size reached.", peak_rss_bytes())
+
+        yield from _pool_metrics(self._aws_clients)
+
+        flight = self._single_flight.stats
+        yield _counter("single_flight_lookups", "Point lookups made.", flight.calls)
+        yield _counter("single_flight_coalesced", "Lookups that joined one in flight.", flight.coalesced)
+
+
+def _pool_metrics(aws_clients: AWSClients) -> Iterator:
+    """
+    The shared AWS clients' HTTP pools, by client and host. A pool is
+    saturated when ``in_use`` reaches ``max``; connections opened beyond
+    it are discarded after one request.
+    """
+    labels = ["client", "host"]
+    size = GaugeMetricFamily("aws_http_pool_max_connections", "Size of the HTTP connection pool.", labels=labels)
+    in_use = GaugeMetricFamily("aws_http_pool_connections_in_use", "Pool connections serving a call.", labels=labels)
+    idle = GaugeMetricFamily("aws_http_pool_connections_idle", "Open connections kept for reuse.", labels=labels)
+    opened = CounterMetricFamily(
+        "aws_http_pool_connections_opened", "Connections opened; growth at steady load is churn.", labels=labels
+    )
+    requests = CounterMetricFamily("aws_http_pool_requests", "Requests sent through the pool.", labels=labels)
+    for pool in aws_clients.pool_stats():
+        values = [pool.client, pool.host]
+        size.add_metric(values, pool.max_connections)
+        in_use.add_metric(values, pool.in_use)
+        idle.add_metric(values, pool.idle)
+        opened.add_metric(values, pool.opened)
+        requests.add_metric(values, pool.requests)
+    yield from (size, in_use, idle, opened, requests)
+
+
+def _counter(name: str, documentation: str, value: float) -> CounterMetricFamily:
+    return CounterMetricFamily(name, documentation, value=value)
+
+
+def _gauge(name: str, documentation: str, value: float) -> GaugeMetricFamily:
+    return GaugeMetricFamily(name, documentation, value=value)
+
+
+_runtime_collectors: List[Collector] = []
+
+
+def register_runtime_collector(collector: RuntimeStatsCollector) -> Callable[[], None]:
+    """
+    Register ``collector`` on the default registry.
+
+    :return: a function unregistering it, for the end of the lifespan.
+    """
+    REGISTRY.register(collector)
+    _runtime_collectors.append(collector)
+
+    def unregister() -> None:
+        REGISTRY.unregister(collector)
+        _runtime_collectors.remove(collector)
+
+    return unregister
+
+
+def exposition() -> bytes:
+    """
+    The metrics in the Prometheus text format. Under several gunicorn
+    workers (PROMETHEUS_MULTIPROC_DIR set, see gunicorn.conf.py) the
+    metrics above are summed across workers from their files, and the
+    runtime stats are those of the worker answering the scrape.
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return generate_latest(REGISTRY)
+    from prometheus_client.multiprocess import MultiProcessCollector
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    for collector in _runtime_collectors:
+        registry.register(collector)
+    return generate_latest(registry)
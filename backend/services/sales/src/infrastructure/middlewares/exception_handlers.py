@@ -5,12 +5,16 @@ from starlette.status import (
     HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
     HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 
 from src.domain.exceptions import (
+    CapacityExceededError,
     DuplicateSaleError,
     InvalidSaleError,
     NotFoundError,
+    ReferenceUnavailableError,
+    UnknownReferenceError,
 )
 
 logger = logging.getLogger("sales_service.exceptions")
@@ -68,6 +72,58 @@ def register_exception_handlers(app: FastAPI):
             },
         )
 
+    @app.exception_handler(UnknownReferenceError)
+    async def unknown_reference_handler(request: Request, exc: UnknownReferenceError):
+        logger.warning(
+            "UnknownReferenceError: %s %s → %s",
+            request.method,
+            request.url.path,
+            exc,
+        )
+        return JSONResponse(
+            status_code=HTTP_400_BAD_REQUEST,
+            content={
+                "title": "Invalid Reference",
+                "detail": str(exc),
+                "status": HTTP_400_BAD_REQUEST,
+            },
+        )
+
+    @app.exception_handler(ReferenceUnavailableError)
+    async def reference_unavailable_handler(request: Request, exc: ReferenceUnavailableError):
+        logger.error(
+            "ReferenceUnavailableError: %s %s → %s",
+            request.method,
+            request.url.path,
+            exc,
+        )
+        return JSONResponse(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "title": "Dependency Unavailable",
+                "detail": str(exc),
+                "status": HTTP_503_SERVICE_UNAVAILABLE,
+            },
+        )
+
+    @app.exception_handler(CapacityExceededError)
+    async def capacity_exceeded_handler(request: Request, exc: CapacityExceededError):
+        logger.warning(
+            "CapacityExceededError: %s %s → %s",
+            request.method,
+            request.url.path,
+            exc,
+        )
+        return JSONResponse(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "title": "Service Busy",
+                "detail": str(exc),
+                "status": HTTP_503_SERVICE_UNAVAILABLE,
+            },
+            headers={"Retry-After": "1"},
+        )
+
     @app.exception_handler(Exception)
     async def generic_exception_handler(request: Request, exc: Exception):
         logger.exception(
@@ -0,0 +1,93 @@
+import logging
+import tracemalloc
+from datetime import UTC, datetime
+from typing import Optional
+from uuid import uuid4
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.auth import decode_token, is_admin
+from src.infrastructure.memory import AllocationDiff, MemoryTracker, compare
+from src.infrastructure.metrics import REQUEST_TRACED_PEAK
+
+logger = logging.getLogger("sales_service.memory")
+
+MEMORY_DIFF_HEADER = b"x-memory-diff"
+MEMORY_DIFF_ID_HEADER = b"x-memory-diff-id"
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MemoryMiddleware:
+    """
+    While tracemalloc runs (see MemoryTracker), records how far the
+    Python heap grew during each request, by route, in the tracker and
+    in the ``http_request_traced_peak_bytes`` histogram.
+
+    An admin request carrying ``X-Memory-Diff: 1`` is also bracketed by
+    two snapshots; the allocation sites that grew the most are kept in
+    the tracker and the response gets an ``X-Memory-Diff-Id`` header.
+
+    Does nothing but a flag check while tracemalloc is off.
+    """
+
+    def __init__(self, app: ASGIApp, tracker: MemoryTracker, diff_top: int = 25):
+        self.app = app
+        self._tracker = tracker
+        self._diff_top = diff_top
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracemalloc.is_tracing():
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        diff_id = uuid4().hex[:12] if _wants_diff(headers) else None
+        status = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if diff_id is not None:
+                    message["headers"] = [*message.get("headers", []), (MEMORY_DIFF_ID_HEADER, diff_id.encode())]
+            await send(message)
+
+        before = self._tracker.snapshot() if diff_id is not None else None
+        started_at = datetime.now(UTC)
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            if tracemalloc.is_tracing():  # unless stopped meanwhile
+                _, peak = tracemalloc.get_traced_memory()
+                growth = max(0, peak - start_bytes)
+                route = getattr(scope.get("route"), "path", None)
+                self._tracker.record(f"{scope['method']} {route or UNMATCHED_ROUTE}", growth)
+                REQUEST_TRACED_PEAK.labels(scope["method"], route or UNMATCHED_ROUTE).observe(growth)
+                if diff_id is not None and before is not None:
+                    after = self._tracker.snapshot()
+                    self._tracker.add_diff(AllocationDiff(
+                        id=diff_id,
+                        method=scope["method"],
+                        path=scope["path"],
+                        route=route,
+                        status=status,
+                        started_at=started_at,
+                        size_diff_bytes=sum(s.size_diff for s in after.compare_to(before, "filename")),
+                        peak_bytes=growth,
+                        top=compare(before, after, self._diff_top),
+                    ))
+                    logger.info("Memory diff of %s %s: %s", scope["method"], scope["path"], diff_id)
+
+
+def _wants_diff(headers: dict) -> bool:
+    if headers.get(MEMORY_DIFF_HEADER) in (None, b"", b"0"):
+        return False
+    authorization: Optional[bytes] = headers.get(b"authorization")
+    if not authorization or not authorization.lower().startswith(b"bearer "):
+        return False
+    try:
+        return is_admin(decode_token(authorization[7:].decode("latin-1")))
+    except Exception:
+        return False
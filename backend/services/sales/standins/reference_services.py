@@ -0,0 +1,65 @@
+"""
+Local stand-in for the sellers and products services.
+
+Serves the two ``batch-get`` endpoints the sales service depends on, from
+a JSON seed file, so the sales service can run without its siblings:
+
+    STANDIN_SEED=standins/seed.json uvicorn standins.reference_services:app --port 8002
+
+and point both ``SELLERS_SERVICE_URL`` and ``PRODUCTS_SERVICE_URL`` at
+``http://localhost:8002/sellers`` / ``http://localhost:8002/products``.
+``POST /_standin/outage?kind=seller`` makes one side answer 503 so the
+circuit breaker can be exercised.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+
+class BatchIn(BaseModel):
+    codes: List[str]
+
+
+def _load_seed() -> Dict[str, Dict[str, dict]]:
+    path = os.environ.get("STANDIN_SEED", "")
+    if not path:
+        return {"sellers": {}, "products": {}}
+    raw = json.loads(Path(path).read_text())
+    return {
+        "sellers": {s["code"]: s for s in raw.get("sellers", [])},
+        "products": {p["code"]: p for p in raw.get("products", [])},
+    }
+
+
+app = FastAPI(title="Reference services stand-in")
+_data = _load_seed()
+_outage: Dict[str, bool] = {"seller": False, "product": False}
+
+
+def _batch(kind: str, store: Dict[str, dict], payload: BatchIn) -> List[dict]:
+    if _outage[kind]:
+        raise HTTPException(status_code=503, detail=f"{kind} stand-in outage")
+    return [store[code] for code in payload.codes if code in store]
+
+
+@app.post("/sellers/api/v1/batch-get")
+async def sellers_batch_get(payload: BatchIn):
+    return _batch("seller", _data["sellers"], payload)
+
+
+@app.post("/products/api/v1/batch-get")
+async def products_batch_get(payload: BatchIn):
+    return _batch("product", _data["products"], payload)
+
+
+@app.post("/_standin/outage")
+async def set_outage(kind: str, enabled: bool = True):
+    if kind not in _outage:
+        raise HTTPException(status_code=400, detail="kind must be 'seller' or 'product'")
+    _outage[kind] = enabled
+    return _outage
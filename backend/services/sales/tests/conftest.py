@@ -0,0 +1,11 @@
+import os
+
+# config.settings is read at import time; the tests never reach AWS or Cognito
+os.environ.setdefault("AWS_REGION", "us-east-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("SALES_TABLE_NAME", "Sales")
+os.environ.setdefault("COGNITO_USERPOOL_ID", "us-east-1_test")
+os.environ.setdefault("COGNITO_APP_CLIENT_ID", "test")
+# the tests that need DynamoDB use moto, not the DynamoDB Local of .env
+os.environ["DYNAMODB_ENDPOINT_URL"] = ""
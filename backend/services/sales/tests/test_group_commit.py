@@ -0,0 +1,157 @@
+import asyncio
+import json
+from typing import List
+
+import pytest
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.exceptions import PutError
+from pynamodb.models import Model
+
+from src.infrastructure.adapters.db import group_commit
+from src.infrastructure.adapters.db.group_commit import ACK_JOURNAL, GroupCommitWriter
+
+
+class SaleItem(Model):
+    class Meta:
+        table_name = "Sales"
+        region = "us-east-1"
+
+    id = UnicodeAttribute(hash_key=True)
+    invoice_number = UnicodeAttribute()
+
+
+def sale(n: int) -> SaleItem:
+    return SaleItem(id=f"id-{n}", invoice_number=f"INV-{n}")
+
+
+class FakeTable:
+    """Records the batches written; ``failures`` are raised first, in order."""
+
+    def __init__(self, failures=(), reject=()):
+        self.batches: List[List[str]] = []
+        self.failures = list(failures)
+        self.reject = set(reject)
+
+    async def write(self, items: List[SaleItem]) -> None:
+        if self.failures:
+            raise self.failures.pop(0)
+        if any(item.id in self.reject for item in items):
+            raise ValueError("invalid item")
+        self.batches.append([item.id for item in items])
+
+    @property
+    def stored(self) -> List[str]:
+        return [i for batch in self.batches for i in batch]
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(group_commit, "RETRY_BACKOFF_SECONDS", 0.0)
+
+
+def run(writer: GroupCommitWriter, *coroutines):
+    async def main():
+        await writer.start()
+        try:
+            return await asyncio.gather(*coroutines)
+        finally:
+            await writer.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_submits_share_one_batch():
+    table = FakeTable()
+    writer = GroupCommitWriter(SaleItem, max_batch=25, flush_interval=0.05, write=table.write)
+
+    run(writer, *(writer.submit(sale(n)) for n in range(10)))
+
+    assert len(table.batches) == 1
+    assert sorted(table.stored) == sorted(f"id-{n}" for n in range(10))
+    assert writer.pending_by_id("id-0") is None
+
+
+def test_batches_are_capped_at_max_batch():
+    table = FakeTable()
+    writer = GroupCommitWriter(SaleItem, max_batch=4, flush_interval=0.05, write=table.write)
+
+    run(writer, *(writer.submit(sale(n)) for n in range(10)))
+
+    assert [len(b) for b in table.batches] == [4, 4, 2]
+
+
+def test_dynamodb_ack_reports_the_failure_to_callers():
+    table = FakeTable(failures=[PutError("boom")])
+    writer = GroupCommitWriter(SaleItem, flush_interval=0.01, write=table.write)
+
+    async def submit():
+        with pytest.raises(PutError):
+            await writer.submit(sale(1))
+
+    run(writer, submit())
+    assert table.stored == []
+
+
+def test_journal_ack_retries_transient_errors(tmp_path):
+    table = FakeTable(failures=[PutError("throttled"), PutError("throttled")])
+    writer = GroupCommitWriter(
+        SaleItem, flush_interval=0.01, journal_path=str(tmp_path / "journal"), ack=ACK_JOURNAL, write=table.write
+    )
+
+    run(writer, writer.submit(sale(1)))
+
+    assert table.stored == ["id-1"]
+    assert (tmp_path / "journal").read_text() == ""
+    assert writer.dead_lettered == 0
+
+
+def test_journal_ack_dead_letters_after_max_attempts(tmp_path):
+    table = FakeTable(failures=[PutError("down")] * 3)
+    journal = tmp_path / "journal"
+    writer = GroupCommitWriter(
+        SaleItem, flush_interval=0.01, journal_path=str(journal), ack=ACK_JOURNAL, write=table.write, max_attempts=3
+    )
+
+    async def later():
+        await asyncio.sleep(0.05)
+        await writer.submit(sale(2))
+
+    run(writer, writer.submit(sale(1)), later())
+
+    assert table.stored == ["id-2"]
+    dead = [json.loads(line) for line in (tmp_path / "journal.dead").read_text().splitlines()]
+    assert [d["item"]["id"]["S"] for d in dead] == ["id-1"]
+    assert writer.dead_lettered == 1
+
+
+def test_permanent_error_dead_letters_only_the_bad_sale(tmp_path):
+    table = FakeTable(reject={"id-2"})
+    writer = GroupCommitWriter(
+        SaleItem, flush_interval=0.05, journal_path=str(tmp_path / "journal"), ack=ACK_JOURNAL, write=table.write
+    )
+
+    run(writer, *(writer.submit(sale(n)) for n in range(4)))
+
+    assert sorted(table.stored) == ["id-0", "id-1", "id-3"]
+    dead = (tmp_path / "journal.dead").read_text().splitlines()
+    assert len(dead) == 1 and "ValueError" in json.loads(dead[0])["error"]
+
+
+def test_start_replays_the_journal(tmp_path):
+    journal = tmp_path / "journal"
+    journal.write_text("".join(json.dumps(sale(n).serialize()) + "\n" for n in range(3)) + '{"torn')
+    table = FakeTable()
+    writer = GroupCommitWriter(
+        SaleItem, journal_path=str(journal), ack=ACK_JOURNAL, write=table.write
+    )
+
+    run(writer)
+
+    assert table.batches == [["id-0", "id-1", "id-2"]]
+    assert journal.read_text() == ""
+
+
+def test_is_permanent():
+    assert group_commit.is_permanent(ValueError("bad item"))
+    assert not group_commit.is_permanent(PutError("throttled"))
+    assert not group_commit.is_permanent(ConnectionError("reset"))
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.infrastructure.adapters.db.idempotency_store import InMemoryIdempotencyStore
+from src.infrastructure.middlewares import idempotency
+from src.infrastructure.middlewares.idempotency import MAX_STORED_BODY, IdempotencyMiddleware
+
+HEADERS = {"Authorization": "Bearer token", "Idempotency-Key": "k1"}
+
+
+@pytest.fixture(autouse=True)
+def caller(monkeypatch):
+    async def verify_token(token):
+        return {"sub": "user-1"}
+
+    monkeypatch.setattr(idempotency, "verify_token", verify_token)
+
+
+class App:
+    """Answers every POST with a new number, padded to ``size`` bytes."""
+
+    def __init__(self, size: int = 0):
+        self.calls = 0
+        self.size = size
+
+    async def __call__(self, scope, receive, send):
+        await receive()
+        self.calls += 1
+        body = json.dumps({"call": self.calls, "pad": "x" * self.size}).encode()
+        await send({"type": "http.response.start", "status": 201, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+class FailingPut(InMemoryIdempotencyStore):
+    async def put(self, key, response):
+        raise RuntimeError("item too large")
+
+
+def post_twice(app, store, body=b"{}"):
+    async def main():
+        middleware = IdempotencyMiddleware(app, store, wait_timeout=0.3)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(middleware), base_url="http://t") as client:
+            first = await client.post("/api/v1/", content=body, headers=HEADERS)
+            second = await client.post("/api/v1/", content=body, headers=HEADERS)
+            return first, second
+
+    return asyncio.run(main())
+
+
+def test_a_retry_replays_the_first_response():
+    app = App()
+    first, second = post_twice(app, InMemoryIdempotencyStore(ttl=60, max_size=10))
+
+    assert app.calls == 1
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+
+
+def test_a_different_payload_is_rejected():
+    app = App()
+    store = InMemoryIdempotencyStore(ttl=60, max_size=10)
+    post_twice(app, store)
+
+    [_, reused] = post_twice(app, store, body=b'{"other": 1}')
+    assert reused.status_code == 422
+
+
+def test_a_response_that_cannot_be_stored_frees_the_key(caplog):
+    app = App()
+    first, second = post_twice(app, FailingPut(ttl=60, max_size=10))
+
+    assert (first.status_code, second.status_code) == (201, 201)
+    assert app.calls == 2  # run again, not stuck behind a claim
+    assert "Could not record the response" in caplog.text
+
+
+def test_bodies_over_the_item_limit_are_not_recorded():
+    app = App(size=MAX_STORED_BODY)
+    post_twice(app, InMemoryIdempotencyStore(ttl=60, max_size=10))
+
+    assert app.calls == 2
+
+
+def test_a_claim_expires_after_its_lease():
+    async def main():
+        store = InMemoryIdempotencyStore(ttl=60, max_size=10, lease=0.05)
+        assert await store.claim("k", "f")  # its holder dies here
+        assert not await store.claim("k", "f")
+        await asyncio.sleep(0.1)
+        return await store.claim("k", "f")
+
+    assert asyncio.run(main())
@@ -0,0 +1,176 @@
+import asyncio
+import random
+from collections import Counter
+from datetime import date, timedelta
+from typing import List
+from uuid import uuid4
+
+from moto import mock_aws
+
+from config import settings
+from src.application import leaderboard
+from src.application.leaderboard import Leaderboard, RankedCounter
+from src.domain.entities import Sale
+from src.infrastructure.adapters.db.dynamodb_repository import DynamoDBSaleRepo, SaleModel, _to_model
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard
+
+TODAY = date(2026, 3, 10)
+
+
+def test_ranked_counter_matches_a_plain_counter():
+    rng = random.Random(7)
+    ranked, expected = RankedCounter(), Counter()
+    for _ in range(5000):
+        key = rng.randrange(40)
+        delta = rng.choice((1, 1, 1, -1, 3, -2))
+        ranked.add(key, delta)
+        expected[key] = max(0, expected[key] + delta)
+    expected = +expected  # drop zeros
+
+    assert dict(ranked.items()) == dict(expected)
+    counts = [count for _, count in ranked.top(len(expected))]
+    assert counts == sorted(expected.values(), reverse=True)
+    assert [count for _, count in ranked.top(5)] == counts[:5]
+
+
+def test_ranked_counter_drops_keys_at_zero():
+    ranked = RankedCounter()
+    ranked.add("a", 2)
+    ranked.add("b")
+    ranked.add("a", -2)
+    ranked.add("c", -1)
+
+    assert ranked.top(10) == [("b", 1)]
+    assert len(ranked) == 1
+
+
+def sale(day: date, seller=None, product=None) -> Sale:
+    return Sale.new(
+        invoice_number=f"INV-{uuid4().hex[:8]}",
+        sale_date=day,
+        seller_code=seller or uuid4(),
+        product_code=product or uuid4(),
+    )
+
+
+class FakeRepository:
+    """list_since for Leaderboard.rebuild; ``during_scan`` runs while it 'reads'."""
+
+    def __init__(self, sales: List[Sale], during_scan=None):
+        self.sales = sales
+        self.during_scan = during_scan
+        self.since = None
+
+    async def list_since(self, since: date) -> List[Sale]:
+        self.since = since
+        snapshot = [s for s in self.sales if s.sale_date >= since]
+        if self.during_scan is not None:
+            await self.during_scan()
+        return snapshot
+
+
+def test_rebuild_counts_the_window_and_ranks():
+    top, other = uuid4(), uuid4()
+    sales = [sale(TODAY, seller=top) for _ in range(3)] + [sale(TODAY - timedelta(days=2), seller=other)]
+    sales += [sale(TODAY - timedelta(days=7), seller=other) for _ in range(5)]  # outside the week
+    board = Leaderboard(today=lambda: TODAY)
+    repository = FakeRepository(sales)
+
+    asyncio.run(board.rebuild(repository))
+
+    assert repository.since == TODAY - timedelta(days=6)
+    assert [(e.code, e.sales) for e in board.top("seller", "week", 10)] == [(top, 3), (other, 1)]
+    assert [(e.code, e.sales) for e in board.top("seller", "day", 10)] == [(top, 3)]
+
+
+def test_events_during_a_rebuild_are_not_lost_or_counted_twice():
+    seller = uuid4()
+    seen = sale(TODAY, seller=seller)
+    board = Leaderboard(today=lambda: TODAY)
+    late = sale(TODAY, seller=seller)
+
+    async def during_scan():
+        await board.on_created(seen)  # the scan already returned it
+        await board.on_created(late)  # written after the scan read the table
+
+    asyncio.run(board.rebuild(FakeRepository([seen], during_scan)))
+
+    assert [(e.code, e.sales) for e in board.top("seller", "day", 10)] == [(seller, 2)]
+
+
+def test_notifications_update_and_the_window_rolls():
+    today = [TODAY]
+    seller = uuid4()
+    board = Leaderboard(today=lambda: today[0])
+
+    async def record():
+        await board.on_created(sale(TODAY, seller=seller))
+        await board.on_created(sale(TODAY, seller=seller))
+        await board.on_deleted(sale(TODAY, seller=seller))
+
+    asyncio.run(record())
+    assert [(e.code, e.sales) for e in board.top("seller", "week", 10)] == [(seller, 1)]
+
+    today[0] = TODAY + timedelta(days=1)
+    assert board.top("seller", "day", 10) == []
+    assert [e.sales for e in board.top("seller", "week", 10)] == [1]
+
+    today[0] = TODAY + timedelta(days=7)
+    assert board.top("seller", "week", 10) == []
+
+
+class FlakyRepository(FakeRepository):
+    """Fails its first ``failures`` scans."""
+
+    def __init__(self, sales: List[Sale], failures: int):
+        super().__init__(sales)
+        self.failures = failures
+
+    async def list_since(self, since: date) -> List[Sale]:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("table unavailable")
+        return await super().list_since(since)
+
+
+def test_start_seeds_in_the_background_and_retries(monkeypatch):
+    monkeypatch.setattr(leaderboard, "SEED_RETRY_SECONDS", 0.01)
+    seller = uuid4()
+    stored, new = sale(TODAY, seller=seller), sale(TODAY, seller=seller)
+    board = Leaderboard(today=lambda: TODAY)
+
+    async def main():
+        await board.start(FlakyRepository([stored, new], failures=2), refresh_seconds=300)
+        assert not board.seeded
+        await board.on_created(new)  # counted before the seed
+        assert [e.sales for e in board.top("seller", "day", 10)] == [1]
+        while not board.seeded:
+            await asyncio.sleep(0.01)
+        await board.close()
+
+    asyncio.run(main())
+    assert [(e.code, e.sales) for e in board.top("seller", "day", 10)] == [(seller, 2)]
+
+
+class CountingGuard(DynamoDBGuard):
+    def __init__(self):
+        super().__init__()
+        self.reads: List[float] = []
+
+    async def read(self, fn, *args, units: float = 1.0, **kwargs):
+        self.reads.append(units)
+        return await super().read(fn, *args, units=units, **kwargs)
+
+
+def test_the_rebuild_scan_is_charged_page_by_page(monkeypatch):
+    monkeypatch.setattr(settings, "LEADERBOARD_SCAN_PAGE_SIZE", 10)
+    with mock_aws():
+        SaleModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+        for n in range(35):
+            _to_model(sale(TODAY - timedelta(days=n % 10))).save()
+        guard = CountingGuard()
+
+        sales = asyncio.run(DynamoDBSaleRepo(guard=guard).list_since(TODAY - timedelta(days=6)))
+
+    assert len(sales) == sum(1 for n in range(35) if n % 10 <= 6)
+    assert guard.reads == [10, 10, 10, 10]  # 35 items read in 4 requests
@@ -0,0 +1,57 @@
+import asyncio
+import json
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import httpx
+
+from config import settings
+from src.application.sale_service import SaleService
+from src.domain.entities import ProductRef, Sale, SellerRef
+from src.infrastructure.adapters.client.http_reference_client import HttpReferenceClient
+from src.infrastructure.adapters.client.in_memory_reference_client import InMemoryReferenceClient
+
+
+def test_batch_calls_in_flight_are_bounded_by_the_pool(monkeypatch):
+    monkeypatch.setattr(settings, "REFERENCE_HTTP_MAX_CONNECTIONS", 2)
+    monkeypatch.setattr(settings, "SELLERS_SERVICE_URL", "http://sellers")
+    in_flight, peak = 0, 0
+
+    async def batch_get(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        codes = json.loads(request.content)["codes"]
+        return httpx.Response(200, json=[{"code": c, "name": "s", "email": "s@example.com"} for c in codes])
+
+    async def main():
+        client = HttpReferenceClient()
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(batch_get))
+        codes = {uuid4() for _ in range(1000)}  # 10 batches
+        found = await client.get_sellers(codes)
+        await client.close()
+        return codes, found
+
+    codes, found = asyncio.run(main())
+    assert set(found) == codes
+    assert peak == 2
+
+
+def test_expand_resolves_at_most_the_cap_in_order_of_appearance():
+    sellers = [SellerRef(code=uuid4(), name=f"s{n}", email="s@example.com") for n in range(3)]
+    product = ProductRef(code=uuid4(), name="p", price=Decimal("1.00"))
+    references = InMemoryReferenceClient(sellers, [product])
+    sales = [
+        Sale.new(invoice_number=f"INV-{n}", sale_date=date(2026, 3, 10),
+                 seller_code=seller.code, product_code=product.code)
+        for n, seller in enumerate(sellers + sellers[:1])
+    ]
+    service = SaleService(repository=None, references=references, expand_max_codes=2)
+
+    resolved = asyncio.run(service.resolve_references(sales))
+
+    assert list(resolved.sellers) == [sellers[0].code, sellers[1].code]
+    assert list(resolved.products) == [product.code]
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from botocore.exceptions import ClientError
+from pynamodb.exceptions import PutError
+
+from src.domain.exceptions import CapacityExceededError
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard, RetryBudget, TokenBucket
+
+
+def throttled() -> PutError:
+    cause = ClientError({"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow down"}}, "PutItem")
+    return PutError("throttled", cause=cause)
+
+
+def invalid() -> PutError:
+    cause = ClientError({"Error": {"Code": "ValidationException", "Message": "bad item"}}, "PutItem")
+    return PutError("invalid", cause=cause)
+
+
+class Flaky:
+    """Raises ``errors`` in order, then returns "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_token_bucket_serves_the_burst_then_waits():
+    async def main():
+        bucket = TokenBucket(rate=100.0, burst=2.0)
+        assert await bucket.acquire() == 0.0
+        assert await bucket.acquire() == 0.0
+        assert await bucket.acquire() > 0.0
+
+    asyncio.run(main())
+
+
+def test_token_bucket_drain_gives_up_the_burst():
+    async def main():
+        bucket = TokenBucket(rate=100.0, burst=10.0)
+        bucket.drain()
+        assert await bucket.acquire() > 0.0
+
+    asyncio.run(main())
+
+
+def test_token_bucket_with_no_rate_never_waits():
+    async def main():
+        bucket = TokenBucket(rate=0.0, burst=0.0)
+        assert [await bucket.acquire(50) for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    asyncio.run(main())
+
+
+def test_retry_budget_is_a_share_of_recent_calls():
+    budget = RetryBudget(ratio=0.5, min_per_second=0.0)
+    for _ in range(4):
+        budget.record_call()
+
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+    budget.record_call()
+    budget.record_call()
+    assert budget.try_spend()
+
+
+def guard(**kwargs) -> DynamoDBGuard:
+    return DynamoDBGuard(base_delay=0.0, max_delay=0.0, **kwargs)
+
+
+def test_throttled_calls_are_retried():
+    db = guard()
+    call = Flaky(throttled(), throttled())
+
+    assert asyncio.run(db.write(call)) == "ok"
+    assert call.calls == 3
+    assert (db.stats.throttles, db.stats.retries) == (2, 2)
+
+
+def test_other_errors_are_not_retried():
+    db = guard()
+    call = Flaky(invalid())
+
+    with pytest.raises(PutError):
+        asyncio.run(db.write(call))
+    assert call.calls == 1
+    assert db.stats.retries == 0
+
+
+def test_a_call_still_throttled_after_max_attempts_is_a_capacity_error():
+    db = guard(max_attempts=3)
+    call = Flaky(*(throttled() for _ in range(5)))
+
+    with pytest.raises(CapacityExceededError):
+        asyncio.run(db.read(call))
+    assert call.calls == 3
+    assert db.stats.gave_up == 1
+
+
+def test_retries_stop_when_the_budget_is_spent():
+    db = guard(max_attempts=10, budget_ratio=0.0, budget_min_per_second=0.2)  # 2 retries per 10 s window
+    call = Flaky(*(throttled() for _ in range(5)))
+
+    with pytest.raises(CapacityExceededError):
+        asyncio.run(db.write(call))
+    assert call.calls == 3
+    assert db.stats.budget_exhausted == 1
@@ -0,0 +1,111 @@
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from src.infrastructure.adapters.http.sse import CREATED, RESET, SaleEventBroker, TooManySubscribersError
+
+
+def parse(frame: str) -> dict:
+    return dict(line.split(": ", 1) for line in frame.strip().splitlines())
+
+
+async def take(stream, count: int) -> List[dict]:
+    """The next ``count`` event frames of a stream, skipping retry/keepalive lines."""
+    events = []
+    while len(events) < count:
+        frame = await asyncio.wait_for(stream.__anext__(), 1.0)
+        if frame.startswith("id: "):
+            events.append(parse(frame))
+    return events
+
+
+async def connect(broker: SaleEventBroker, last_event_id: Optional[str] = None):
+    stream = broker.subscribe(last_event_id, keepalive=5.0)
+    assert (await stream.__anext__()).startswith("retry: ")  # subscribed from here on
+    return stream
+
+
+def test_every_subscriber_gets_every_event():
+    async def main():
+        broker = SaleEventBroker(replay_size=10, queue_size=10, max_subscribers=5)
+        first, second = await connect(broker), await connect(broker)
+        for n in range(3):
+            broker.publish(CREATED, f'{{"n": {n}}}')
+
+        for stream in (first, second):
+            events = await take(stream, 3)
+            assert [e["data"] for e in events] == ['{"n": 0}', '{"n": 1}', '{"n": 2}']
+            assert {e["event"] for e in events} == {CREATED}
+        assert len(broker) == 2
+
+    asyncio.run(main())
+
+
+def test_last_event_id_resumes_after_the_missed_events():
+    async def main():
+        broker = SaleEventBroker(replay_size=10, queue_size=10, max_subscribers=5)
+        stream = await connect(broker)
+        broker.publish(CREATED, "1")
+        [seen] = await take(stream, 1)
+        await stream.aclose()
+
+        broker.publish(CREATED, "2")
+        broker.publish(CREATED, "3")
+        resumed = await connect(broker, seen["id"])
+        assert [e["data"] for e in await take(resumed, 2)] == ["2", "3"]
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("last_event_id", ["deadbeef-1", "garbage"])
+def test_ids_from_another_process_get_a_reset(last_event_id):
+    async def main():
+        broker = SaleEventBroker(replay_size=10, queue_size=10, max_subscribers=5)
+        broker.publish(CREATED, "1")
+        [event] = await take(await connect(broker, last_event_id), 1)
+        assert event["event"] == RESET
+
+    asyncio.run(main())
+
+
+def test_ids_older_than_the_buffer_get_a_reset():
+    async def main():
+        broker = SaleEventBroker(replay_size=2, queue_size=10, max_subscribers=5)
+        stream = await connect(broker)
+        broker.publish(CREATED, "1")
+        [first] = await take(stream, 1)
+        for n in range(2, 6):
+            broker.publish(CREATED, str(n))
+
+        [event] = await take(await connect(broker, first["id"]), 1)
+        assert event["event"] == RESET
+
+    asyncio.run(main())
+
+
+def test_a_lagging_subscriber_is_dropped_without_blocking_others():
+    async def main():
+        broker = SaleEventBroker(replay_size=10, queue_size=2, max_subscribers=5)
+        slow, fast = await connect(broker), await connect(broker)
+        events = []
+        for n in range(4):
+            broker.publish(CREATED, str(n))
+            events += await take(fast, 1)
+
+        assert [e["data"] for e in events] == ["0", "1", "2", "3"]
+        with pytest.raises(StopAsyncIteration):
+            await take(slow, 3)  # the queued events, then the end of the stream
+        assert len(broker) == 1
+
+    asyncio.run(main())
+
+
+def test_subscribers_are_capped():
+    async def main():
+        broker = SaleEventBroker(replay_size=10, queue_size=10, max_subscribers=1)
+        await connect(broker)
+        with pytest.raises(TooManySubscribersError):
+            broker.subscribe(None, keepalive=5.0)
+
+    asyncio.run(main())
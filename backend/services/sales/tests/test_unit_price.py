@@ -0,0 +1,55 @@
+import asyncio
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import httpx
+import pyarrow.parquet as pq
+from moto import mock_aws
+
+from config import settings
+from src.application.sale_service import SaleService
+from src.infrastructure.adapters.client.http_reference_client import HttpReferenceClient
+from src.infrastructure.adapters.db.dynamodb_repository import DynamoDBSaleRepo, SaleModel
+from src.infrastructure.adapters.http.export import export_response
+from src.infrastructure.adapters.http.routers import EXPORT_COLUMNS
+
+SELLER, PRODUCT = uuid4(), uuid4()
+# what the products service answers for a price stored as the float 9.99
+FLOAT_PRICE = str(Decimal(9.99))
+
+
+def sibling_services(request: httpx.Request) -> httpx.Response:
+    [code] = json.loads(request.content)["codes"]
+    if request.url.host == "sellers":
+        return httpx.Response(200, json=[{"code": code, "name": "Ana", "email": "ana@example.com"}])
+    return httpx.Response(200, json=[{"code": code, "name": "Lamp", "price": FLOAT_PRICE}])
+
+
+def test_a_float_priced_product_is_recorded_and_exported_in_cents(monkeypatch):
+    monkeypatch.setattr(settings, "SELLERS_SERVICE_URL", "http://sellers")
+    monkeypatch.setattr(settings, "PRODUCTS_SERVICE_URL", "http://products")
+
+    async def main():
+        references = HttpReferenceClient()
+        references._client = httpx.AsyncClient(transport=httpx.MockTransport(sibling_services))
+        repository = DynamoDBSaleRepo()
+        service = SaleService(repository, references, validate_references=True)
+        created = await service.create_sale("INV-1", date(2026, 3, 10), SELLER, PRODUCT)
+        fetched = await service.get_sale(created.id)
+        response = export_response("sales", "parquet", EXPORT_COLUMNS, repository.list_page, None, page_size=10)
+        exported = b"".join([chunk async for chunk in response.body_iterator])
+        await references.close()
+        return created, fetched, exported
+
+    with mock_aws():
+        SaleModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+        created, fetched, exported = asyncio.run(main())
+        stored = SaleModel.get(str(created.id)).unit_price
+
+    assert FLOAT_PRICE.startswith("9.990000000000000213")
+    assert stored == "9.99"
+    assert fetched.unit_price == Decimal("9.99")
+    assert pq.read_table(io.BytesIO(exported)).column("unit_price").to_pylist() == [Decimal("9.99")]
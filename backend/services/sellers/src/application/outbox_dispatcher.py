@@ -0,0 +1,109 @@
+# src/application/outbox_dispatcher.py
+
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional
+
+from src.domain.entities import DomainEvent
+from src.domain.ports import EventSinkPort, OutboxPort
+
+logger = logging.getLogger("sellers_service.outbox")
+
+
+class OutboxDispatcher:
+    """
+    Drains the outbox into an event sink, at least once.
+
+    - only the holder of the outbox lease dispatches, so a single
+      instance delivers at a time
+    - events of one aggregate are delivered in sequence, one after the
+      other; the first failure holds back the rest of that aggregate
+      until the next round, different aggregates go concurrently
+    - an event is removed from the outbox only after its delivery
+      succeeded, so a crash in between means a redelivery, never a loss
+    """
+
+    def __init__(
+        self,
+        outbox: OutboxPort,
+        sink: EventSinkPort,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 30.0,
+        concurrency: int = 8,
+    ):
+        self._outbox = outbox
+        self._sink = sink
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._concurrency = concurrency
+        self._owner = f"{os.uname().nodename}-{os.getpid()}-{os.urandom(3).hex()}"
+        self._lease_until = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="sellers-outbox-dispatcher")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def drain_once(self) -> int:
+        """
+        Deliver one batch of pending events.
+
+        :return: Number of events read from the outbox.
+        """
+        events = await self._outbox.fetch_pending(self._batch_size)
+        if not events:
+            return 0
+
+        by_aggregate: Dict[str, List[DomainEvent]] = {}
+        for event in events:
+            by_aggregate.setdefault(event.aggregate_id, []).append(event)
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def deliver_in_order(stream: List[DomainEvent]) -> List[DomainEvent]:
+            delivered: List[DomainEvent] = []
+            async with semaphore:
+                for event in sorted(stream, key=lambda e: e.sequence):
+                    try:
+                        await self._sink.deliver(event)
+                    except Exception:
+                        logger.exception(
+                            "Delivery of %s %s failed; holding back %s",
+                            event.event_type, event.event_id, event.aggregate_id,
+                        )
+                        break
+                    delivered.append(event)
+            return delivered
+
+        results = await asyncio.gather(*(deliver_in_order(s) for s in by_aggregate.values()))
+        delivered = [event for batch in results for event in batch]
+        if delivered:
+            await self._outbox.acknowledge(delivered)
+        return len(events)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                # renew once half of the lease is used up
+                if loop.time() > self._lease_until - self._lease_seconds / 2:
+                    if await self._outbox.acquire_lease(self._owner, self._lease_seconds):
+                        self._lease_until = loop.time() + self._lease_seconds
+                    else:
+                        self._lease_until = 0.0
+                if self._lease_until and await self.drain_once() >= self._batch_size:
+                    continue  # more is waiting
+            except Exception:
+                logger.exception("Outbox dispatch round failed")
+            await asyncio.sleep(self._poll_interval)
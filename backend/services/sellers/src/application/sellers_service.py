@@ -1,10 +1,13 @@
 import asyncio
-from datetime import datetime, timezone
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 from uuid import UUID, uuid4
 
-from src.domain.entities import Seller
-from src.domain.exceptions import DuplicateSellerError, NotFoundError
+from src.domain.entities import Seller, SellerChange, Watermark
+from src.domain.exceptions import DuplicateSellerError, ExpiredWatermarkError, NotFoundError
+
+# sorts after every code changed at the same instant
+END_OF_INSTANT = UUID(int=(1 << 128) - 1)
 from src.domain.ports import SellerRepositoryPort, SellerServicePort
 
 
@@ -16,13 +19,29 @@ class SellerService(SellerServicePort):
       - timestamping of created_at / updated_at
     """
 
-    def __init__(self, repository: SellerRepositoryPort):
+    def __init__(
+        self,
+        repository: SellerRepositoryPort,
+        feed_settle: timedelta = timedelta(seconds=5),
+        feed_retention: timedelta = timedelta(days=30),
+    ):
         self._repo = repository
+        # the feed index is eventually consistent and writers stamp
+        # updated_at before they commit: only serve changes old enough
+        # that nothing can still land behind them
+        self._feed_settle = feed_settle
+        self._feed_retention = feed_retention
 
     async def list_sellers(self) -> List[Seller]:
         """Return all sellers."""
         return await self._repo.list_all()
 
+    async def list_sellers_page(
+        self, start_after: Optional[UUID], limit: int
+    ) -> Tuple[List[Seller], Optional[UUID]]:
+        """Return one page of sellers and the code to continue after."""
+        return await self._repo.list_page(start_after, limit)
+
     async def get_seller(self, code: UUID) -> Seller:
         """
         Retrieve a seller by UUID, or raise NotFoundError.
@@ -32,6 +51,40 @@ class SellerService(SellerServicePort):
             raise NotFoundError(code)
         return seller
 
+    async def get_sellers(self, codes: List[UUID]) -> List[Seller]:
+        """
+        Retrieve several sellers in one batched lookup.
+        """
+        if not codes:
+            return []
+        return await self._repo.get_many(codes)
+
+    async def list_changes(
+        self, since: Optional[Watermark], limit: int
+    ) -> Tuple[List[SellerChange], Watermark, bool]:
+        """
+        Changes after ``since`` that are older than the settle window.
+        Tokens older than the tombstone retention are refused.
+        """
+        now = datetime.now(timezone.utc)
+        if since is not None and since.changed_at < now - self._feed_retention:
+            raise ExpiredWatermarkError(since.changed_at)
+
+        until = now - self._feed_settle
+        changes, more = await self._repo.list_changes(since, until, limit)
+        if more and changes:
+            watermark = changes[-1].watermark
+        elif more and since is not None:
+            # the page only held changes the client had already seen
+            watermark = since
+        else:
+            # caught up: everything up to ``until`` has been seen, so an idle
+            # client keeps moving forward and never ages out
+            watermark = Watermark(until, END_OF_INSTANT)
+            if since is not None:
+                watermark = max(watermark, since)
+        return changes, watermark, more
+
     async def create_seller(self, name: str, email: str) -> Seller:
         """
         Create a new seller:
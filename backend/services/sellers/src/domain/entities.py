@@ -1,5 +1,7 @@
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 from uuid import UUID, uuid4
 
 
@@ -27,3 +29,63 @@ class Seller:
             created_at=now,
             updated_at=now,
         )
+
+
+@dataclass(frozen=True, order=True)
+class Watermark:
+    """
+    Position in the change feed: the ``(changed_at, code)`` of the last
+    change a client has seen. The feed is ordered by that pair.
+    """
+    changed_at: datetime
+    code: UUID
+
+
+@dataclass(frozen=True)
+class SellerChange:
+    """
+    One entry of the change feed: the seller as it is now, or only its
+    code when it was deleted (``seller`` is None, a tombstone).
+    """
+    code: UUID
+    changed_at: datetime
+    seller: Optional[Seller] = None
+
+    @property
+    def deleted(self) -> bool:
+        return self.seller is None
+
+    @property
+    def watermark(self) -> Watermark:
+        return Watermark(self.changed_at, self.code)
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """
+    A change to an aggregate, recorded in the outbox with the change itself.
+    ``sequence`` orders the events of one aggregate.
+    """
+    event_id: UUID
+    event_type: str
+    aggregate_type: str
+    aggregate_id: str
+    sequence: str
+    occurred_at: datetime
+    payload: Dict[str, Any]
+
+    @classmethod
+    def new(cls, event_type: str, aggregate_id: str, payload: Dict[str, Any]) -> "DomainEvent":
+        """
+        Factory for a new event; ``event_type`` is ``<aggregate>.<change>``.
+        """
+        event_id = uuid4()
+        return cls(
+            event_id=event_id,
+            event_type=event_type,
+            aggregate_type=event_type.split(".", 1)[0],
+            aggregate_id=aggregate_id,
+            sequence=f"{time.time_ns():020d}-{event_id.hex[:8]}",
+            occurred_at=datetime.now(timezone.utc),
+            payload=payload,
+        )
@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import UUID
 
 
@@ -20,4 +21,32 @@ class DuplicateSellerError(DomainError):
     """
     def __init__(self, email: str) -> None:
         super().__init__(f"Duplicate email for seller seller: {email}")
-        self.email = email
\ No newline at end of file
+        self.email = email
+
+
+class ExpiredWatermarkError(DomainError):
+    """
+    Raised when a sync token is older than the tombstones kept, so the
+    client may have missed deletes and has to resync from scratch.
+    """
+    def __init__(self, changed_at: datetime) -> None:
+        super().__init__(f"Sync token from {changed_at.isoformat()} has expired; resync from scratch")
+        self.changed_at = changed_at
+
+
+class InvalidSyncTokenError(DomainError):
+    def __init__(self, token: str) -> None:
+        """
+        :param token: the ``since`` value that is not a token this service issued.
+        """
+        super().__init__(f"Invalid sync token: {token!r}")
+        self.token = token
+
+
+class CapacityExceededError(DomainError):
+    """
+    Raised when DynamoDB keeps throttling a call after the retries the
+    resilience layer allows.
+    """
+    def __init__(self) -> None:
+        super().__init__("The sellers store is busy; retry shortly")
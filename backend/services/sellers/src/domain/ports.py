@@ -1,10 +1,11 @@
 # src/domain/ports.py
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from src.domain.entities import Seller
+from src.domain.entities import DomainEvent, Seller, SellerChange, Watermark
 
 
 class SellerRepositoryPort(ABC):
@@ -20,6 +21,16 @@ class SellerRepositoryPort(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def list_page(self, start_after: Optional[UUID], limit: int) -> Tuple[List[Seller], Optional[UUID]]:
+        """
+        Retrieve one page of sellers in table order.
+        :param start_after: Code of the last seller of the previous page, or None.
+        :param limit: Maximum number of sellers in the page.
+        :return: The page and the code to continue after (None at the end).
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def get_by_code(self, code: UUID) -> Optional[Seller]:
         """
@@ -29,6 +40,37 @@ class SellerRepositoryPort(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def get_many(self, codes: List[UUID]) -> List[Seller]:
+        """
+        Fetch several sellers in one round trip (BatchGetItem).
+        Unknown codes are silently skipped.
+        :param codes: UUIDs of the sellers.
+        :return: Seller entities that exist, in no particular order.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def list_changes(
+        self, after: Optional[Watermark], until: datetime, limit: int
+    ) -> Tuple[List[SellerChange], bool]:
+        """
+        Retrieve sellers created, updated or deleted since a watermark, in feed order.
+        :param after: Last change the client has seen, or None for everything.
+        :param until: Latest change time to include.
+        :param limit: Maximum number of changes.
+        :return: The changes and whether more may follow.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def scan_codes(self, total_segments: int) -> List[str]:
+        """
+        Codes of all live sellers, e.g. to build a key filter.
+        :param total_segments: Number of parallel scan segments.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def get_by_email(self, email: str) -> Optional[Seller]:
         """
@@ -63,7 +105,7 @@ class SellerRepositoryPort(ABC):
     @abstractmethod
     async def delete(self, code: UUID) -> None:
         """
-        Remove a seller by its UUID.
+        Remove a seller by its UUID, leaving a tombstone for the change feed.
         :param code: UUID of the seller to delete.
         """
         raise NotImplementedError()
@@ -88,6 +130,15 @@ class SellerServicePort(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def list_sellers_page(
+        self, start_after: Optional[UUID], limit: int
+    ) -> Tuple[List[Seller], Optional[UUID]]:
+        """
+        Business use-case: page through all sellers, e.g. for exports.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def get_seller(self, code: UUID) -> Seller:
         """
@@ -96,6 +147,24 @@ class SellerServicePort(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def get_sellers(self, codes: List[UUID]) -> List[Seller]:
+        """
+        Retrieve several sellers at once; unknown codes are omitted.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def list_changes(
+        self, since: Optional[Watermark], limit: int
+    ) -> Tuple[List[SellerChange], Watermark, bool]:
+        """
+        What changed since a client last synced.
+        :return: The changes, the watermark to resume from and whether more are waiting.
+        :raises ExpiredWatermarkError: if ``since`` is older than the tombstones kept.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def create_seller(self, name: str, email: str) -> Seller:
         """
@@ -120,3 +189,45 @@ class SellerServicePort(ABC):
         :raises NotFoundError: if seller does not exist.
         """
         raise NotImplementedError()
+
+
+class OutboxPort(ABC):
+    """
+    Outbound port: pending domain events written alongside each change.
+    """
+
+    @abstractmethod
+    async def fetch_pending(self, limit: int) -> List[DomainEvent]:
+        """
+        Read up to ``limit`` undelivered events; events of one aggregate
+        come in sequence order.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def acknowledge(self, events: List[DomainEvent]) -> None:
+        """
+        Remove delivered events from the outbox.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def acquire_lease(self, owner: str, seconds: float) -> bool:
+        """
+        Take or renew the single-dispatcher lease for ``seconds``.
+        :return: False while another owner holds an unexpired lease.
+        """
+        raise NotImplementedError()
+
+
+class EventSinkPort(ABC):
+    """
+    Outbound port: where the dispatcher delivers domain events.
+    """
+
+    @abstractmethod
+    async def deliver(self, event: DomainEvent) -> None:
+        """
+        Deliver one event; raising makes the dispatcher retry it later.
+        """
+        raise NotImplementedError()
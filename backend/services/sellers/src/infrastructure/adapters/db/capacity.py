@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pynamodb.connection import Connection
+
+from src.infrastructure.metrics import CONSUMED_CAPACITY
+
+logger = logging.getLogger("sellers_service.capacity")
+
+READ_OPERATIONS = frozenset({"GetItem", "Query", "Scan", "BatchGetItem", "TransactGetItems"})
+WRITE_OPERATIONS = frozenset({"PutItem", "UpdateItem", "DeleteItem", "BatchWriteItem", "TransactWriteItems"})
+BACKGROUND_ROUTE = "background"
+_STARTED = "capacity_started_at"
+
+# (table, index or "", "read" or "write")
+Target = Tuple[str, str, str]
+
+
+@dataclass
+class ConsumedCapacity:
+    """
+    DynamoDB capacity consumed on behalf of one request, over all its
+    calls; these may run in several worker threads at once.
+    """
+    read_units: float = 0.0
+    write_units: float = 0.0
+    calls: int = 0
+    seconds: float = 0.0
+    by_target: Dict[Target, float] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, targets: Iterable[Tuple[Target, float]], seconds: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.seconds += seconds
+            for target, units in targets:
+                if target[2] == "read":
+                    self.read_units += units
+                else:
+                    self.write_units += units
+                self.by_target[target] = self.by_target.get(target, 0.0) + units
+
+    @property
+    def total_units(self) -> float:
+        return self.read_units + self.write_units
+
+    def header(self) -> str:
+        """``X-Consumed-Capacity``: the totals, then the units by table and index."""
+        parts = [f"read={self.read_units:g}", f"write={self.write_units:g}"]
+        for (table, index, kind), units in sorted(self.by_target.items()):
+            parts.append(f"{table}{'/' + index if index else ''};{kind}={units:g}")
+        return ", ".join(parts)
+
+    def server_timing(self) -> str:
+        return (
+            f"dynamodb;dur={self.seconds * 1000:.1f};"
+            f'desc="{self.calls} calls, {self.read_units:g} RCU, {self.write_units:g} WCU"'
+        )
+
+
+_current: ContextVar[Optional[ConsumedCapacity]] = ContextVar("consumed_capacity", default=None)
+
+
+def start_request() -> ConsumedCapacity:
+    """
+    Account the DynamoDB calls of the current context, and of the tasks
+    and threads it starts (``asyncio.to_thread`` copies the context), to
+    a new ConsumedCapacity.
+    """
+    usage = ConsumedCapacity()
+    _current.set(usage)
+    return usage
+
+
+class CapacityTracker:
+    """
+    Asks DynamoDB for the capacity consumed by every call
+    (``ReturnConsumedCapacity=INDEXES``) and adds it to the current
+    request's ConsumedCapacity; calls made outside any request (outbox
+    dispatcher, key filter) go straight to the metrics, under the
+    ``background`` route.
+
+    Works through botocore events on the clients of the connections it
+    is attached to; ``refresh()`` hooks the ones it has not seen yet, as
+    when PynamoDB replaces a client whose credentials expired.
+    """
+
+    def __init__(self):
+        self._connections: List[Connection] = []
+        self._hooked: Dict[int, Any] = {}  # id -> client, kept alive so ids stay unique
+        self._lock = threading.Lock()
+
+    def attach(self, *connections: Connection) -> None:
+        """Account the calls of ``connections``, from the next ``refresh()`` on."""
+        with self._lock:
+            self._connections.extend(c for c in connections if c not in self._connections)
+
+    def refresh(self) -> None:
+        for connection in self._connections:
+            client = connection.client
+            if id(client) in self._hooked:
+                continue
+            with self._lock:
+                if id(client) in self._hooked:
+                    continue
+                events = client.meta.events
+                events.register("provide-client-params.dynamodb", _return_capacity)
+                events.register("before-call.dynamodb", _started)
+                events.register("after-call.dynamodb", _consumed)
+                self._hooked[id(client)] = client
+            logger.debug("Accounting consumed capacity of %s", connection)
+
+
+def record(route: str, usage: ConsumedCapacity) -> None:
+    for (table, index, kind), units in usage.by_target.items():
+        CONSUMED_CAPACITY.labels(route, table, index, kind).inc(units)
+
+
+def _return_capacity(params: Dict[str, Any], model, **kwargs) -> None:
+    if model.name in READ_OPERATIONS or model.name in WRITE_OPERATIONS:
+        # INDEXES is TOTAL plus the breakdown; PynamoDB's rate limiter reads the total
+        params["ReturnConsumedCapacity"] = "INDEXES"
+
+
+def _started(context: Dict[str, Any], **kwargs) -> None:
+    context[_STARTED] = time.perf_counter()
+
+
+def _consumed(parsed: Dict[str, Any], model, context: Dict[str, Any], **kwargs) -> None:
+    if model.name not in READ_OPERATIONS and model.name not in WRITE_OPERATIONS:
+        return
+    consumed = parsed.get("ConsumedCapacity") or []
+    kind = "read" if model.name in READ_OPERATIONS else "write"
+    targets = list(_targets(consumed if isinstance(consumed, list) else [consumed], kind))
+    usage = _current.get()
+    if usage is None:
+        background = ConsumedCapacity()
+        background.add(targets, 0.0)
+        record(BACKGROUND_ROUTE, background)
+        return
+    started = context.get(_STARTED)
+    usage.add(targets, time.perf_counter() - started if started is not None else 0.0)
+
+
+def _targets(entries: Iterable[Dict[str, Any]], kind: str) -> Iterable[Tuple[Target, float]]:
+    """
+    Units by table and index. Without a breakdown (TOTAL), the whole
+    call counts against the table.
+    """
+    for entry in entries:
+        table = entry.get("TableName", "")
+        yield (table, "", kind), entry.get("Table", entry).get("CapacityUnits", 0.0)
+        for indexes in ("GlobalSecondaryIndexes", "LocalSecondaryIndexes"):
+            for index, capacity in entry.get(indexes, {}).items():
+                yield (table, index, kind), capacity.get("CapacityUnits", 0.0)
@@ -1,15 +1,22 @@
-from datetime import datetime, timezone
-from typing import List, Optional
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 from uuid import UUID, uuid4
 
-from pynamodb.attributes import UnicodeAttribute, UTCDateTimeAttribute
+from pynamodb.attributes import BooleanAttribute, TTLAttribute, UnicodeAttribute, UTCDateTimeAttribute
+from pynamodb.expressions.condition import Condition
 from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
 from pynamodb.models import Model
 
 from config import settings
-from src.domain.entities import Seller
+from src.domain.entities import DomainEvent, Seller, SellerChange, Watermark
 from src.domain.exceptions import NotFoundError, DuplicateSellerError
 from src.domain.ports import SellerRepositoryPort
+from src.infrastructure.adapters.db.key_filter import KeyFilter
+from src.infrastructure.adapters.db.outbox import DynamoDBOutbox
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard
+from src.infrastructure.adapters.db.single_flight import SingleFlight
+from src.infrastructure.metrics import timed
 
 
 class EmailIndex(GlobalSecondaryIndex):
@@ -25,6 +32,21 @@ class EmailIndex(GlobalSecondaryIndex):
     email = UnicodeAttribute(hash_key=True)
 
 
+class UpdatedAtIndex(GlobalSecondaryIndex):
+    """
+    Change feed index: every seller and tombstone, spread over
+    CHANGE_FEED_SHARDS partitions and sorted by ``updated_at`` within each.
+    """
+    class Meta:
+        index_name = "updated-at-index"
+        projection = AllProjection()
+        read_capacity_units = 2
+        write_capacity_units = 2
+
+    feed_shard = UnicodeAttribute(hash_key=True)
+    updated_at = UTCDateTimeAttribute(range_key=True)
+
+
 class SellerModel(Model):
     """
     PynamoDB model for the sellers table, with GSI on email.
@@ -42,38 +64,154 @@ class SellerModel(Model):
     email      = UnicodeAttribute()
     created_at = UTCDateTimeAttribute()
     updated_at = UTCDateTimeAttribute()
+    feed_shard = UnicodeAttribute(null=True)
+    deleted    = BooleanAttribute(null=True)
+    expires_at = TTLAttribute(null=True)
 
 
     # GSI for email uniqueness
     email_index = EmailIndex()
+    # GSI for the change feed
+    updated_at_index = UpdatedAtIndex()
+
+
+class SellerTombstoneModel(Model):
+    """
+    What a deleted seller leaves behind in the sellers table: enough for
+    the change feed, and no email, so the address can be registered again.
+    DynamoDB TTL purges it after CHANGE_FEED_RETENTION_DAYS.
+    """
+    class Meta:
+        table_name = SellerModel.Meta.table_name
+        region = settings.AWS_REGION
+        if settings.DYNAMODB_ENDPOINT_URL:
+            host = settings.DYNAMODB_ENDPOINT_URL
+
+    code       = UnicodeAttribute(hash_key=True)
+    feed_shard = UnicodeAttribute()
+    updated_at = UTCDateTimeAttribute()
+    deleted    = BooleanAttribute()
+    expires_at = TTLAttribute()
 
 
 class DynamoDBSellerRepo(SellerRepositoryPort):
     """
     Outbound adapter implementing SellerRepositoryPort using PynamoDB.
+    With an outbox, each write and its seller.* event share one transaction.
+    Every call goes through the DynamoDBGuard (rate limits, throttle retries),
+    and concurrent lookups of the same code or email share one request.
+    With a key filter, codes it rules out are not looked up at all.
     """
 
+    def __init__(
+        self,
+        outbox: Optional[DynamoDBOutbox] = None,
+        guard: Optional[DynamoDBGuard] = None,
+        key_filter: Optional[KeyFilter] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ):
+        self._outbox = outbox
+        self._db = guard or DynamoDBGuard()
+        self._key_filter = key_filter
+        self.single_flight = single_flight or SingleFlight()
+
+    @timed("dynamodb")
     async def list_all(self) -> List[Seller]:
-        sellers: List[Seller] = []
-        for item in SellerModel.scan():
-            sellers.append(_to_domain(item))
-        return sellers
+        def scan() -> List[SellerModel]:
+            return list(SellerModel.scan(SellerModel.deleted.does_not_exist()))
 
+        return [_to_domain(item) for item in await self._db.read(scan)]
+
+    @timed("dynamodb")
+    async def list_page(self, start_after: Optional[UUID], limit: int) -> Tuple[List[Seller], Optional[UUID]]:
+        def scan() -> Tuple[List[Seller], Optional[UUID]]:
+            start_key = {"code": {"S": str(start_after)}} if start_after else None
+            result = SellerModel.scan(
+                SellerModel.deleted.does_not_exist(), limit=limit, last_evaluated_key=start_key
+            )
+            items = [_to_domain(item) for item in result]
+            last_key = result.last_evaluated_key
+            return items, UUID(last_key["code"]["S"]) if last_key else None
+
+        return await self._db.read(scan, units=limit)
+
+    @timed("dynamodb")
     async def get_by_code(self, code: UUID) -> Optional[Seller]:
-        try:
-            # Since code and id contain the same value, we can query by id (the hash key)
-            item = SellerModel.get(str(code))
-            return _to_domain(item)
-        except SellerModel.DoesNotExist:
+        if self._key_filter is not None and not self._key_filter.might_exist(code):
             return None
 
+        async def get() -> Optional[Seller]:
+            item = await self._db.read(_get_live, code)
+            return _to_domain(item) if item is not None else None
+
+        return await self.single_flight.do(("code", code), get)
+
+    @timed("dynamodb")
+    async def get_many(self, codes: List[UUID]) -> List[Seller]:
+        if self._key_filter is not None:
+            codes = [c for c in codes if self._key_filter.might_exist(c)]
+        keys = list(dict.fromkeys(str(c) for c in codes))
+        if not keys:
+            return []
+
+        def batch_get() -> List[SellerModel]:
+            return list(SellerModel.batch_get(keys))
+
+        items = await self._db.read(batch_get, units=len(keys))
+        return [_to_domain(item) for item in items if not item.deleted]
+
+    @timed("dynamodb")
+    async def list_changes(
+        self, after: Optional[Watermark], until: datetime, limit: int
+    ) -> Tuple[List[SellerChange], bool]:
+        if after is not None and after.changed_at > until:
+            return [], False
+        condition: Condition
+        if after is None:
+            condition = SellerModel.updated_at <= until
+        else:
+            # inclusive, so changes sharing the watermark's instant are not lost
+            condition = SellerModel.updated_at.between(after.changed_at, until)
+
+        def query(shard: str) -> List[SellerModel]:
+            return list(SellerModel.updated_at_index.query(
+                shard, range_key_condition=condition, limit=limit, page_size=limit
+            ))
+
+        shards = await asyncio.gather(*(
+            self._db.read(query, str(n), units=limit) for n in range(settings.CHANGE_FEED_SHARDS)
+        ))
+        return _merge_shards(shards, after, limit)
+
+    @timed("dynamodb")
+    async def scan_codes(self, total_segments: int) -> List[str]:
+        """
+        Codes of all live sellers, read with a parallel scan that only
+        fetches the key attribute.
+        """
+        def scan(segment: int) -> List[str]:
+            return [item.code for item in SellerModel.scan(
+                SellerModel.deleted.does_not_exist(),
+                segment=segment,
+                total_segments=total_segments,
+                attributes_to_get=["code"],
+            )]
+
+        segments = await asyncio.gather(*(self._db.read(scan, s) for s in range(total_segments)))
+        return [code for segment in segments for code in segment]
+
+    @timed("dynamodb")
     async def get_by_email(self, email: str) -> Optional[Seller]:
-        try:
-            item = next(SellerModel.email_index.query(email))
-            return _to_domain(item)
-        except StopIteration:
-            return None
+        def query() -> Optional[SellerModel]:
+            return next(SellerModel.email_index.query(email, limit=1), None)
+
+        async def get() -> Optional[Seller]:
+            item = await self._db.read(query)
+            return _to_domain(item) if item is not None else None
+
+        return await self.single_flight.do(("email", email), get)
 
+    @timed("dynamodb")
     async def create(self, name: str, email: str) -> Seller:
         # Before inserting, enforce email uniqueness at the application level
         if await self.get_by_email(email) is not None:
@@ -89,23 +227,25 @@ class DynamoDBSellerRepo(SellerRepositoryPort):
             email=email,
             created_at=now,
             updated_at=now,
+            feed_shard=_feed_shard(new_code),
         )
-        record.save()
-
-        return Seller(
+        seller = Seller(
             code=new_code,
             name=name,
             email=email,
             created_at=now,
             updated_at=now,
         )
+        if self._key_filter is not None:
+            self._key_filter.add(new_code)
+        await self._save(record, "seller.created", seller)
+        return seller
 
+    @timed("dynamodb")
     async def update(self, code: UUID, name: str, email: str) -> Seller:
         # Fetch existing
-        try:
-            # Since code and id contain the same value, we can query by id (the hash key)
-            item = SellerModel.get(str(code))
-        except SellerModel.DoesNotExist:
+        item = await self._db.read(_get_live, code)
+        if item is None:
             raise NotFoundError(code)
 
         # If changing email, enforce uniqueness
@@ -113,34 +253,134 @@ class DynamoDBSellerRepo(SellerRepositoryPort):
             raise DuplicateSellerError("email", email)
 
         # Persist updates
+        old_email = item.email
         now = datetime.now(timezone.utc)
         item.name       = name
         item.email      = email
         item.updated_at = now
-        item.save()
-
-        return Seller(
+        item.feed_shard = _feed_shard(code)
+        seller = Seller(
             code=UUID(item.code),
             name=item.name,
             email=item.email,
             created_at=item.created_at,
             updated_at=now,
         )
+        await self._save(item, "seller.updated", seller)
+        self._written(code, old_email)
+        return seller
 
+    @timed("dynamodb")
     async def delete(self, code: UUID) -> None:
-        try:
-            # Since code and id contain the same value, we can query by id (the hash key)
-            item = SellerModel.get(str(code))
-            item.delete()
-        except SellerModel.DoesNotExist:
+        item = await self._db.read(_get_live, code)
+        if item is None:
             raise NotFoundError(code)
+        # the tombstone replaces the whole item
+        now = datetime.now(timezone.utc)
+        tombstone = SellerTombstoneModel(
+            code=item.code,
+            feed_shard=_feed_shard(code),
+            updated_at=now,
+            deleted=True,
+            expires_at=now + timedelta(days=settings.CHANGE_FEED_RETENTION_DAYS),
+        )
+        if self._outbox is None:
+            await self._db.write(tombstone.save)
+        else:
+            await self._db.write(
+                self._outbox.commit,
+                saves=[tombstone],
+                events=[_event("seller.deleted", _to_domain(item))],
+                units=2,
+            )
+        self._written(code, item.email)
+
+    async def _save(self, item: SellerModel, event_type: str, seller: Seller) -> None:
+        if self._outbox is None:
+            await self._db.write(item.save)
+        else:
+            await self._db.write(
+                self._outbox.commit, saves=[item], events=[_event(event_type, seller)], units=2
+            )
+        self._written(seller.code, seller.email)
 
+    def _written(self, code: UUID, email: str) -> None:
+        """Lookups started from now on must not join one begun before this write."""
+        self.single_flight.forget(("code", code))
+        self.single_flight.forget(("email", email))
+
+    @timed("dynamodb")
     async def ping(self) -> None:
         # Used by readiness checks
-        if not SellerModel.exists():
+        if not await self._db.read(SellerModel.exists):
             raise RuntimeError(f"Table {SellerModel.Meta.table_name} not found")
 
 
+def _feed_shard(code: UUID) -> str:
+    """
+    Change feed partition of a seller. Changing CHANGE_FEED_SHARDS moves
+    sellers between partitions, so run the backfill again after doing so.
+    """
+    return str(UUID(str(code)).int % settings.CHANGE_FEED_SHARDS)
+
+
+def _get_live(code: UUID) -> Optional[SellerModel]:
+    try:
+        # Since code and id contain the same value, we can query by id (the hash key)
+        item = SellerModel.get(str(code))
+    except SellerModel.DoesNotExist:
+        return None
+    return None if item.deleted else item
+
+
+def _merge_shards(
+    shards: List[List[SellerModel]], after: Optional[Watermark], limit: int
+) -> Tuple[List[SellerChange], bool]:
+    """
+    Merge the per-shard query results into one feed page.
+
+    A shard that filled its ``limit`` may hold more changes past its last
+    item, so the page stops there; otherwise a later page would resume
+    beyond changes it never returned.
+    """
+    changes: List[SellerChange] = []
+    cutoff: Optional[Watermark] = None
+    for items in shards:
+        shard_changes = [_to_change(item) for item in items]
+        if len(items) >= limit:
+            last = shard_changes[-1].watermark
+            cutoff = last if cutoff is None else min(cutoff, last)
+        changes.extend(c for c in shard_changes if after is None or c.watermark > after)
+
+    changes.sort(key=lambda c: c.watermark)
+    if cutoff is not None:
+        changes = [c for c in changes if c.watermark <= cutoff]
+    return changes[:limit], cutoff is not None or len(changes) > limit
+
+
+def _to_change(item: SellerModel) -> SellerChange:
+    return SellerChange(
+        code=UUID(item.code),
+        changed_at=item.updated_at,
+        seller=None if item.deleted else _to_domain(item),
+    )
+
+
+def backfill_feed_shards() -> int:
+    """
+    Put every seller (and tombstone) into its change feed partition:
+    items written before the feed existed, or before CHANGE_FEED_SHARDS changed.
+    :return: how many items were updated.
+    """
+    updated = 0
+    for item in SellerModel.scan():
+        shard = _feed_shard(UUID(item.code))
+        if item.feed_shard != shard:
+            item.update(actions=[SellerModel.feed_shard.set(shard)])
+            updated += 1
+    return updated
+
+
 def _to_domain(item: SellerModel) -> Seller:
     return Seller(
         code=UUID(item.code),
@@ -148,4 +388,15 @@ def _to_domain(item: SellerModel) -> Seller:
         email=item.email,
         created_at=item.created_at,
         updated_at=item.updated_at,
-    )
\ No newline at end of file
+    )
+
+
+def _event(event_type: str, seller: Seller) -> DomainEvent:
+    """Build the outbox event describing a change to ``seller``."""
+    return DomainEvent.new(event_type, str(seller.code), {
+        "code": str(seller.code),
+        "name": seller.name,
+        "email": seller.email,
+        "created_at": seller.created_at.isoformat(),
+        "updated_at": seller.updated_at.isoformat(),
+    })
@@ -0,0 +1,206 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from pynamodb.attributes import BinaryAttribute, NumberAttribute, TTLAttribute, UnicodeAttribute
+from pynamodb.exceptions import PutError
+from pynamodb.models import Model
+
+from config import settings
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard
+from src.infrastructure.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """
+    First response recorded for an idempotency key, replayed on retries.
+    ``status`` is ``None`` while the original request is still in flight.
+    """
+    fingerprint: str
+    status: Optional[int] = None
+    headers: Tuple[Tuple[bytes, bytes], ...] = ()
+    body: bytes = b""
+
+    @property
+    def completed(self) -> bool:
+        return self.status is not None
+
+
+class IdempotencyStore:
+    """
+    Storage contract used by the idempotency middleware.
+    """
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        raise NotImplementedError()
+
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        """
+        Mark ``key`` as in flight for a short lease. Returns False if
+        someone else holds it and the lease has not run out.
+        """
+        raise NotImplementedError()
+
+    async def put(self, key: str, response: StoredResponse) -> None:
+        raise NotImplementedError()
+
+    async def release(self, key: str) -> None:
+        """
+        Forget an in-flight claim so the request can be retried (e.g. after a 5xx).
+        """
+        raise NotImplementedError()
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """
+    Process-local LRU store with TTL; enough on its own for a single instance
+    and used as the read-through front of the DynamoDB store otherwise.
+    """
+
+    def __init__(self, ttl: float, max_size: int, lease: float = 60.0):
+        self._items: TTLCache[str, StoredResponse] = TTLCache(ttl, max_size)
+        self._lease = lease
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        return self._items.get(key)
+
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        if self._items.get(key) is not None:
+            return False
+        self._items.set(key, StoredResponse(fingerprint=fingerprint), ttl=self._lease)
+        return True
+
+    async def put(self, key: str, response: StoredResponse) -> None:
+        self._items.set(key, response)
+
+    async def release(self, key: str) -> None:
+        self._items.pop(key)
+
+
+class IdempotencyModel(Model):
+    """
+    PynamoDB model for the shared idempotency table; DynamoDB TTL on
+    ``expires_at`` purges old keys.
+    """
+    class Meta:
+        table_name = settings.IDEMPOTENCY_TABLE_NAME or "Idempotency"
+        region     = settings.AWS_REGION
+        if settings.DYNAMODB_ENDPOINT_URL:
+            host = settings.DYNAMODB_ENDPOINT_URL
+
+    request_key = UnicodeAttribute(hash_key=True)
+    fingerprint = UnicodeAttribute()
+    status      = NumberAttribute(null=True)
+    headers     = UnicodeAttribute(null=True)  # JSON list of [name, value]
+    body        = BinaryAttribute(null=True, legacy_encoding=False)
+    expires_at  = TTLAttribute()
+
+
+class DynamoDBIdempotencyStore(IdempotencyStore):
+    """
+    Shared store so retries landing on another instance are replayed too.
+    Claims use a conditional put, so only one instance runs a given key;
+    they expire after ``lease`` seconds so a process dying mid-request
+    does not lock its key for the whole ``ttl``. Calls go through
+    ``guard``, like the repository's.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        front: InMemoryIdempotencyStore,
+        guard: Optional[DynamoDBGuard] = None,
+        lease: float = 60.0,
+    ):
+        self._ttl = ttl
+        self._lease = lease
+        self._front = front
+        self._db = guard or DynamoDBGuard()
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        cached = await self._front.get(key)
+        if cached is not None and cached.completed:
+            return cached
+        item = await self._db.read(self._get_item, key)
+        if item is None:
+            return None
+        stored = _from_item(item)
+        if stored.completed:
+            await self._front.put(key, stored)
+        return stored
+
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        item = IdempotencyModel(request_key=key, fingerprint=fingerprint, expires_at=self._expiry(self._lease))
+        try:
+            await self._db.write(
+                item.save,
+                condition=(
+                    IdempotencyModel.request_key.does_not_exist()
+                    | (IdempotencyModel.expires_at < datetime.now(timezone.utc))
+                ),
+            )
+            return True
+        except PutError as e:
+            if e.cause_response_code == "ConditionalCheckFailedException":
+                return False
+            raise
+
+    async def put(self, key: str, response: StoredResponse) -> None:
+        item = IdempotencyModel(
+            request_key=key,
+            fingerprint=response.fingerprint,
+            status=response.status,
+            headers=json.dumps([[k.decode("latin-1"), v.decode("latin-1")] for k, v in response.headers]),
+            body=response.body,
+            expires_at=self._expiry(self._ttl),
+        )
+        await self._db.write(item.save)
+        await self._front.put(key, response)  # only once shared, so it is never replayed here alone
+
+    async def release(self, key: str) -> None:
+        await self._front.release(key)
+        await self._db.write(IdempotencyModel(request_key=key).delete)
+
+    @staticmethod
+    def _expiry(seconds: float) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+    @staticmethod
+    def _get_item(key: str) -> Optional[IdempotencyModel]:
+        try:
+            return IdempotencyModel.get(key, consistent_read=True)
+        except IdempotencyModel.DoesNotExist:
+            return None
+
+
+def _from_item(item: IdempotencyModel) -> StoredResponse:
+    headers: List[Tuple[bytes, bytes]] = [
+        (k.encode("latin-1"), v.encode("latin-1")) for k, v in json.loads(item.headers or "[]")
+    ]
+    return StoredResponse(
+        fingerprint=item.fingerprint,
+        status=int(item.status) if item.status is not None else None,
+        headers=tuple(headers),
+        body=item.body or b"",
+    )
+
+
+def build_idempotency_store(guard: Optional[DynamoDBGuard] = None) -> IdempotencyStore:
+    """
+    In-memory store, fronting a DynamoDB table when IDEMPOTENCY_TABLE_NAME is set.
+    """
+    front = InMemoryIdempotencyStore(
+        ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+        max_size=settings.IDEMPOTENCY_CACHE_SIZE,
+        lease=settings.IDEMPOTENCY_CLAIM_LEASE_SECONDS,
+    )
+    if not settings.IDEMPOTENCY_TABLE_NAME:
+        return front
+    return DynamoDBIdempotencyStore(
+        ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+        front=front,
+        guard=guard,
+        lease=settings.IDEMPOTENCY_CLAIM_LEASE_SECONDS,
+    )
@@ -0,0 +1,140 @@
+import logging
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import HTMLResponse, PlainTextResponse
+
+from src.infrastructure.auth import require_admin
+from src.infrastructure.di import get_memory_tracker, get_profile_store, get_stack_sampler
+from src.infrastructure.memory import MemoryTracker
+from src.infrastructure.profiling import ProfileStore, StackSampler, render
+
+router = APIRouter(
+    prefix="/admin",
+    include_in_schema=False,
+    dependencies=[Depends(require_admin)],
+)
+
+logger = logging.getLogger("sellers_service.admin")
+
+
+@router.get("/profiles")
+async def list_profiles(store: ProfileStore = Depends(get_profile_store)):
+    """Summaries of the last profiled requests, newest first."""
+    return [profile.summary() for profile in store.list()]
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: Literal["html", "speedscope", "text"] = "html",
+    store: ProfileStore = Depends(get_profile_store),
+):
+    """
+    One profiled request: an interactive flame view (html), a file for
+    speedscope.app (speedscope) or a call tree (text).
+    """
+    profile = store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail=f"Profile {profile_id} not found")
+    output = render(profile, format)
+    if format == "html":
+        return HTMLResponse(output)
+    if format == "speedscope":
+        return PlainTextResponse(
+            output,
+            media_type="application/json",
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'},
+        )
+    return PlainTextResponse(output)
+
+
+@router.get("/profiling/sampler")
+async def sampler_stacks(
+    limit: Optional[int] = Query(None, ge=1),
+    sampler: StackSampler = Depends(get_stack_sampler),
+):
+    """
+    Stacks counted by the continuous sampler, in the folded format
+    (``flamegraph.pl`` or speedscope turn it into a flame graph).
+    """
+    return PlainTextResponse(sampler.folded(limit))
+
+
+@router.get("/profiling/sampler/stats")
+async def sampler_stats(sampler: StackSampler = Depends(get_stack_sampler)):
+    return sampler.stats()
+
+
+@router.post("/profiling/sampler/start")
+async def start_sampler(
+    interval_ms: Optional[float] = Query(None, ge=1.0),
+    sampler: StackSampler = Depends(get_stack_sampler),
+):
+    sampler.start(interval_ms / 1000 if interval_ms is not None else None)
+    return sampler.stats()
+
+
+@router.post("/profiling/sampler/stop")
+async def stop_sampler(sampler: StackSampler = Depends(get_stack_sampler)):
+    sampler.stop()
+    return sampler.stats()
+
+
+@router.delete("/profiling/sampler", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_sampler(sampler: StackSampler = Depends(get_stack_sampler)):
+    sampler.reset()
+
+
+@router.get("/memory")
+async def memory_stats(tracker: MemoryTracker = Depends(get_memory_tracker)):
+    """tracemalloc state, traced heap and process RSS."""
+    return tracker.stats()
+
+
+@router.post("/memory/start")
+async def start_memory_trace(
+    frames: int = Query(1, ge=1, le=64),
+    tracker: MemoryTracker = Depends(get_memory_tracker),
+):
+    """Start tracemalloc, keeping ``frames`` frames per allocation."""
+    tracker.start(frames)
+    return tracker.stats()
+
+
+@router.post("/memory/stop")
+async def stop_memory_trace(tracker: MemoryTracker = Depends(get_memory_tracker)):
+    tracker.stop()
+    return tracker.stats()
+
+
+@router.get("/memory/top")
+async def memory_top(
+    limit: int = Query(20, ge=1, le=500),
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    tracker: MemoryTracker = Depends(get_memory_tracker),
+):
+    """The allocation sites holding the most memory now (tracemalloc must be running)."""
+    if not tracker.running:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail="tracemalloc is not running")
+    return tracker.top(limit, group_by)
+
+
+@router.get("/memory/routes")
+async def memory_routes(tracker: MemoryTracker = Depends(get_memory_tracker)):
+    """Peak heap growth per route since tracemalloc started, largest first."""
+    return tracker.routes()
+
+
+@router.get("/memory/diffs")
+async def list_memory_diffs(tracker: MemoryTracker = Depends(get_memory_tracker)):
+    """Summaries of the requests sent with X-Memory-Diff, newest first."""
+    return [diff.summary() for diff in tracker.list_diffs()]
+
+
+@router.get("/memory/diffs/{diff_id}")
+async def get_memory_diff(diff_id: str, tracker: MemoryTracker = Depends(get_memory_tracker)):
+    diff = tracker.get_diff(diff_id)
+    if diff is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail=f"Memory diff {diff_id} not found")
+    return {**diff.summary(), "top": diff.top}
@@ -1,14 +1,33 @@
 from uuid import UUID
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+
+from config import settings
 
 from src.domain.ports import SellerServicePort
-from src.infrastructure.adapters.http.schemas import SellerIn, SellerOut
+from src.infrastructure.adapters.http import sync_token
+from src.infrastructure.adapters.http.export import ExportColumn, export_response
+from src.infrastructure.adapters.http.schemas import (
+    SellerBatchIn,
+    SellerChangeOut,
+    SellerChangesOut,
+    SellerIn,
+    SellerOut,
+)
 from src.infrastructure.di import get_service
 
 router = APIRouter(prefix="/api/v1", tags=["sellers"])
 
+EXPORT_COLUMNS = (
+    ExportColumn("code", "string", lambda s: s.code),
+    ExportColumn("name", "string", lambda s: s.name),
+    ExportColumn("email", "string", lambda s: s.email),
+    ExportColumn("created_at", "timestamp", lambda s: s.created_at),
+    ExportColumn("updated_at", "timestamp", lambda s: s.updated_at),
+)
+
 
 @router.get("/", response_model=List[SellerOut])
 async def list_sellers(
@@ -18,6 +37,34 @@ async def list_sellers(
     return [SellerOut.from_domain(s) for s in sellers]
 
 
+@router.get("/export", response_class=StreamingResponse)
+async def export_sellers(
+    format: Literal["csv", "parquet"] = Query("csv"),
+    cursor: Optional[UUID] = Query(None, description="Resume after this seller code (the last one received)"),
+    service: SellerServicePort = Depends(get_service),
+):
+    """Stream every seller as CSV or Parquet, page by page."""
+    return export_response(
+        "sellers", format, EXPORT_COLUMNS, service.list_sellers_page, cursor, settings.EXPORT_PAGE_SIZE
+    )
+
+
+@router.get("/changes", response_model=SellerChangesOut)
+async def list_changes(
+    since: Optional[str] = Query(None, description="nextToken of the previous call; omit for a full sync"),
+    limit: int = Query(settings.CHANGE_FEED_PAGE_SIZE, ge=1, le=settings.CHANGE_FEED_MAX_PAGE_SIZE),
+    service: SellerServicePort = Depends(get_service),
+):
+    """Sellers created, updated or deleted since a sync token (410 once it has expired)."""
+    watermark = sync_token.decode(since) if since else None
+    changes, next_watermark, has_more = await service.list_changes(watermark, limit)
+    return SellerChangesOut(
+        changes=[SellerChangeOut.from_domain(c) for c in changes],
+        next_token=sync_token.encode(next_watermark),
+        has_more=has_more,
+    )
+
+
 @router.get("/{seller_id}", response_model=SellerOut)
 async def get_seller(
     seller_id: UUID,
@@ -38,6 +85,15 @@ async def create_seller(
     return SellerOut.from_domain(new_seller)
 
 
+@router.post("/batch-get", response_model=List[SellerOut])
+async def batch_get_sellers(
+    payload: SellerBatchIn,
+    service: SellerServicePort = Depends(get_service),
+):
+    sellers = await service.get_sellers(payload.codes)
+    return [SellerOut.from_domain(s) for s in sellers]
+
+
 @router.put("/{seller_id}", response_model=SellerOut)
 async def update_seller(
     seller_id: UUID,
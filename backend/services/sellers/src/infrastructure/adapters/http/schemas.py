@@ -1,9 +1,10 @@
 from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, field_validator
 from pydantic.alias_generators import to_camel
 
-from src.domain.entities import Seller
+from src.domain.entities import Seller, SellerChange
 
 
 class SellerIn(BaseModel):
@@ -24,6 +25,13 @@ class SellerIn(BaseModel):
         return Seller.new(name=self.name, email=self.email)
 
 
+class SellerBatchIn(BaseModel):
+    """
+    Incoming schema for a batched lookup of sellers by code.
+    """
+    codes: List[UUID] = Field(..., max_length=100, description="Seller UUIDs (max 100)")
+
+
 class SellerOut(BaseModel):
     """
     Outgoing schema for seller responses, with camelCase aliases.
@@ -49,4 +57,43 @@ class SellerOut(BaseModel):
             email=seller.email,
             created_at=seller.created_at,
             updated_at=seller.updated_at,
-        )
\ No newline at end of file
+        )
+
+
+class SellerChangeOut(BaseModel):
+    """
+    One change feed entry; ``seller`` is null when the seller was deleted.
+    """
+    code: UUID
+    deleted: bool
+    changed_at: datetime
+    seller: Optional[SellerOut] = None
+
+    model_config = {
+        "alias_generator": to_camel,
+        "populate_by_name": True,
+    }
+
+    @classmethod
+    def from_domain(cls, change: SellerChange) -> "SellerChangeOut":
+        return cls(
+            code=change.code,
+            deleted=change.deleted,
+            changed_at=change.changed_at,
+            seller=SellerOut.from_domain(change.seller) if change.seller else None,
+        )
+
+
+class SellerChangesOut(BaseModel):
+    """
+    A page of the change feed. Pass ``nextToken`` as ``since`` on the next
+    call; keep paging while ``hasMore`` is true.
+    """
+    changes: List[SellerChangeOut]
+    next_token: str
+    has_more: bool
+
+    model_config = {
+        "alias_generator": to_camel,
+        "populate_by_name": True,
+    }
@@ -0,0 +1,32 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from src.domain.entities import Watermark
+from src.domain.exceptions import InvalidSyncTokenError
+
+
+def encode(watermark: Watermark) -> str:
+    """
+    Opaque, URL-safe form of a change feed position.
+    """
+    raw = json.dumps([watermark.changed_at.isoformat(), str(watermark.code)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode(token: str) -> Watermark:
+    """
+    Parse a token produced by ``encode``.
+
+    :raises InvalidSyncTokenError: when the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        changed_at, code = json.loads(raw)
+        watermark = Watermark(datetime.fromisoformat(changed_at), UUID(code))
+    except (TypeError, ValueError) as e:  # binascii.Error and JSONDecodeError are ValueErrors
+        raise InvalidSyncTokenError(token) from e
+    if watermark.changed_at.tzinfo is None:
+        raise InvalidSyncTokenError(token)
+    return watermark
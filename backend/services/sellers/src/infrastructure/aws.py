@@ -0,0 +1,100 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import botocore.session
+from botocore.config import Config
+from pynamodb.connection import Connection
+
+logger = logging.getLogger("sellers_service.aws")
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """One urllib3 connection pool of a client, i.e. one endpoint host."""
+    client: str
+    host: str
+    max_connections: int
+    in_use: int
+    idle: int
+    opened: int  # connections ever opened; grows past max_connections when the pool overflows
+    requests: int
+
+
+class AWSClients:
+    """
+    The botocore clients of the service, made once from one session and
+    one tuned Config (pool size, timeouts, TCP keep-alive, retry mode)
+    and shared by every adapter: each PynamoDB model and the outbox would
+    otherwise open their own client and pool of 10 connections.
+
+    ``share_with`` hands the DynamoDB client to PynamoDB connections. If
+    PynamoDB finds it without credentials it makes a client of its own
+    again, with its default settings.
+    """
+
+    def __init__(
+        self,
+        region: str,
+        max_pool_connections: int = 50,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 10.0,
+        tcp_keepalive: bool = True,
+        retry_mode: str = "standard",
+        max_attempts: int = 3,
+    ):
+        self._region = region
+        self._session = botocore.session.get_session()
+        self._config = Config(
+            max_pool_connections=max_pool_connections,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            tcp_keepalive=tcp_keepalive,
+            retries={"mode": retry_mode, "total_max_attempts": max_attempts},
+            parameter_validation=False,  # as PynamoDB does; the adapters build the requests
+        )
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._lock = threading.Lock()
+
+    def client(self, service: str, endpoint_url: Optional[str] = None):
+        """The shared client of ``service`` (at ``endpoint_url``, for local stand-ins)."""
+        key = (service, endpoint_url or None)
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = self._session.create_client(
+                    service, region_name=self._region, endpoint_url=endpoint_url or None, config=self._config
+                )
+                logger.info("Created %s client, pool of %d", service, self._config.max_pool_connections)
+            return self._clients[key]
+
+    def share_with(self, *connections: Connection) -> None:
+        for connection in connections:
+            connection._client = self.client("dynamodb", connection.host)
+
+    def pool_stats(self) -> List[PoolStats]:
+        """What the clients' urllib3 pools hold, one per host they talk to."""
+        stats = []
+        for (service, _), client in list(self._clients.items()):
+            pools = client._endpoint.http_session._manager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None or pool.pool is None:  # evicted or closed meanwhile
+                    continue
+                free = list(pool.pool.queue)  # idle connections, and None for the never opened
+                stats.append(PoolStats(
+                    client=service,
+                    host=pool.host,
+                    max_connections=pool.pool.maxsize,
+                    in_use=pool.pool.maxsize - len(free),
+                    idle=sum(1 for conn in free if conn is not None),
+                    opened=pool.num_connections,
+                    requests=pool.num_requests,
+                ))
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
@@ -1,10 +1,87 @@
+from datetime import timedelta
 from functools import lru_cache
+from typing import List, Optional, Type
 
 from fastapi import Depends
+from pynamodb.connection import Connection
+from pynamodb.models import Model
 
+from config import settings
+from src.application.outbox_dispatcher import OutboxDispatcher
 from src.application.sellers_service import SellerService
-from src.domain.ports import SellerRepositoryPort, SellerServicePort
-from src.infrastructure.adapters.db.dynamodb_repository import DynamoDBSellerRepo
+from src.domain.ports import EventSinkPort, SellerRepositoryPort, SellerServicePort
+from src.infrastructure.adapters.db.capacity import CapacityTracker
+from src.infrastructure.adapters.db.dynamodb_repository import (
+    DynamoDBSellerRepo,
+    SellerModel,
+    SellerTombstoneModel,
+)
+from src.infrastructure.adapters.db.idempotency_store import IdempotencyModel
+from src.infrastructure.adapters.db.key_filter import KeyFilter
+from src.infrastructure.adapters.db.outbox import DynamoDBOutbox, OutboxLeaseModel, OutboxModel
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard
+from src.infrastructure.adapters.db.single_flight import SingleFlight
+from src.infrastructure.adapters.events.sinks import InMemoryEventSink, LocalEventBus, log_event
+from src.infrastructure.aws import AWSClients
+from src.infrastructure.memory import MemoryTracker
+from src.infrastructure.profiling import ProfileStore, StackSampler
+from src.infrastructure.tracing import instrument
+
+
+@lru_cache()
+def get_outbox() -> Optional[DynamoDBOutbox]:
+    """
+    Singleton provider for the transactional outbox; None unless
+    OUTBOX_TABLE_NAME is set.
+    """
+    return DynamoDBOutbox(guard=get_guard()) if settings.OUTBOX_TABLE_NAME else None
+
+
+@lru_cache()
+def get_guard() -> DynamoDBGuard:
+    """
+    Singleton provider for the rate limiter and retry policy shared by
+    every DynamoDB call: repository, outbox and idempotency store.
+    """
+    return DynamoDBGuard(
+        read_rate=settings.DYNAMODB_READ_RATE,
+        write_rate=settings.DYNAMODB_WRITE_RATE,
+        burst_seconds=settings.DYNAMODB_BURST_SECONDS,
+        max_attempts=settings.DYNAMODB_MAX_ATTEMPTS,
+        base_delay=settings.DYNAMODB_BACKOFF_BASE_MS / 1000,
+        max_delay=settings.DYNAMODB_BACKOFF_MAX_MS / 1000,
+        budget_ratio=settings.DYNAMODB_RETRY_BUDGET_RATIO,
+        budget_min_per_second=settings.DYNAMODB_RETRY_BUDGET_MIN_PER_SECOND,
+    )
+
+
+@lru_cache()
+def get_key_filter() -> Optional[KeyFilter]:
+    """
+    Singleton provider for the Bloom filter of existing seller codes;
+    None unless KEY_FILTER_ENABLED is set.
+    """
+    if not settings.KEY_FILTER_ENABLED:
+        return None
+    return KeyFilter(
+        capacity=settings.KEY_FILTER_CAPACITY,
+        fp_rate=settings.KEY_FILTER_FP_RATE,
+        scan_segments=settings.KEY_FILTER_SCAN_SEGMENTS,
+        sync_interval=settings.KEY_FILTER_SYNC_SECONDS,
+        lag=settings.CHANGE_FEED_SETTLE_SECONDS,
+        rebuild_interval=settings.KEY_FILTER_REBUILD_SECONDS,
+        max_staleness=settings.KEY_FILTER_MAX_STALENESS_SECONDS,
+        page_size=settings.CHANGE_FEED_MAX_PAGE_SIZE,
+    )
+
+
+@lru_cache()
+def get_single_flight() -> SingleFlight:
+    """
+    Singleton provider for the coalescing of the repository's point
+    lookups; its counters are exported with the runtime metrics.
+    """
+    return SingleFlight()
 
 
 @lru_cache()
@@ -12,7 +89,13 @@ def get_repository() -> SellerRepositoryPort:
     """
     Returns a singleton SellerRepositoryPort implementation.
     """
-    return DynamoDBSellerRepo()
+    repo = DynamoDBSellerRepo(
+        outbox=get_outbox(),
+        guard=get_guard(),
+        key_filter=get_key_filter(),
+        single_flight=get_single_flight(),
+    )
+    return instrument(repo, "SellerRepo")
 
 
 @lru_cache()
@@ -23,4 +106,110 @@ def get_service(
     Returns a singleton SellerServicePort implementation,
     wired up with the DynamoDBSellerRepo.
     """
-    return SellerService(repository=repo)
\ No newline at end of file
+    return instrument(
+        SellerService(
+            repository=repo,
+            feed_settle=timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS),
+            feed_retention=timedelta(days=settings.CHANGE_FEED_RETENTION_DAYS),
+        ),
+        "SellerService",
+    )
+
+
+@lru_cache()
+def get_event_sink() -> EventSinkPort:
+    """
+    Singleton provider for the sink the outbox is drained into.
+    """
+    if settings.OUTBOX_SINK == "memory":
+        return InMemoryEventSink()
+    bus = LocalEventBus()
+    bus.subscribe("*", log_event)
+    return bus
+
+
+@lru_cache()
+def get_dispatcher() -> Optional[OutboxDispatcher]:
+    """
+    Singleton provider for the outbox dispatcher; None without an outbox.
+    """
+    outbox = get_outbox()
+    if outbox is None:
+        return None
+    return OutboxDispatcher(
+        outbox,
+        get_event_sink(),
+        batch_size=settings.OUTBOX_BATCH_SIZE,
+        poll_interval=settings.OUTBOX_POLL_INTERVAL_SECONDS,
+        lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+        concurrency=settings.OUTBOX_DELIVERY_CONCURRENCY,
+    )
+
+
+@lru_cache()
+def get_profile_store() -> ProfileStore:
+    """
+    Singleton provider for the profiles of the last profiled requests.
+    """
+    return ProfileStore(size=settings.PROFILE_STORE_SIZE)
+
+
+@lru_cache()
+def get_stack_sampler() -> StackSampler:
+    """
+    Singleton provider for the continuous low-rate stack sampler.
+    """
+    return StackSampler(
+        interval=settings.PROFILE_SAMPLER_INTERVAL_MS / 1000,
+        max_stacks=settings.PROFILE_SAMPLER_MAX_STACKS,
+    )
+
+
+@lru_cache()
+def get_memory_tracker() -> MemoryTracker:
+    """
+    Singleton provider for the tracemalloc controls and per-route peaks.
+    """
+    return MemoryTracker(diff_store_size=settings.MEMORY_DIFF_STORE_SIZE)
+
+
+def _dynamodb_connections() -> List[Connection]:
+    """Every PynamoDB connection of the service: one per model, and the outbox's."""
+    models: List[Type[Model]] = [SellerModel, SellerTombstoneModel]
+    if settings.IDEMPOTENCY_TABLE_NAME:
+        models.append(IdempotencyModel)
+    connections = []
+    if (outbox := get_outbox()) is not None:
+        models += [OutboxModel, OutboxLeaseModel]
+        connections.append(outbox.connection)
+    return [model._get_connection().connection for model in models] + connections
+
+
+@lru_cache()
+def get_aws_clients() -> AWSClients:
+    """
+    Singleton provider for the AWS clients every adapter shares; the
+    PynamoDB connections get its DynamoDB client.
+    """
+    clients = AWSClients(
+        region=settings.AWS_REGION,
+        max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+        connect_timeout=settings.AWS_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=settings.AWS_READ_TIMEOUT_SECONDS,
+        tcp_keepalive=settings.AWS_TCP_KEEPALIVE,
+        retry_mode=settings.AWS_RETRY_MODE,
+        max_attempts=settings.AWS_MAX_ATTEMPTS,
+    )
+    clients.share_with(*_dynamodb_connections())
+    return clients
+
+
+@lru_cache()
+def get_capacity_tracker() -> CapacityTracker:
+    """
+    Singleton provider for the consumed-capacity accounting, attached to
+    every DynamoDB connection of the service.
+    """
+    tracker = CapacityTracker()
+    tracker.attach(*_dynamodb_connections())
+    return tracker
@@ -0,0 +1,23 @@
+"""
+Put sellers written before the change feed existed into its index.
+
+    python -m src.infrastructure.feed_backfill
+
+Run it once after deploying the updated-at-index, before clients start a
+full sync, and again if CHANGE_FEED_SHARDS changes.
+"""
+
+import logging
+
+from src.infrastructure.adapters.db.dynamodb_repository import backfill_feed_shards
+from src.infrastructure.logging import setup_logging
+
+
+def main() -> None:
+    setup_logging()
+    updated = backfill_feed_shards()
+    logging.getLogger("sellers_service.feed").info("Backfilled %d sellers into the change feed", updated)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.adapters.db.capacity import CapacityTracker, record, start_request
+from src.infrastructure.metrics import REQUEST_CONSUMED_CAPACITY
+
+CONSUMED_CAPACITY_HEADER = b"x-consumed-capacity"
+SERVER_TIMING_HEADER = b"server-timing"
+UNMATCHED_ROUTE = "unmatched"
+
+
+class CapacityMiddleware:
+    """
+    Accounts the DynamoDB capacity every request consumes (see
+    CapacityTracker) and reports it by route in
+    ``dynamodb_consumed_capacity_units_total`` and
+    ``http_request_consumed_capacity_units``.
+
+    With ``headers``, the response also carries it, as of when the
+    response starts::
+
+        X-Consumed-Capacity: read=1.5, write=2, Sellers;read=0.5, Sellers/email-index;read=1, ...
+        Server-Timing: dynamodb;dur=12.3;desc="3 calls, 1.5 RCU, 2 WCU"
+
+    What a streaming response reads after its headers are sent is only
+    in the metrics.
+    """
+
+    def __init__(self, app: ASGIApp, tracker: CapacityTracker, headers: bool = True):
+        self.app = app
+        self._tracker = tracker
+        self._headers = headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self._tracker.refresh()
+        usage = start_request()
+
+        async def send_with_capacity(message: Message) -> None:
+            if self._headers and message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (CONSUMED_CAPACITY_HEADER, usage.header().encode("latin-1")),
+                    (SERVER_TIMING_HEADER, usage.server_timing().encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_capacity)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            record(route, usage)
+            REQUEST_CONSUMED_CAPACITY.labels(scope["method"], route).observe(usage.total_units)
@@ -4,12 +4,17 @@ from fastapi.responses import JSONResponse
 from starlette.status import (
     HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
+    HTTP_410_GONE,
     HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 
 from src.domain.exceptions import (
+    CapacityExceededError,
     NotFoundError,
     DuplicateSellerError,
+    ExpiredWatermarkError,
+    InvalidSyncTokenError,
 )
 
 logger = logging.getLogger("sellers_service.exceptions")
@@ -50,6 +55,58 @@ def register_exception_handlers(app: FastAPI):
             },
         )
 
+    @app.exception_handler(ExpiredWatermarkError)
+    async def expired_watermark_handler(request: Request, exc: ExpiredWatermarkError):
+        logger.info(
+            "ExpiredWatermarkError: %s %s → %s",
+            request.method,
+            request.url.path,
+            exc,
+        )
+        return JSONResponse(
+            status_code=HTTP_410_GONE,
+            content={
+                "title": "Sync Token Expired",
+                "detail": str(exc),
+                "status": HTTP_410_GONE,
+            },
+        )
+
+    @app.exception_handler(InvalidSyncTokenError)
+    async def invalid_sync_token_handler(request: Request, exc: InvalidSyncTokenError):
+        logger.warning(
+            "InvalidSyncTokenError: %s %s → %s",
+            request.method,
+            request.url.path,
+            exc,
+        )
+        return JSONResponse(
+            status_code=HTTP_400_BAD_REQUEST,
+            content={
+                "title": "Invalid Sync Token",
+                "detail": str(exc),
+                "status": HTTP_400_BAD_REQUEST,
+            },
+        )
+
+    @app.exception_handler(CapacityExceededError)
+    async def capacity_exceeded_handler(request: Request, exc: CapacityExceededError):
+        logger.warning(
+            "CapacityExceededError: %s %s → %s",
+            request.method,
+            request.url.path,
+            exc,
+        )
+        return JSONResponse(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "title": "Service Busy",
+                "detail": str(exc),
+                "status": HTTP_503_SERVICE_UNAVAILABLE,
+            },
+            headers={"Retry-After": "1"},
+        )
+
     @app.exception_handler(Exception)
     async def generic_exception_handler(request: Request, exc: Exception):
         logger.exception(
@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.adapters.db.idempotency_store import IdempotencyStore, StoredResponse
+from src.infrastructure.auth import verify_token
+
+logger = logging.getLogger("sellers_service.idempotency")
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+MAX_STORED_BODY = 350 * 1024  # DynamoDB items are at most 400 KB, key and headers included
+POLL_INTERVAL = 0.1
+_NOT_REPLAYED = {b"date", b"server", b"set-cookie"}
+_BOUNDARY = re.compile(rb'boundary="?([^";]+)"?', re.IGNORECASE)
+
+
+class IdempotencyMiddleware:
+    """
+    Replays the first response of a ``POST`` carrying an ``Idempotency-Key``
+    header instead of running the request again.
+
+    - keys are scoped to the verified caller (JWT ``sub``) and the path
+    - a retry with the same key but a different body is rejected (422)
+    - an in-process duplicate waits for the first request to finish;
+      one in flight on another instance is polled for (409 on timeout)
+      until its claim's lease runs out, after which a retry takes it over
+    - 5xx responses, bodies over ``MAX_STORED_BODY`` and responses that
+      fail to be stored are not recorded, so the client may retry them
+    """
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore, wait_timeout: float = 10.0):
+        self.app = app
+        self._store = store
+        self._wait_timeout = wait_timeout
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        subject = await _subject(headers.get(b"authorization"))
+        if subject is None:
+            # let the auth dependency produce the 401
+            await self.app(scope, receive, send)
+            return
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            await _problem(send, 400, "Invalid Idempotency-Key", f"Key must be 1-{MAX_KEY_LENGTH} characters")
+            return
+
+        body = await _read_body(receive)
+        fingerprint = _fingerprint(headers.get(b"content-type", b""), body)
+        key = f"{subject}:{scope['path']}:{raw_key.decode('latin-1')}"
+
+        # 1) serialise in-process duplicates behind the first request
+        deadline = time.monotonic() + self._wait_timeout
+        while (pending := self._inflight.get(key)) is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(pending), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                await _problem(send, 409, "Request In Progress", "A request with this Idempotency-Key is still running")
+                return
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            await self._handle(key, fingerprint, body, scope, receive, send)
+        finally:
+            self._inflight.pop(key, None)
+            future.set_result(None)
+
+    async def _handle(
+        self,
+        key: str,
+        fingerprint: str,
+        body: bytes,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        # 2) replay a recorded response, or claim the key
+        stored = await self._store.get(key)
+        # an unfinished record may be a claim whose holder died: the store lets its lease lapse
+        claimed = (stored is None or not stored.completed) and await self._store.claim(key, fingerprint)
+        if not claimed:
+            stored = await self._await_completion(key, stored)
+            if stored is None:
+                await _problem(send, 409, "Request In Progress", "A request with this Idempotency-Key is still running")
+            elif stored.fingerprint != fingerprint:
+                await _problem(send, 422, "Idempotency-Key Reused", "The key was already used with a different payload")
+            else:
+                logger.info("Replaying recorded response for %s", key)
+                await _replay(send, stored)
+            return
+
+        # 3) run the request once and record what it answered
+        status: Optional[int] = None
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+        size = 0
+
+        async def capture(message: Message) -> None:
+            nonlocal status, headers, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size <= MAX_STORED_BODY:
+                    chunks.append(chunk)
+            await send(message)
+
+        try:
+            await self.app(scope, _replay_receive(body, receive), capture)
+        except BaseException:
+            await self._release_quietly(key)
+            raise
+
+        if status is None or status >= 500 or size > MAX_STORED_BODY:
+            await self._release_quietly(key)
+            return
+        try:
+            await self._store.put(key, StoredResponse(
+                fingerprint=fingerprint,
+                status=status,
+                headers=tuple((k, v) for k, v in headers if k.lower() not in _NOT_REPLAYED),
+                body=b"".join(chunks),
+            ))
+        except Exception:
+            # the response is already sent: leave the key free for a retry rather than claimed
+            logger.exception("Could not record the response for %s", key)
+            await self._release_quietly(key)
+
+    async def _release_quietly(self, key: str) -> None:
+        try:
+            await self._store.release(key)
+        except Exception:
+            logger.exception("Could not release %s; it frees up when its lease expires", key)
+
+    async def _await_completion(self, key: str, stored: Optional[StoredResponse]) -> Optional[StoredResponse]:
+        """Poll the store while another instance finishes the same key."""
+        deadline = time.monotonic() + self._wait_timeout
+        while (stored is None or not stored.completed) and time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            stored = await self._store.get(key)
+        return stored if stored is not None and stored.completed else None
+
+
+async def _subject(authorization: Optional[bytes]) -> Optional[str]:
+    if not authorization or not authorization.lower().startswith(b"bearer "):
+        return None
+    try:
+        return (await verify_token(authorization[7:].decode("latin-1"))).get("sub")
+    except Exception:
+        return None
+
+
+def _fingerprint(content_type: bytes, body: bytes) -> str:
+    """
+    Hash of the payload. Clients pick a new multipart boundary for every
+    request, retries included, so it is taken out of the body first.
+    """
+    match = _BOUNDARY.search(content_type) if content_type.lower().startswith(b"multipart/") else None
+    if match:
+        body = body.replace(b"--" + match.group(1), b"--")
+    return hashlib.sha256(body).hexdigest()
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks: List[bytes] = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_receive(body: bytes, receive: Receive) -> Receive:
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+async def _replay(send: Send, stored: StoredResponse) -> None:
+    headers: List[Tuple[bytes, bytes]] = list(stored.headers)
+    headers.append((b"idempotent-replayed", b"true"))
+    await send({"type": "http.response.start", "status": stored.status, "headers": headers})
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+async def _problem(send: Send, status: int, title: str, detail: str) -> None:
+    body = json.dumps({"title": title, "detail": detail, "status": status}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
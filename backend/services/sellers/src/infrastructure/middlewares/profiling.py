@@ -0,0 +1,97 @@
+import logging
+import random
+from datetime import UTC, datetime
+from typing import Optional
+from uuid import uuid4
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.auth import decode_token, is_admin
+from src.infrastructure.profiling import ProfileStore, RequestProfile
+
+logger = logging.getLogger("sellers_service.profiling")
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """
+    Runs selected requests under pyinstrument and keeps the result in a
+    ProfileStore, for the admin endpoints to render.
+
+    A request is profiled when it carries ``X-Profile: 1`` and a token
+    of the admin group (its response then gets an ``X-Profile-Id``
+    header), or when it falls in the ``sample_rate`` fraction. One
+    request is profiled at a time; others run normally meanwhile.
+    Requests that are not selected only pay for a header lookup.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore, sample_rate: float = 0.0, interval: float = 0.001):
+        self.app = app
+        self._store = store
+        self._sample_rate = sample_rate
+        self._interval = interval
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+        reason = self._reason(scope)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+
+        profile_id = uuid4().hex[:12]
+        status = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if reason == "requested":
+                    message["headers"] = [*message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode())]
+            await send(message)
+
+        # only this request's task is profiled, not the others interleaved with it
+        profiler = Profiler(interval=self._interval, async_mode="enabled")
+        self._active = True
+        started_at = datetime.now(UTC)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            session = profiler.stop()
+            self._active = False
+            self._store.add(RequestProfile(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                route=getattr(scope.get("route"), "path", None),
+                status=status,
+                reason=reason,
+                started_at=started_at,
+                duration=session.duration,
+                session=session,
+            ))
+            logger.info("Profiled %s %s (%s): %s", scope["method"], scope["path"], reason, profile_id)
+
+    def _reason(self, scope: Scope) -> Optional[str]:
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER) not in (None, b"", b"0") and _admin(headers.get(b"authorization")):
+            return "requested"
+        if self._sample_rate and random.random() < self._sample_rate:
+            return "sampled"
+        return None
+
+
+def _admin(authorization: Optional[bytes]) -> bool:
+    if not authorization or not authorization.lower().startswith(b"bearer "):
+        return False
+    try:
+        return is_admin(decode_token(authorization[7:].decode("latin-1")))
+    except Exception:
+        return False
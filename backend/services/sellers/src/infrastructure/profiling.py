@@ -0,0 +1,171 @@
+import logging
+import os
+import sys
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger("sellers_service.profiling")
+
+TRUNCATED_STACK = "[other stacks]"
+
+
+@dataclass(frozen=True)
+class RequestProfile:
+    """
+    One request run under the statistical profiler. ``session`` is the
+    pyinstrument session, rendered only when the profile is fetched.
+    """
+    id: str
+    method: str
+    path: str
+    route: Optional[str]
+    status: int
+    reason: str  # "requested" (admin header) or "sampled"
+    started_at: datetime
+    duration: float
+    session: Any
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "reason": self.reason,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(self.duration, 6),
+        }
+
+
+class ProfileStore:
+    """
+    The last ``size`` request profiles, newest first. In memory only:
+    profiles are per instance and lost on restart.
+    """
+
+    def __init__(self, size: int = 20):
+        self._profiles: Deque[RequestProfile] = deque(maxlen=size)
+
+    def add(self, profile: RequestProfile) -> None:
+        self._profiles.appendleft(profile)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def list(self) -> List[RequestProfile]:
+        return list(self._profiles)
+
+
+def render(profile: RequestProfile, fmt: str) -> str:
+    """
+    Render a stored profile as a pyinstrument HTML flame view ("html"),
+    speedscope JSON ("speedscope") or an indented call tree ("text").
+    """
+    from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer, SpeedscopeRenderer
+
+    renderers: Dict[str, Callable[[], Any]] = {
+        "html": HTMLRenderer,
+        "speedscope": SpeedscopeRenderer,
+        "text": lambda: ConsoleRenderer(unicode=True, color=False, show_all=False),
+    }
+    return renderers[fmt]().render(profile.session)
+
+
+class StackSampler:
+    """
+    Continuous low-rate profiler: a daemon thread snapshots the stack of
+    every other thread every ``interval`` seconds and counts identical
+    stacks. Worker threads (PynamoDB, boto) are sampled as well as the
+    event loop.
+
+    Results are in the folded format (``thread;outer;...;inner count``)
+    read by flamegraph.pl, speedscope and most flame graph viewers. At
+    most ``max_stacks`` distinct stacks are kept; later new ones are
+    counted under a single catch-all entry.
+    """
+
+    def __init__(self, interval: float = 0.05, max_stacks: int = 10_000, max_depth: int = 64):
+        self.interval = interval
+        self._max_stacks = max_stacks
+        self._max_depth = max_depth
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.samples = 0
+        self.started_at: Optional[datetime] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: Optional[float] = None) -> None:
+        if self.running:
+            return
+        if interval is not None:
+            self.interval = interval
+        self._stop.clear()
+        self.started_at = datetime.now(UTC)
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        logger.info("Stack sampler started every %.0f ms", self.interval * 1000)
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        logger.info("Stack sampler stopped after %d samples", self.samples)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self.samples = 0
+            self.started_at = datetime.now(UTC) if self.running else None
+
+    def folded(self, limit: Optional[int] = None) -> str:
+        with self._lock:
+            stacks = self._counts.most_common(limit)
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            distinct = len(self._counts)
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "distinct_stacks": distinct,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+        }
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            stacks = [
+                self._fold(names.get(ident, str(ident)), frame)
+                for ident, frame in sys._current_frames().items()
+                if ident != own
+            ]
+            with self._lock:
+                self.samples += 1
+                for stack in stacks:
+                    if stack in self._counts or len(self._counts) < self._max_stacks:
+                        self._counts[stack] += 1
+                    else:
+                        self._counts[TRUNCATED_STACK] += 1
+
+    def _fold(self, thread_name: str, frame) -> str:
+        names: List[str] = []
+        while frame is not None and len(names) < self._max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.append(thread_name)
+        return ";".join(reversed(names))
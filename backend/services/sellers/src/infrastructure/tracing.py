@@ -0,0 +1,102 @@
+import functools
+import inspect
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
+
+from opentelemetry import trace
+
+from config import settings
+
+# The SDK is only imported once tracing is set up: with tracing off (the
+# default) the API's no-op tracer is all the services need at startup.
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SpanExporter
+
+T = TypeVar("T")
+
+SERVICE_NAME = "sellers"
+
+# a proxy until setup_tracing() installs a provider; a no-op without one
+tracer = trace.get_tracer("sellers_service")
+
+
+def tracing_enabled() -> bool:
+    return settings.TRACING_EXPORTER != "none"
+
+
+def _build_exporter(name: str) -> "SpanExporter":
+    if name == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+    if name == "file":
+        from src.infrastructure.tracing_export import FileSpanExporter
+
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    if name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            raise RuntimeError(
+                "TRACING_EXPORTER=otlp needs the opentelemetry-exporter-otlp-proto-http package"
+            ) from e
+        return OTLPSpanExporter()  # endpoint and headers from the OTEL_EXPORTER_OTLP_* variables
+    raise ValueError(f"Unknown TRACING_EXPORTER: {name!r}")
+
+
+def setup_tracing() -> Optional["TracerProvider"]:
+    """
+    Install the tracer provider selected by TRACING_EXPORTER ("none",
+    "console", "file" or "otlp"). Spans are exported in the background.
+
+    :return: the provider, to shut down (and flush) at the end of the
+        lifespan; None when tracing is off.
+    """
+    if not tracing_enabled():
+        return None
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_build_exporter(settings.TRACING_EXPORTER)))
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+def instrument(obj: T, component: str) -> T:
+    """
+    Wrap every public method of ``obj`` in a span named
+    ``<component>.<method>``. Calls between its own methods go through
+    the wrappers too, so nested spans show up. Returns ``obj`` untouched
+    when tracing is off.
+    """
+    if not tracing_enabled():
+        return obj
+    for name in dir(obj):
+        if name.startswith("_"):
+            continue
+        method = getattr(obj, name)
+        if inspect.ismethod(method):
+            setattr(obj, name, _traced(method, f"{component}.{name}"))
+    return obj
+
+
+def _traced(fn: Callable, span_name: str) -> Callable:
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name):
+                return await fn(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with tracer.start_as_current_span(span_name):
+            return fn(*args, **kwargs)
+    return wrapper
+
@@ -0,0 +1,21 @@
+import threading
+from typing import Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Appends finished spans to a file, one JSON object per line.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock, open(self._path, "a", encoding="utf-8") as fh:
+            fh.write(lines)
+        return SpanExportResult.SUCCESS
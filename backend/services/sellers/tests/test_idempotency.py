@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from moto import mock_aws
+
+from src.infrastructure.adapters.db.idempotency_store import (
+    DynamoDBIdempotencyStore,
+    IdempotencyModel,
+    InMemoryIdempotencyStore,
+)
+from src.infrastructure.middlewares import idempotency
+from src.infrastructure.middlewares.idempotency import IdempotencyMiddleware
+
+HEADERS = {"Authorization": "Bearer token", "Idempotency-Key": "k1"}
+
+
+@pytest.fixture(autouse=True)
+def caller(monkeypatch):
+    async def verify_token(token):
+        return {"sub": "user-1"}
+
+    monkeypatch.setattr(idempotency, "verify_token", verify_token)
+
+
+class App:
+    """Answers every POST with a new number."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        await receive()
+        self.calls += 1
+        body = json.dumps({"call": self.calls}).encode()
+        await send({"type": "http.response.start", "status": 201, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def shared_store() -> DynamoDBIdempotencyStore:
+    """A new instance's view of the DynamoDB store: its front starts empty."""
+    return DynamoDBIdempotencyStore(ttl=60, front=InMemoryIdempotencyStore(ttl=60, max_size=10))
+
+
+def post(app, store, payload):
+    async def main():
+        middleware = IdempotencyMiddleware(app, store, wait_timeout=0.3)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(middleware), base_url="http://t") as client:
+            return await client.post("/api/v1/", json=payload, headers=HEADERS)
+
+    return asyncio.run(main())
+
+
+def test_a_retry_on_another_instance_replays_the_first_response():
+    app = App()
+    with mock_aws():
+        IdempotencyModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+        first = post(app, shared_store(), {"name": "Ana", "email": "ana@example.com"})
+        second = post(app, shared_store(), {"name": "Ana", "email": "ana@example.com"})
+
+    assert app.calls == 1
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+
+
+def test_a_different_payload_under_the_same_key_is_rejected():
+    app = App()
+    store = InMemoryIdempotencyStore(ttl=60, max_size=10)
+    post(app, store, {"name": "Ana", "email": "ana@example.com"})
+
+    reused = post(app, store, {"name": "Ana", "email": "other@example.com"})
+
+    assert reused.status_code == 422
+    assert app.calls == 1
@@ -0,0 +1,80 @@
+import asyncio
+from typing import List
+from uuid import uuid4
+
+import pytest
+from moto import mock_aws
+
+from src.infrastructure.adapters.db.dynamodb_repository import DynamoDBSellerRepo, SellerModel
+from src.infrastructure.adapters.db.key_filter import KeyFilter
+from src.infrastructure.adapters.db.resilience import DynamoDBGuard
+
+
+class CountingGuard(DynamoDBGuard):
+    def __init__(self):
+        super().__init__()
+        self.reads: List[float] = []
+
+    async def read(self, fn, *args, units: float = 1.0, **kwargs):
+        self.reads.append(units)
+        return await super().read(fn, *args, units=units, **kwargs)
+
+
+@pytest.fixture
+def table():
+    with mock_aws():
+        SellerModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+        yield
+
+
+async def build(key_filter: KeyFilter, guard: DynamoDBGuard):
+    repository = DynamoDBSellerRepo(guard=guard, key_filter=key_filter)
+    existing = await repository.create("Ana", "ana@example.com")
+    await key_filter.rebuild(repository)
+    return repository, existing
+
+
+def test_an_unknown_code_is_answered_without_a_read(table):
+    guard, key_filter = CountingGuard(), KeyFilter(capacity=100, scan_segments=2)
+
+    async def main():
+        repository, existing = await build(key_filter, guard)
+        guard.reads.clear()
+        missing = await repository.get_by_code(uuid4())
+        missing_many = await repository.get_many([uuid4(), uuid4()])
+        found = await repository.get_by_code(existing.code)
+        return existing, missing, missing_many, found
+
+    existing, missing, missing_many, found = asyncio.run(main())
+
+    assert missing is None and missing_many == []
+    assert found.code == existing.code
+    assert len(guard.reads) == 1  # only the code that exists was looked up
+    assert key_filter.definite_misses == 3
+
+
+def test_codes_created_after_the_build_are_found(table):
+    key_filter = KeyFilter(capacity=100, scan_segments=2)
+
+    async def main():
+        repository, _ = await build(key_filter, DynamoDBGuard())
+        created = await repository.create("Luis", "luis@example.com")
+        return created, await repository.get_by_code(created.code)
+
+    created, found = asyncio.run(main())
+
+    assert found.code == created.code
+    assert key_filter.definite_misses == 0
+
+
+def test_a_stale_filter_sends_every_lookup_to_dynamodb(table):
+    guard, key_filter = CountingGuard(), KeyFilter(capacity=100, scan_segments=2, max_staleness=0)
+
+    async def main():
+        repository, _ = await build(key_filter, guard)
+        guard.reads.clear()
+        return await repository.get_by_code(uuid4())
+
+    assert asyncio.run(main()) is None
+    assert len(guard.reads) == 1
+    assert key_filter.definite_misses == 0
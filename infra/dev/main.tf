@@ -27,6 +27,12 @@ module "iam" {
     module.dynamodb_products.name,
     module.dynamodb_sales.name,
     module.dynamodb_sellers.name,
+    module.dynamodb_products_outbox.name,
+    module.dynamodb_sales_outbox.name,
+    module.dynamodb_sellers_outbox.name,
+    module.dynamodb_products_idempotency.name,
+    module.dynamodb_sales_idempotency.name,
+    module.dynamodb_sellers_idempotency.name,
   ]
   product_images_bucket_arn = module.product_images_bucket.bucket_arn
 }
@@ -62,7 +68,29 @@ module "dynamodb_products" {
     hash_key        = "name"
     hash_key_type   = "S"
     projection_type = "ALL"
+    }, {
+    name            = "updated-at-index"
+    hash_key        = "feed_shard"
+    hash_key_type   = "S"
+    range_key       = "updated_at"
+    projection_type = "ALL"
   }]
+  ttl_attribute = "expires_at"
+}
+
+module "dynamodb_products_outbox" {
+  source    = "../modules/dynamodb"
+  name      = "ProductsOutbox"
+  hash_key  = "aggregate_id"
+  range_key = "sequence"
+}
+
+# Idempotency-Key responses, shared by the service's tasks
+module "dynamodb_products_idempotency" {
+  source        = "../modules/dynamodb"
+  name          = "ProductsIdempotency"
+  hash_key      = "request_key"
+  ttl_attribute = "expires_at"
 }
 
 module "ecs_service_products" {
@@ -79,12 +107,14 @@ module "ecs_service_products" {
   aws_region         = var.aws_region
 
   environment = {
-    AWS_REGION            = var.aws_region
-    PRODUCTS_TABLE_NAME   = module.dynamodb_products.name
-    DYNAMODB_ENDPOINT_URL = "https://dynamodb.${var.aws_region}.amazonaws.com"
-    COGNITO_USERPOOL_ID   = module.cognito.user_pool_id
-    COGNITO_APP_CLIENT_ID = module.cognito.user_pool_client_id
-    PRODUCT_IMAGES_BUCKET = module.product_images_bucket.bucket_name
+    AWS_REGION             = var.aws_region
+    PRODUCTS_TABLE_NAME    = module.dynamodb_products.name
+    DYNAMODB_ENDPOINT_URL  = "https://dynamodb.${var.aws_region}.amazonaws.com"
+    COGNITO_USERPOOL_ID    = module.cognito.user_pool_id
+    COGNITO_APP_CLIENT_ID  = module.cognito.user_pool_client_id
+    PRODUCT_IMAGES_BUCKET  = module.product_images_bucket.bucket_name
+    OUTBOX_TABLE_NAME      = module.dynamodb_products_outbox.name
+    IDEMPOTENCY_TABLE_NAME = module.dynamodb_products_idempotency.name
   }
 }
 
@@ -116,6 +146,21 @@ module "dynamodb_sales" {
   }]
 }
 
+module "dynamodb_sales_outbox" {
+  source    = "../modules/dynamodb"
+  name      = "SalesOutbox"
+  hash_key  = "aggregate_id"
+  range_key = "sequence"
+}
+
+# Idempotency-Key responses, shared by the service's tasks
+module "dynamodb_sales_idempotency" {
+  source        = "../modules/dynamodb"
+  name          = "SalesIdempotency"
+  hash_key      = "request_key"
+  ttl_attribute = "expires_at"
+}
+
 module "ecs_service_sales" {
   source             = "../modules/ecs-service"
   cluster_arn        = module.ecs_cluster.arn
@@ -130,11 +175,15 @@ module "ecs_service_sales" {
   aws_region         = var.aws_region
 
   environment = {
-    AWS_REGION            = var.aws_region
-    SALES_TABLE_NAME      = module.dynamodb_sales.name
-    DYNAMODB_ENDPOINT_URL = "https://dynamodb.${var.aws_region}.amazonaws.com"
-    COGNITO_USERPOOL_ID   = module.cognito.user_pool_id
-    COGNITO_APP_CLIENT_ID = module.cognito.user_pool_client_id
+    AWS_REGION             = var.aws_region
+    SALES_TABLE_NAME       = module.dynamodb_sales.name
+    DYNAMODB_ENDPOINT_URL  = "https://dynamodb.${var.aws_region}.amazonaws.com"
+    COGNITO_USERPOOL_ID    = module.cognito.user_pool_id
+    COGNITO_APP_CLIENT_ID  = module.cognito.user_pool_client_id
+    SELLERS_SERVICE_URL    = "http://${module.networking.alb_dns_name}/sellers"
+    PRODUCTS_SERVICE_URL   = "http://${module.networking.alb_dns_name}/products"
+    OUTBOX_TABLE_NAME      = module.dynamodb_sales_outbox.name
+    IDEMPOTENCY_TABLE_NAME = module.dynamodb_sales_idempotency.name
   }
 }
 
@@ -158,7 +207,29 @@ module "dynamodb_sellers" {
     hash_key        = "email"
     hash_key_type   = "S"
     projection_type = "ALL"
+    }, {
+    name            = "updated-at-index"
+    hash_key        = "feed_shard"
+    hash_key_type   = "S"
+    range_key       = "updated_at"
+    projection_type = "ALL"
   }]
+  ttl_attribute = "expires_at"
+}
+
+module "dynamodb_sellers_outbox" {
+  source    = "../modules/dynamodb"
+  name      = "SellersOutbox"
+  hash_key  = "aggregate_id"
+  range_key = "sequence"
+}
+
+# Idempotency-Key responses, shared by the service's tasks
+module "dynamodb_sellers_idempotency" {
+  source        = "../modules/dynamodb"
+  name          = "SellersIdempotency"
+  hash_key      = "request_key"
+  ttl_attribute = "expires_at"
 }
 
 module "ecs_service_sellers" {
@@ -175,11 +246,13 @@ module "ecs_service_sellers" {
   aws_region         = var.aws_region
 
   environment = {
-    AWS_REGION            = var.aws_region
-    SELLERS_TABLE_NAME    = module.dynamodb_sellers.name
-    DYNAMODB_ENDPOINT_URL = "https://dynamodb.${var.aws_region}.amazonaws.com"
-    COGNITO_USERPOOL_ID   = module.cognito.user_pool_id
-    COGNITO_APP_CLIENT_ID = module.cognito.user_pool_client_id
+    AWS_REGION             = var.aws_region
+    SELLERS_TABLE_NAME     = module.dynamodb_sellers.name
+    OUTBOX_TABLE_NAME      = module.dynamodb_sellers_outbox.name
+    DYNAMODB_ENDPOINT_URL  = "https://dynamodb.${var.aws_region}.amazonaws.com"
+    COGNITO_USERPOOL_ID    = module.cognito.user_pool_id
+    COGNITO_APP_CLIENT_ID  = module.cognito.user_pool_client_id
+    IDEMPOTENCY_TABLE_NAME = module.dynamodb_sellers_idempotency.name
   }
 }
 
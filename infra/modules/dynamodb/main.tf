@@ -2,19 +2,14 @@ resource "aws_dynamodb_table" "this" {
   name         = var.name
   billing_mode = "PAY_PER_REQUEST"
   hash_key     = var.hash_key
+  range_key    = var.range_key
 
-  # Always define the table's own hash key attr
-  attribute {
-    name = var.hash_key
-    type = var.hash_key_type
-  }
-
-  # Dynamically add attribute definitions for each GSI's hash key
+  # One definition per key attribute, whether it keys the table or a GSI
   dynamic "attribute" {
-    for_each = var.global_secondary_indexes
+    for_each = local.key_attributes
     content {
-      name = attribute.value.hash_key
-      type = attribute.value.hash_key_type
+      name = attribute.key
+      type = attribute.value
     }
   }
 
@@ -23,7 +18,26 @@ resource "aws_dynamodb_table" "this" {
     content {
       name            = global_secondary_index.value.name
       hash_key        = global_secondary_index.value.hash_key
+      range_key       = global_secondary_index.value.range_key
       projection_type = global_secondary_index.value.projection_type
     }
   }
+
+  # Expire items on an epoch-seconds attribute, if the table uses one
+  dynamic "ttl" {
+    for_each = var.ttl_attribute == null ? [] : [var.ttl_attribute]
+    content {
+      attribute_name = ttl.value
+      enabled        = true
+    }
+  }
+}
+
+locals {
+  key_attributes = merge(
+    { for gsi in var.global_secondary_indexes : gsi.hash_key => gsi.hash_key_type },
+    { for gsi in var.global_secondary_indexes : gsi.range_key => gsi.range_key_type if gsi.range_key != null },
+    var.range_key == null ? {} : { (var.range_key) = var.range_key_type },
+    { (var.hash_key) = var.hash_key_type },
+  )
 }
\ No newline at end of file
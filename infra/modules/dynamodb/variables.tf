@@ -14,13 +14,33 @@ variable "hash_key_type" {
   default     = "S"
 }
 
+variable "range_key" {
+  type        = string
+  description = "Sort key attribute name (null for hash-only tables)"
+  default     = null
+}
+
+variable "range_key_type" {
+  type        = string
+  description = "Attribute type for the range key (S | N)"
+  default     = "S"
+}
+
 variable "global_secondary_indexes" {
-  description = "List of GSIs to create. Each must specify name, hash_key, key_type and projection_type."
+  description = "List of GSIs to create. Each must specify name, hash_key, key_type and projection_type; range_key is optional."
   type = list(object({
     name            = string
     hash_key        = string
     hash_key_type   = string   # "S" or "N"
+    range_key       = optional(string)
+    range_key_type  = optional(string, "S")
     projection_type = string   # e.g. "ALL", "KEYS_ONLY", "INCLUDE"
   }))
   default = []
+}
+
+variable "ttl_attribute" {
+  type        = string
+  description = "Attribute holding each item's expiry time (null disables TTL)"
+  default     = null
 }
\ No newline at end of file
@@ -47,6 +47,9 @@ resource "aws_iam_policy" "dynamo_crud" {
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
+          "dynamodb:BatchGetItem",
+          "dynamodb:BatchWriteItem",
+          "dynamodb:ConditionCheckItem",
           "dynamodb:Query",
           "dynamodb:Scan"
         ]